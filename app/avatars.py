@@ -0,0 +1,122 @@
+"""
+🙂 Avatares Locales (Identicons SVG)
+==========================================================================
+Genera avatares deterministas a partir de una semilla (nombre o id) sin
+depender de servicios externos, para que el dashboard funcione sin red.
+
+Los SVG se guardan en un cache en disco acotado (``app/static/avatars``) y
+en un LRU en memoria, y se entregan como data URIs listos para ``<img src>``.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+AVATAR_CACHE_DIR = Path(__file__).resolve().parent / "static" / "avatars"
+MAX_DISK_ENTRIES = 5000
+MEMORY_CACHE_SIZE = 4096
+PRUNE_EVERY = 100  # escrituras entre revisiones del tamaño del cache en disco
+
+GRID = 5
+BACKGROUND = "#F0F0F0"
+
+_prune_lock = threading.Lock()
+_writes_lock = threading.Lock()
+_writes = 0
+
+
+def identicon_svg(seed: str, size: int = 84) -> str:
+    """
+    Identicon simétrico de 5x5 celdas; el color y el patrón salen del sha256 de la semilla.
+    """
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    hue = int(digest[0] / 255 * 360)
+    color = f"hsl({hue}, 55%, 45%)"
+    cell = size / (GRID + 1)
+    margin = cell / 2
+
+    rects = []
+    half = (GRID + 1) // 2
+    for row in range(GRID):
+        for col in range(half):
+            if digest[1 + row * half + col] & 1:
+                for c in {col, GRID - 1 - col}:
+                    rects.append(
+                        f'<rect x="{margin + c * cell:.1f}" y="{margin + row * cell:.1f}" '
+                        f'width="{cell:.1f}" height="{cell:.1f}"/>'
+                    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}">'
+        f'<rect width="{size}" height="{size}" fill="{BACKGROUND}"/>'
+        f'<g fill="{color}">{"".join(rects)}</g></svg>'
+    )
+
+
+def _cache_path(seed: str) -> Path:
+    return AVATAR_CACHE_DIR / f"{hashlib.sha256(seed.encode('utf-8')).hexdigest()[:20]}.svg"
+
+
+def _prune_disk_cache():
+    """Elimina los archivos más antiguos si el cache en disco supera ``MAX_DISK_ENTRIES``."""
+    with _prune_lock:
+        files = list(AVATAR_CACHE_DIR.glob("*.svg"))
+        excess = len(files) - MAX_DISK_ENTRIES
+        if excess <= 0:
+            return
+        files.sort(key=lambda f: f.stat().st_mtime)
+        for f in files[:excess]:
+            f.unlink(missing_ok=True)
+
+
+def _count_write() -> bool:
+    """
+    Cuenta una escritura en disco; True cada ``PRUNE_EVERY`` escrituras.
+    Bajo lock: las sesiones de Streamlit escriben desde varios hilos.
+    """
+    global _writes
+    with _writes_lock:
+        _writes += 1
+        return _writes % PRUNE_EVERY == 0
+
+
+def get_avatar_svg(seed: str) -> str:
+    """SVG del avatar, leído del cache en disco o generado y guardado."""
+    path = _cache_path(seed)
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    svg = identicon_svg(seed)
+    try:
+        AVATAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(svg, encoding="utf-8")
+        os.replace(tmp, path)
+        if _count_write():
+            _prune_disk_cache()
+    except OSError:
+        # Sin permisos de escritura: el avatar sigue sirviéndose desde memoria
+        pass
+    return svg
+
+
+def avatar_seed(student: dict) -> str:
+    """Semilla del avatar de un estudiante; sin ``avatar_seed`` se usa su id."""
+    seed = student.get('avatar_seed')
+    return str(seed) if seed not in (None, "") else f"id-{student['id']}"
+
+
+@lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def avatar_data_uri(seed: str) -> str:
+    """Data URI (``data:image/svg+xml;base64,...``) del avatar para ``<img src>``."""
+    svg = get_avatar_svg(str(seed))
+    return "data:image/svg+xml;base64," + base64.b64encode(svg.encode("utf-8")).decode("ascii")
+
+
+def student_avatar_uri(student: dict) -> str:
+    """Data URI del avatar de un estudiante (ver ``avatar_seed``)."""
+    return avatar_data_uri(avatar_seed(student))
@@ -0,0 +1,163 @@
+"""
+🧭 Contrafactuales: Cambio Mínimo para Bajar el Riesgo
+==========================================================================
+Genera perturbaciones de las entradas accionables del mapeo UNRC
+(aprobadas / inscritas en S2, pago de colegiatura y modalidad), las puntúa
+en lotes grandes con una sola llamada a ``transform`` y ``predict_proba``
+por lote, y devuelve los cambios más pequeños que llevan al estudiante por
+debajo de un umbral de ``classify_risk_level``.
+
+Poda:
+- Los candidatos se recorren por costo creciente.
+- Un candidato que incluye todos los cambios de una solución ya encontrada
+  (y más) no puede ser mínimo, así que no se puntúa.
+- La búsqueda termina en cuanto hay ``max_results`` soluciones y el costo
+  pendiente supera al de la peor de ellas.
+"""
+
+from itertools import product
+
+import numpy as np
+
+try:
+    from utils import (
+        map_unrc_to_model_inputs, create_students_input_df,
+        HIGH_RISK_THRESHOLD, MODERATE_RISK_THRESHOLD, classify_risk_level
+    )
+    from rescoring import compute_momentum
+    from telemetry import TELEMETRY
+except ImportError:
+    from app.utils import (
+        map_unrc_to_model_inputs, create_students_input_df,
+        HIGH_RISK_THRESHOLD, MODERATE_RISK_THRESHOLD, classify_risk_level
+    )
+    from app.rescoring import compute_momentum
+    from app.telemetry import TELEMETRY
+
+MODALIDADES = ("Presencial-Híbrida", "A Distancia")
+TUITION_FEATURE = 'Tuition fees up to date'
+MAX_ENROLLED_DROP = 3
+DEFAULT_BATCH_SIZE = 256
+
+# Umbral a cruzar según el nivel objetivo
+TARGET_THRESHOLDS = {
+    'warning': HIGH_RISK_THRESHOLD,       # salir de "ALTO RIESGO"
+    'success': MODERATE_RISK_THRESHOLD,   # llegar a "BAJO RIESGO"
+}
+
+
+def _candidate_levers(unrc_inputs, tuition_up_to_date):
+    """
+    Enumera combinaciones de palancas con su costo.
+
+    Cada candidato es (costo, palancas) con palancas =
+    (+aprobadas S2, -inscritas S2, regulariza colegiatura, cambia modalidad).
+    """
+    aprobadas = unrc_inputs['s2_aprobadas']
+    inscritas = unrc_inputs['s2_inscritas']
+    tuition_options = (0,) if tuition_up_to_date else (0, 1)
+    candidates = []
+    for drop, gain, tuition, switch in product(
+        range(0, min(MAX_ENROLLED_DROP, inscritas - 1) + 1),
+        range(0, inscritas - aprobadas + 1),
+        tuition_options,
+        (0, 1),
+    ):
+        new_inscritas = inscritas - drop
+        if aprobadas + gain > new_inscritas or not (drop or gain or tuition or switch):
+            continue
+        candidates.append((gain + drop + tuition + switch, (gain, drop, tuition, switch)))
+    candidates.sort()
+    return candidates
+
+
+def _apply_levers(unrc_inputs, levers):
+    gain, drop, tuition, switch = levers
+    changed = dict(unrc_inputs)
+    changed['s2_aprobadas'] = unrc_inputs['s2_aprobadas'] + gain
+    changed['s2_inscritas'] = unrc_inputs['s2_inscritas'] - drop
+    if gain or drop:
+        changed['momentum'] = compute_momentum(changed)
+    if switch:
+        changed['modalidad'] = next(m for m in MODALIDADES if m != unrc_inputs['modalidad'])
+    model_inputs = map_unrc_to_model_inputs(changed)
+    if tuition:
+        model_inputs[TUITION_FEATURE] = 1
+    return changed, model_inputs
+
+
+def _dominates(levers, solution):
+    """True si ``levers`` hace al menos todos los cambios de ``solution``."""
+    return all(a >= b for a, b in zip(levers, solution))
+
+
+def describe_changes(unrc_inputs, levers) -> list:
+    """Frases para el tutor, una por palanca usada."""
+    gain, drop, tuition, switch = levers
+    aprobadas, inscritas = unrc_inputs['s2_aprobadas'], unrc_inputs['s2_inscritas']
+    steps = []
+    if gain:
+        steps.append(f"Aprobar {gain} materia(s) más en S2 ({aprobadas} → {aprobadas + gain})")
+    if drop:
+        steps.append(f"Inscribir {drop} materia(s) menos en S2 ({inscritas} → {inscritas - drop})")
+    if tuition:
+        steps.append("Regularizar el pago de colegiatura")
+    if switch:
+        other = next(m for m in MODALIDADES if m != unrc_inputs['modalidad'])
+        steps.append(f"Cambiar a modalidad {other}")
+    return steps
+
+
+def find_counterfactuals(unrc_inputs, feature_names, preprocessor, predict_dropout,
+                         target='warning', max_results=3, batch_size=DEFAULT_BATCH_SIZE) -> list:
+    """
+    Cambios mínimos que bajan la probabilidad de abandono del umbral objetivo.
+
+    Args:
+        unrc_inputs: Entradas UNRC actuales del estudiante (pueden ser simuladas).
+        feature_names: Columnas de entrada del modelo.
+        preprocessor: Preprocesador ajustado.
+        predict_dropout: Callable matriz preprocesada -> probabilidades de abandono.
+        target: 'warning' (salir de alto riesgo) o 'success' (bajo riesgo).
+        max_results: Número de soluciones a devolver.
+        batch_size: Candidatos mínimos por llamada al modelo.
+
+    Returns:
+        list: dicts con 'cost', 'risk', 'level', 'levers' y 'changes' (frases),
+        ordenados por costo y luego por riesgo.
+    """
+    threshold = TARGET_THRESHOLDS[target]
+    tuition_up_to_date = map_unrc_to_model_inputs(unrc_inputs)[TUITION_FEATURE] == 1
+    pending = _candidate_levers(unrc_inputs, tuition_up_to_date)
+    solutions = []
+
+    while pending:
+        # Lote: tiers de costo completos hasta juntar al menos ``batch_size`` candidatos
+        end = min(batch_size, len(pending))
+        while end < len(pending) and pending[end][0] == pending[end - 1][0]:
+            end += 1
+        batch, pending = pending[:end], pending[end:]
+
+        batch = [(c, lv) for c, lv in batch if not any(_dominates(lv, s['levers']) for s in solutions)]
+        if batch:
+            model_rows = [_apply_levers(unrc_inputs, lv)[1] for _, lv in batch]
+            frame = create_students_input_df(model_rows, feature_names)
+            with TELEMETRY.timed('counterfactual_batch'):
+                risks = np.asarray(predict_dropout(preprocessor.transform(frame)))
+            TELEMETRY.increment('counterfactual.scored', len(batch))
+            # Dentro del lote el orden es por costo: una solución poda a las siguientes
+            for (cost, levers), risk in zip(batch, risks):
+                if risk <= threshold and not any(_dominates(levers, s['levers']) for s in solutions):
+                    solutions.append({
+                        'cost': cost,
+                        'risk': float(risk),
+                        'level': classify_risk_level(float(risk))[0],
+                        'levers': levers,
+                        'changes': describe_changes(unrc_inputs, levers),
+                    })
+
+        solutions.sort(key=lambda s: (s['cost'], s['risk']))
+        if len(solutions) >= max_results and (not pending or pending[0][0] > solutions[max_results - 1]['cost']):
+            break
+
+    return solutions[:max_results]
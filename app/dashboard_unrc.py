@@ -4,6 +4,10 @@
 ==========================================================================
 """
 
+import math
+import uuid
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -12,22 +16,54 @@ try:
         load_model_artifacts, 
         classify_risk_level, 
         create_student_input_df, 
-        make_prediction, 
-        map_unrc_to_model_inputs
+        map_unrc_to_model_inputs,
+        load_explainer,
+        load_shadow_scorer,
+        load_inference_executor,
+        load_feature_store,
+        load_incremental_scorer,
+        load_similar_students,
+        get_model_vectors,
+        predict_from_vectors,
+        student_to_unrc_inputs
+    )
+    from styles import get_css, get_student_list_html
+    from data import (
+        get_student_cursor, get_student, get_students, get_filter_options,
+        search_students, get_facet_values, get_risk_tier_counts
     )
-    from styles import get_css
-    from data import get_student_list
+    from telemetry import TELEMETRY, BUCKET_BOUNDS_NS
+    from shadow import promotion_check
+    from avatars import student_avatar_uri
+    from counterfactuals import find_counterfactuals
+    from inference import InferenceOverloaded
 except ImportError:
     # Fallback for when running from root as module
     from app.utils import (
         load_model_artifacts, 
         classify_risk_level, 
         create_student_input_df, 
-        make_prediction, 
-        map_unrc_to_model_inputs
+        map_unrc_to_model_inputs,
+        load_explainer,
+        load_shadow_scorer,
+        load_inference_executor,
+        load_feature_store,
+        load_incremental_scorer,
+        load_similar_students,
+        get_model_vectors,
+        predict_from_vectors,
+        student_to_unrc_inputs
     )
-    from app.styles import get_css
-    from app.data import get_student_list
+    from app.styles import get_css, get_student_list_html
+    from app.data import (
+        get_student_cursor, get_student, get_students, get_filter_options,
+        search_students, get_facet_values, get_risk_tier_counts
+    )
+    from app.telemetry import TELEMETRY, BUCKET_BOUNDS_NS
+    from app.shadow import promotion_check
+    from app.avatars import student_avatar_uri
+    from app.counterfactuals import find_counterfactuals
+    from app.inference import InferenceOverloaded
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 1️⃣  CONFIGURACIÓN DE PÁGINA
@@ -57,21 +93,56 @@ if 'inscritas_s2' not in st.session_state:
     st.session_state.inscritas_s2 = 5
 if 'update_mode' not in st.session_state:
     st.session_state.update_mode = 'ratio'
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex[:8]
+if 'list_page' not in st.session_state:
+    st.session_state.list_page = 0
+
+TELEMETRY.record_rerun(st.session_state.session_key)
+
+LIST_PAGE_SIZE = 10
+RISK_TIER_LABELS = {None: "Todos", 'danger': "Alto", 'warning': "Moderado", 'success': "Bajo"}
+LOGO_PATH = Path(__file__).resolve().parent.parent / "docs" / "branding" / "Iconos" / "logos_UNRC-01.png"
 
 # Cargar modelo
 model, preprocessor, feature_names, class_names = load_model_artifacts()
+explainer = load_explainer(model, feature_names)
+shadow = load_shadow_scorer(model)
+executor = load_inference_executor(model)
+feature_store = load_feature_store(preprocessor, feature_names)
+similar_index = load_similar_students()
+rescorer = load_incremental_scorer(executor, preprocessor, feature_names, feature_store, explainer)
+
+def select_student(student):
+    """Selecciona un estudiante y carga sus datos en session state para edición."""
+    st.session_state.selected_student_id = student['id']
+    st.session_state.aprobadas_s2 = student['academic_data']['s2_aprobadas']
+    st.session_state.inscritas_s2 = student['academic_data']['s2_inscritas']
+    st.session_state.ratio_s2 = student['academic_data']['momentum']
+
+
+def select_student_from_list(widget_key):
+    student = get_student(st.session_state[widget_key])
+    if student is not None:
+        select_student(student)
+        st.session_state.selection_changed = True
+
+
+def change_list_page(step):
+    st.session_state.list_page = max(0, st.session_state.list_page + step)
+
+
+def reset_list_page():
+    st.session_state.list_page = 0
 
-# Cargar datos simulados
-students = get_student_list()
-# Ordenar por riesgo descendente
-students.sort(key=lambda x: x['risk_score'], reverse=True)
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 3️⃣  SIDEBAR (NAVEGACIÓN)
 # ═══════════════════════════════════════════════════════════════════════════
 
 with st.sidebar:
-    st.image("https://cdn-icons-png.flaticon.com/512/2991/2991148.png", width=50) # Placeholder logo
+    if LOGO_PATH.exists():
+        st.image(str(LOGO_PATH), use_container_width=True)
     st.markdown("### SAREP")
     
     st.markdown("---")
@@ -88,200 +159,438 @@ with st.sidebar:
     st.caption("Universidad Nacional Rosario Castellanos")
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 4️⃣  DASHBOARD PRINCIPAL
+# 4️⃣  FRAGMENTOS DEL DASHBOARD
 # ═══════════════════════════════════════════════════════════════════════════
+# La lista y el perfil se re-ejecutan de forma independiente: paginar o
+# filtrar solo re-ejecuta la lista, y simular solo re-ejecuta el perfil.
 
-if page == "Dashboard":
-    st.title("Dashboard del Tutor")
-    st.markdown("SAREP traduce el análisis en intervención humana y proactiva.")
+def predict_student_risk(student, unrc_inputs):
+    """
+    Predice solo si las entradas cambiaron desde la última predicción de la
+    sesión. Los fallos (p. ej. cola de inferencia llena) no se cachean, así
+    que la siguiente ejecución vuelve a intentar.
+    """
+    key = (student['id'], tuple(sorted(unrc_inputs.items())))
+    cached = st.session_state.get('last_prediction')
+    if cached is not None and cached[0] == key:
+        TELEMETRY.record_cache('prediction', hits=1)
+        return cached[1], cached[2]
+    TELEMETRY.record_cache('prediction', misses=1)
     
-    col_list, col_profile = st.columns([1, 2.5])
-    
-    # ─── COLUMNA IZQUIERDA: LISTA DE ESTUDIANTES ─────────────────────────────
-    with col_list:
-        st.subheader("Lista Priorizada por Riesgo")
-        st.caption("Los tutores ven inmediatamente quién necesita más atención.")
-        
-        for student in students:
-            # Crear un contenedor clickeable (simulado con botón)
-            # Usamos columnas para el layout del item
-            c1, c2, c3 = st.columns([1, 3, 1])
-            
-            # Estilo condicional si está seleccionado
-            is_selected = st.session_state.selected_student_id == student['id']
-            bg_color = "#e3f2fd" if is_selected else "#ffffff"
-            border_color = "#9F2241" if is_selected else "#eee"
-            
-            # Calcular color de riesgo para el badge
-            _, color, _ = classify_risk_level(student['risk_score'])
-            
-            # Botón invisible que cubre todo el item sería ideal, pero en Streamlit
-            # usamos un botón normal con el nombre
-            
-            with st.container():
-                st.markdown(
-                    f"""
-                    <div class="list-item-container" style="
-                        background-color: {bg_color}; 
-                        border-left: 4px solid {border_color};
-                        padding: 12px; 
-                        border-radius: 8px; 
-                        margin-bottom: 12px;
-                        display: flex;
-                        align-items: center;
-                        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-                    ">
-                        <img src="{student['avatar']}" style="width: 42px; height: 42px; border-radius: 50%; margin-right: 12px; border: 2px solid #fff; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                        <div style="flex-grow: 1;">
-                            <div style="font-weight: 600; font-size: 0.95rem; color: #333;">{student['name']}</div>
-                            <div style="font-size: 0.75rem; color: #888; margin-top: 2px;">Estudiante • ID: {student['id']}</div>
-                        </div>
-                        <div style="font-weight: 700; color: {color}; font-size: 0.9rem; background: #fff; padding: 4px 8px; border-radius: 12px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);">{int(student['risk_score']*100)}%</div>
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-                if st.button(f"Ver Perfil", key=f"btn_{student['id']}", use_container_width=True):
-                    st.session_state.selected_student_id = student['id']
-                    # Cargar datos del estudiante en session state para edición
-                    st.session_state.aprobadas_s2 = student['academic_data']['s2_aprobadas']
-                    st.session_state.inscritas_s2 = student['academic_data']['s2_inscritas']
-                    st.session_state.ratio_s2 = student['academic_data']['momentum']
-                    st.rerun()
+    if unrc_inputs == student_to_unrc_inputs(student):
+        # Sin simulación: vector listo del almacén de features
+        X = get_model_vectors([student], feature_names, preprocessor, feature_store)
+    else:
+        # Simulación: mapeo y preprocesamiento de la fila modificada
+        with TELEMETRY.timed('mapping'):
+            inputs = map_unrc_to_model_inputs(unrc_inputs)
+        X_one = create_student_input_df(inputs, feature_names)
+        with TELEMETRY.timed('transform'):
+            X = preprocessor.transform(X_one)
+    result = predict_from_vectors(X, model, class_names, shadow=shadow, executor=executor)
+    if result['success']:
+        st.session_state.last_prediction = (key, result, X)
+    return result, X
 
-    # ─── COLUMNA DERECHA: PERFIL DEL ESTUDIANTE ──────────────────────────────
-    with col_profile:
-        # Obtener estudiante seleccionado
-        selected_student = next((s for s in students if s['id'] == st.session_state.selected_student_id), students[0])
+
+def counterfactuals_for(student, unrc_inputs, target):
+    """
+    Cambios mínimos para bajar de nivel; se recalculan solo si cambian las
+    entradas. Retorna None (sin cachear) si la cola de inferencia está llena.
+    """
+    key = (student['id'], tuple(sorted(unrc_inputs.items())), target)
+    cached = st.session_state.get('last_counterfactuals')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        results = find_counterfactuals(
+            unrc_inputs, feature_names, preprocessor,
+            lambda X: executor.predict_proba(X)[0][:, 0], target=target
+        )
+    except InferenceOverloaded:
+        return None
+    st.session_state.last_counterfactuals = (key, results)
+    return results
+
+
+def apply_simulation(student):
+    """Callback del formulario del simulador: aplica los valores S2 enviados."""
+    new_aprobadas = st.session_state[f"ni_aprobadas_{student['id']}"]
+    new_inscritas = st.session_state[f"ni_inscritas_{student['id']}"]
+    if new_aprobadas == st.session_state.aprobadas_s2 and new_inscritas == st.session_state.inscritas_s2:
+        return
+    
+    st.session_state.aprobadas_s2 = new_aprobadas
+    st.session_state.inscritas_s2 = new_inscritas
+    
+    # Recalcular momentum (S2 Ratio - S1 Ratio)
+    if new_inscritas > 0:
+        s2_ratio = new_aprobadas / new_inscritas
         
-        # Calcular riesgo en tiempo real (para permitir simulación)
-        # Usamos los valores de session_state si coinciden con el estudiante, sino los del estudiante
-        # (Aquí simplificamos: siempre usamos session_state que se actualizó al clickear)
+        # Obtener datos S1 del estudiante actual
+        s1_app = student['academic_data']['s1_aprobadas']
+        s1_ins = student['academic_data']['s1_inscritas']
+        s1_ratio = s1_app / s1_ins if s1_ins > 0 else 0
         
-        # Inputs para el cálculo
-        unrc_inputs = {
-            'momentum': st.session_state.ratio_s2,
-            'age': selected_student['academic_data']['age'],
-            's1_aprobadas': selected_student['academic_data']['s1_aprobadas'],
-            's1_inscritas': selected_student['academic_data']['s1_inscritas'],
-            's2_aprobadas': st.session_state.aprobadas_s2,
-            's2_inscritas': st.session_state.inscritas_s2,
-            'satisfaccion': selected_student['context_data']['satisfaccion'],
-            'modalidad': selected_student['context_data']['modalidad'],
-            'desafio': selected_student['context_data']['desafio'],
-        }
+        # Momentum es la diferencia
+        st.session_state.ratio_s2 = round(s2_ratio - s1_ratio, 2)
+
+
+@st.fragment
+def render_student_list():
+    # Un cambio de selección necesita re-ejecutar también el perfil
+    if st.session_state.pop('selection_changed', False):
+        st.rerun()
+    
+    st.subheader("Lista Priorizada por Riesgo")
+    st.caption("Los tutores ven inmediatamente quién necesita más atención.")
+    
+    # Búsqueda por prefijo de nombre/correo (índice en memoria)
+    search_query = st.text_input(
+        "Buscar estudiante", key="search_query", placeholder="Nombre o correo",
+        on_change=reset_list_page
+    )
+    
+    # Filtros por programa / tutor (consultas indexadas en el almacén)
+    programs, tutors = get_filter_options()
+    f_col1, f_col2 = st.columns(2)
+    program_filter = f_col1.selectbox(
+        "Programa", [None] + programs, format_func=lambda v: "Todos" if v is None else v,
+        key="filter_program", on_change=reset_list_page
+    )
+    tutor_filter = f_col2.selectbox(
+        "Tutor", [None] + tutors, format_func=lambda v: "Todos" if v is None else v,
+        key="filter_tutor", on_change=reset_list_page
+    )
+    with st.expander("Más filtros"):
+        tier_filter = st.selectbox(
+            "Nivel de riesgo", list(RISK_TIER_LABELS), format_func=RISK_TIER_LABELS.get,
+            key="filter_tier", on_change=reset_list_page
+        )
+        modalidad_filter = st.selectbox(
+            "Modalidad", [None] + get_facet_values('modalidad'), format_func=lambda v: "Todas" if v is None else v,
+            key="filter_modalidad", on_change=reset_list_page
+        )
+        desafio_filter = st.selectbox(
+            "Desafío", [None] + get_facet_values('desafio'), format_func=lambda v: "Todos" if v is None else v,
+            key="filter_desafio", on_change=reset_list_page
+        )
+    
+    if search_query or tier_filter or modalidad_filter or desafio_filter:
+        cursor = search_students(
+            search_query, program=program_filter, tutor=tutor_filter,
+            risk_tier=tier_filter, modalidad=modalidad_filter, desafio=desafio_filter
+        )
+    else:
+        cursor = get_student_cursor(program=program_filter, tutor=tutor_filter)
+    
+    tiers = get_risk_tier_counts(program=program_filter, tutor=tutor_filter)
+    st.caption(f"🔴 {tiers['danger']} alto · 🟠 {tiers['warning']} moderado · 🟢 {tiers['success']} bajo")
+    
+    # Solo se pide al cursor la ventana visible y se dibuja en un único bloque HTML
+    total_students = len(cursor)
+    n_pages = max(1, math.ceil(total_students / LIST_PAGE_SIZE))
+    list_page = min(st.session_state.list_page, n_pages - 1)
+    page_students = cursor.fetch(list_page * LIST_PAGE_SIZE, LIST_PAGE_SIZE)
+    st.session_state.visible_student_ids = [s['id'] for s in page_students]
+    
+    st.markdown(
+        get_student_list_html(
+            page_students,
+            st.session_state.selected_student_id,
+            lambda p: classify_risk_level(p)[1]
+        ),
+        unsafe_allow_html=True
+    )
+    
+    page_names = {s['id']: s['name'] for s in page_students}
+    page_ids = list(page_names)
+    st.radio(
+        "Ver Perfil",
+        page_ids,
+        index=page_ids.index(st.session_state.selected_student_id) if st.session_state.selected_student_id in page_ids else None,
+        format_func=lambda student_id: page_names[student_id],
+        key=f"list_selection_{list_page}",
+        on_change=select_student_from_list,
+        args=(f"list_selection_{list_page}",)
+    )
+    
+    nav_prev, nav_info, nav_next = st.columns([1, 2, 1])
+    nav_prev.button("◀", key="page_prev", disabled=list_page == 0, on_click=change_list_page, args=(-1,))
+    nav_info.caption(f"Página {list_page + 1} de {n_pages} · {total_students} estudiantes")
+    nav_next.button("▶", key="page_next", disabled=list_page >= n_pages - 1, on_click=change_list_page, args=(1,))
+
+
+@st.fragment
+def render_student_profile():
+    # Obtener estudiante seleccionado
+    selected_student = get_student(st.session_state.selected_student_id) or get_student_cursor().fetch(0, 1)[0]
+    
+    # Calcular riesgo en tiempo real (para permitir simulación)
+    # Usamos los valores de session_state si coinciden con el estudiante, sino los del estudiante
+    # (Aquí simplificamos: siempre usamos session_state que se actualizó al seleccionar)
+    
+    # Inputs para el cálculo
+    unrc_inputs = {
+        'momentum': st.session_state.ratio_s2,
+        'age': selected_student['academic_data']['age'],
+        's1_aprobadas': selected_student['academic_data']['s1_aprobadas'],
+        's1_inscritas': selected_student['academic_data']['s1_inscritas'],
+        's2_aprobadas': st.session_state.aprobadas_s2,
+        's2_inscritas': st.session_state.inscritas_s2,
+        'satisfaccion': selected_student['context_data']['satisfaccion'],
+        'modalidad': selected_student['context_data']['modalidad'],
+        'desafio': selected_student['context_data']['desafio'],
+    }
+    result, X_student = predict_student_risk(selected_student, unrc_inputs)
+    if not result['success']:
+        if result.get('overloaded'):
+            st.warning("⏳ El servicio de predicción está saturado. Reintenta en unos segundos.")
+        else:
+            st.error(f"No se pudo calcular el riesgo: {result['error']}")
+        st.button("🔄 Reintentar", key="retry_prediction")
+        return
+    
+    current_risk = result['probabilities']['Dropout']
+    level, color, tier = classify_risk_level(current_risk)
+
+    # Factores del modelo: se explica la página visible en un solo lote
+    # (cacheado por estudiante y versión del modelo); si el tutor simula
+    # cambios, se explica solo la fila simulada.
+    stored = selected_student['academic_data']
+    if (st.session_state.aprobadas_s2, st.session_state.inscritas_s2) == (stored['s2_aprobadas'], stored['s2_inscritas']):
+        batch_ids = list(dict.fromkeys([selected_student['id'], *st.session_state.get('visible_student_ids', [])]))
+        drivers = explainer.explain(
+            batch_ids,
+            lambda ids: get_model_vectors(get_students(ids), feature_names, preprocessor, feature_store)
+        )[selected_student['id']]
+    else:
+        drivers = explainer.top_drivers(explainer.contributions(X_student)[0])
+
+    # ─── HEADER DEL PERFIL ───
+    st.markdown(f"### Student Profile")
+    
+    with st.container():
+        st.markdown('<div class="student-card">', unsafe_allow_html=True)
         
-        # Mapeo y Predicción
-        inputs = map_unrc_to_model_inputs(unrc_inputs)
-        X_one = create_student_input_df(inputs, feature_names)
-        result = make_prediction(X_one, model, preprocessor, class_names)
+        p_col1, p_col2, p_col3 = st.columns([1, 3, 1.5])
         
-        current_risk = result['probabilities']['Dropout']
-        level, color, _ = classify_risk_level(current_risk)
-
-        # ─── HEADER DEL PERFIL ───
-        st.markdown(f"### Student Profile")
+        with p_col1:
+            st.markdown(
+                f'<img src="{student_avatar_uri(selected_student)}" width="100" style="border-radius: 50%;">',
+                unsafe_allow_html=True
+            )
         
-        with st.container():
-            st.markdown('<div class="student-card">', unsafe_allow_html=True)
+        with p_col2:
+            st.markdown(f"## {selected_student['name']}")
+            st.markdown(f"**Email:** {selected_student['email']}")
+            st.markdown(f"**Edad:** {selected_student['academic_data']['age']} años")
             
-            p_col1, p_col2, p_col3 = st.columns([1, 3, 1.5])
-            
-            with p_col1:
-                st.image(selected_student['avatar'], width=100)
-            
-            with p_col2:
-                st.markdown(f"## {selected_student['name']}")
-                st.markdown(f"**Email:** {selected_student['email']}")
-                st.markdown(f"**Edad:** {selected_student['academic_data']['age']} años")
-                
-                # Mini stats
-                s1, s2, s3 = st.columns(3)
-                s1.metric("Academic", f"{st.session_state.aprobadas_s2}/{st.session_state.inscritas_s2}")
-                s2.metric("Dapis", "16") # Placeholder
-                s3.metric("Dvairolan", "2020") # Placeholder
+            # Mini stats
+            s1, s2, s3 = st.columns(3)
+            s1.metric("Academic", f"{st.session_state.aprobadas_s2}/{st.session_state.inscritas_s2}")
+            s2.metric("Dapis", "16") # Placeholder
+            s3.metric("Dvairolan", "2020") # Placeholder
+        
+        with p_col3:
+            # Risk Circle HTML/SVG
+            risk_percent = int(current_risk * 100)
+            stroke_dash = 251.2 * (risk_percent / 100) # 2 * pi * r (r=40) approx
             
-            with p_col3:
-                # Risk Circle HTML/SVG
-                risk_percent = int(current_risk * 100)
-                stroke_dash = 251.2 * (risk_percent / 100) # 2 * pi * r (r=40) approx
-                
-                st.markdown(f"""
-                <div style="display: flex; flex-direction: column; align-items: center;">
-                    <div style="position: relative; width: 100px; height: 100px;">
-                        <svg width="100" height="100" viewBox="0 0 100 100">
-                            <circle cx="50" cy="50" r="40" stroke="#eee" stroke-width="8" fill="none"></circle>
-                            <circle cx="50" cy="50" r="40" stroke="{color}" stroke-width="8" fill="none"
-                                    stroke-dasharray="251.2" stroke-dashoffset="{251.2 - (251.2 * risk_percent / 100)}"
-                                    transform="rotate(-90 50 50)"></circle>
-                            <text x="50" y="55" text-anchor="middle" font-size="20" font-weight="bold" fill="{color}">{risk_percent}%</text>
-                        </svg>
-                    </div>
-                    <div style="margin-top: 5px; font-weight: bold; color: {color};">{level.split(' ')[1]}</div>
+            st.markdown(f"""
+            <div style="display: flex; flex-direction: column; align-items: center;">
+                <div style="position: relative; width: 100px; height: 100px;">
+                    <svg width="100" height="100" viewBox="0 0 100 100">
+                        <circle cx="50" cy="50" r="40" stroke="#eee" stroke-width="8" fill="none"></circle>
+                        <circle cx="50" cy="50" r="40" stroke="{color}" stroke-width="8" fill="none"
+                                stroke-dasharray="251.2" stroke-dashoffset="{251.2 - (251.2 * risk_percent / 100)}"
+                                transform="rotate(-90 50 50)"></circle>
+                        <text x="50" y="55" text-anchor="middle" font-size="20" font-weight="bold" fill="{color}">{risk_percent}%</text>
+                    </svg>
                 </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+                <div style="margin-top: 5px; font-weight: bold; color: {color};">{level.split(' ')[1]}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
 
-        # ─── DETALLES Y SIMULACIÓN ───
-        d_col1, d_col2 = st.columns([1.2, 1])
+    # ─── DETALLES Y SIMULACIÓN ───
+    d_col1, d_col2 = st.columns([1.2, 1])
+    
+    with d_col1:
+        st.markdown("#### 📝 Academic Data (Simulador)")
+        st.info("Modifica los valores para simular cambios en el riesgo.")
         
-        with d_col1:
-            st.markdown("#### 📝 Academic Data (Simulador)")
-            st.info("Modifica los valores para simular cambios en el riesgo.")
-            
-            # Formulario de edición
-            # Usamos keys dinámicas para forzar la actualización cuando cambia el estudiante
-            new_aprobadas = st.number_input(
+        # Formulario de edición: los cambios se aplican juntos al enviar (debounce)
+        # Usamos keys dinámicas para forzar la actualización cuando cambia el estudiante
+        with st.form(key=f"sim_form_{selected_student['id']}", border=False):
+            st.number_input(
                 "Aprobadas S2", 
                 0, 30, 
                 st.session_state.aprobadas_s2,
                 key=f"ni_aprobadas_{selected_student['id']}"
             )
-            new_inscritas = st.number_input(
+            st.number_input(
                 "Inscritas S2", 
                 1, 30, 
                 st.session_state.inscritas_s2,
                 key=f"ni_inscritas_{selected_student['id']}"
             )
-            
-            if new_aprobadas != st.session_state.aprobadas_s2 or new_inscritas != st.session_state.inscritas_s2:
-                st.session_state.aprobadas_s2 = new_aprobadas
-                st.session_state.inscritas_s2 = new_inscritas
-                
-                # Recalcular momentum (S2 Ratio - S1 Ratio)
-                if new_inscritas > 0:
-                    s2_ratio = new_aprobadas / new_inscritas
-                    
-                    # Obtener datos S1 del estudiante actual
-                    s1_app = selected_student['academic_data']['s1_aprobadas']
-                    s1_ins = selected_student['academic_data']['s1_inscritas']
-                    s1_ratio = s1_app / s1_ins if s1_ins > 0 else 0
-                    
-                    # Momentum es la diferencia
-                    st.session_state.ratio_s2 = round(s2_ratio - s1_ratio, 2)
-                
-                st.rerun()
-
-            # Context inputs
-            st.markdown("#### 🌍 Contexto")
-            st.markdown(f"**Satisfacción:** {selected_student['context_data']['satisfaccion']}")
-            st.markdown(f"**Modalidad:** {selected_student['context_data']['modalidad']}")
-            st.markdown(f"**Desafío:** {selected_student['context_data']['desafio']}")
-
-        with d_col2:
-            # Riesgo Principal Box
-            st.markdown(f"""
-            <div class="risk-card">
-                <div class="risk-title">Riesgo Principal: {selected_student['risk_diagnosis']}</div>
-                <p>{selected_student['risk_description']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("#### Sugerencia de Intervención")
-            st.info(f"💡 {selected_student['intervention']}")
-            
-            st.button("📅 Agendar sesión", type="primary", use_container_width=True)
+            st.form_submit_button(
+                "Simular", on_click=apply_simulation, args=(selected_student,), use_container_width=True
+            )
+
+        # Context inputs
+        st.markdown("#### 🌍 Contexto")
+        st.markdown(f"**Satisfacción:** {selected_student['context_data']['satisfaccion']}")
+        st.markdown(f"**Modalidad:** {selected_student['context_data']['modalidad']}")
+        st.markdown(f"**Desafío:** {selected_student['context_data']['desafio']}")
+
+    with d_col2:
+        # Riesgo Principal Box
+        st.markdown(f"""
+        <div class="risk-card">
+            <div class="risk-title">Riesgo Principal: {selected_student['risk_diagnosis']}</div>
+            <p>{selected_student['risk_description']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("#### Factores del Modelo")
+        st.caption("Variables que más elevan la probabilidad de abandono (contribuciones XGBoost).")
+        for feature, contribution in drivers:
+            st.markdown(f"- **{feature}**: {contribution:+.2f}")
+        
+        if tier != 'success':
+            target = 'warning' if tier == 'danger' else 'success'
+            st.markdown("#### ¿Qué bajaría el riesgo?")
+            st.caption("Cambios accionables más pequeños que cruzan al siguiente nivel de riesgo.")
+            options = counterfactuals_for(selected_student, unrc_inputs, target)
+            if options is None:
+                st.caption("⏳ El servicio de predicción está saturado; la búsqueda se reintentará en la próxima actualización.")
+                options = []
+            elif not options:
+                st.caption("Ninguna combinación de cambios accionables cruza el umbral.")
+            for option in options:
+                st.markdown(
+                    f"- {' · '.join(option['changes'])} → **{option['risk']:.0%}** ({option['level']})"
+                )
+        
+        st.markdown("#### 👥 Estudiantes Similares")
+        if similar_index is None:
+            st.caption("Índice no disponible. Constrúyelo con `python src/models/similar_students.py`.")
+        else:
+            neighbors, outcomes = similar_index.similar(X_student[0], k=10)
+            st.caption(
+                f"De los {len(neighbors)} casos históricos más parecidos: "
+                + " · ".join(f"{n} {outcome}" for outcome, n in outcomes.items())
+            )
+            with st.expander("Ver casos similares"):
+                st.dataframe(neighbors, use_container_width=True, hide_index=True)
+        
+        st.markdown("#### Sugerencia de Intervención")
+        st.info(f"💡 {selected_student['intervention']}")
+        
+        st.button("📅 Agendar sesión", type="primary", use_container_width=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 5️⃣  DASHBOARD PRINCIPAL
+# ═══════════════════════════════════════════════════════════════════════════
+
+if page == "Dashboard":
+    st.title("Dashboard del Tutor")
+    st.markdown("SAREP traduce el análisis en intervención humana y proactiva.")
+    
+    col_list, col_profile = st.columns([1, 2.5])
+    
+    # ─── COLUMNA IZQUIERDA: LISTA DE ESTUDIANTES ─────────────────────────────
+    with col_list:
+        render_student_list()
+
+    # ─── COLUMNA DERECHA: PERFIL DEL ESTUDIANTE ──────────────────────────────
+    with col_profile:
+        render_student_profile()
+
+elif page == "Configuración":
+    st.title("Configuración")
+    st.subheader("Panel de Operaciones")
+    st.caption("Latencia del camino de inferencia, caches y reruns del proceso actual.")
+
+    latency = TELEMETRY.latency_frame()
+    caches = TELEMETRY.cache_frame()
+    sessions = TELEMETRY.session_frame()
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Predicciones", int(latency.loc['predict', 'count']))
+    m2.metric("Reruns (esta sesión)", int(sessions['reruns'].get(st.session_state.session_key, 0)))
+    m3.metric("Sesiones activas", len(sessions))
+
+    st.markdown("#### ⏱️ Latencia por etapa (ms)")
+    st.dataframe(latency.round(3), use_container_width=True)
+
+    stage = st.selectbox("Histograma de latencia", list(latency.index))
+    counts, _ = TELEMETRY.histogram(stage).counts()
+    labels = [f"{i:02d} · ≤{b / 1e6:.3g} ms" for i, b in enumerate(BUCKET_BOUNDS_NS)] + [f"{len(BUCKET_BOUNDS_NS):02d} · desborde"]
+    hist_df = pd.DataFrame({'bucket': labels, 'conteo': counts})
+    nonzero = hist_df.index[hist_df['conteo'] > 0]
+    if len(nonzero):
+        st.bar_chart(hist_df.loc[nonzero.min():nonzero.max()], x='bucket', y='conteo')
+    else:
+        st.caption("Sin muestras registradas para esta etapa.")
+
+    c_col1, c_col2 = st.columns(2)
+    with c_col1:
+        st.markdown("#### 🗃️ Caches")
+        st.dataframe(caches, use_container_width=True)
+    with c_col2:
+        st.markdown("#### 🔁 Reruns por sesión")
+        st.dataframe(sessions, use_container_width=True)
+
+    st.markdown("#### 🧵 Cola de Inferencia")
+    queue_stats = executor.stats()
+    st.caption(f"{queue_stats['workers']} hilos × nthread={queue_stats['nthread']} · "
+               f"cola máxima {queue_stats['max_queue']}")
+    q1, q2, q3, q4 = st.columns(4)
+    q1.metric("En cola / ejecución", f"{queue_stats['queued']} / {queue_stats['running']}")
+    q2.metric("Pico pendiente", queue_stats['peak_pending'])
+    q3.metric("Rechazadas", f"{queue_stats['rejected']} / {queue_stats['submitted']}")
+    q4.metric("Espera p95 (ms)", f"{queue_stats['queue_wait']['p95_ms']:.2f}")
+
+    st.markdown("#### 🔄 Re-scoring por Eventos")
+    ops_counters = TELEMETRY.counters()
+    r1, r2, r3 = st.columns(3)
+    r1.metric("Eventos consumidos", ops_counters.get('rescoring.events', 0))
+    r2.metric("Estudiantes re-puntuados", ops_counters.get('rescoring.scored', 0))
+    r3.metric("Pendientes", rescorer.pending)
+
+    st.markdown("#### 🌗 Shadow Scoring (Modelo Candidato)")
+    if shadow is None:
+        st.caption("Sin modelo candidato. Coloca uno en `models/candidate/xgboost_model.pkl` "
+                   "o define `SAREP_CANDIDATE_MODEL` para activar el modo shadow.")
+    else:
+        shadow_summary = shadow.summary()
+        st.caption(f"Producción `{shadow.prod_version}` vs. candidato `{shadow.cand_version}`")
+        if shadow_summary['n']:
+            s1, s2, s3, s4 = st.columns(4)
+            s1.metric("Comparaciones", shadow_summary['n'])
+            s2.metric("Acuerdo de clase", f"{shadow_summary['class_agreement']:.1%}")
+            s3.metric("|Δ P(Dropout)| medio", f"{shadow_summary['mean_abs_diff']:.3f}")
+            s4.metric("p95 cand./prod. (ms)", f"{shadow_summary['cand_p95_ms']:.2f} / {shadow_summary['prod_p95_ms']:.2f}")
+        approved, reasons = promotion_check(shadow_summary)
+        if approved:
+            st.success("✅ El candidato cumple los criterios de acuerdo y latencia para promoverse.")
+        else:
+            for reason in reasons:
+                st.warning(reason)
+
+    e_col1, e_col2, e_col3 = st.columns(3)
+    e_col1.download_button("Exportar JSON", TELEMETRY.to_json(), file_name="sarep_operaciones.json",
+                           mime="application/json", use_container_width=True)
+    e_col2.download_button("Exportar CSV", latency.to_csv(), file_name="sarep_latencias.csv",
+                           mime="text/csv", use_container_width=True)
+    if e_col3.button("Reiniciar métricas", use_container_width=True):
+        TELEMETRY.reset()
+        st.rerun()
 
 else:
     st.info("Página en construcción")
@@ -1,7 +1,30 @@
 
+import os
 import random
+import threading
 
-def get_student_list():
+try:
+    from student_store import StudentStore, StudentIdCursor
+    from search_index import StudentSearchIndex
+    from student_records import StudentTable
+    from priority import RiskPriorityIndex, PriorityCursor
+except ImportError:
+    from app.student_store import StudentStore, StudentIdCursor
+    from app.search_index import StudentSearchIndex
+    from app.student_records import StudentTable
+    from app.priority import RiskPriorityIndex, PriorityCursor
+
+_STORE = None
+_SEARCH_INDEX = None
+_TABLE = None
+_PRIORITY = None
+_STORE_LOCK = threading.Lock()
+# Una actualización toca almacén, tabla, índice de búsqueda y prioridad; los
+# lectores que combinan varias de esas estructuras toman el mismo lock
+_UPDATE_LOCK = threading.RLock()
+
+
+def _simulated_students():
     """
     Genera una lista de estudiantes simulados para el dashboard.
     """
@@ -10,7 +33,9 @@ def get_student_list():
             "id": 1,
             "name": "Sofia Garcés",
             "email": "sofia.garces@universidad.edu",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Sofia",
+            "avatar_seed": "Sofia",
+            "program": "Ciencias de Datos para Negocios",
+            "tutor": "Mtra. Elena Ríos",
             "risk_score": 0.88,
             "academic_data": {
                 "age": 20,
@@ -33,7 +58,9 @@ def get_student_list():
             "id": 2,
             "name": "Andrés Kametta",
             "email": "andres.kametta@universidad.edu",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Andres",
+            "avatar_seed": "Andres",
+            "program": "Derecho y Criminología",
+            "tutor": "Mtro. Jorge Salinas",
             "risk_score": 0.85,
             "academic_data": {
                 "age": 22,
@@ -56,7 +83,9 @@ def get_student_list():
             "id": 3,
             "name": "Mariana Garcés",
             "email": "mariana.garces@universidad.edu",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Mariana",
+            "avatar_seed": "Mariana",
+            "program": "Psicología",
+            "tutor": "Mtra. Elena Ríos",
             "risk_score": 0.79,
             "academic_data": {
                 "age": 19,
@@ -79,7 +108,9 @@ def get_student_list():
             "id": 4,
             "name": "Carlos Ruiz",
             "email": "carlos.ruiz@universidad.edu",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Carlos",
+            "avatar_seed": "Carlos",
+            "program": "Ciencias de Datos para Negocios",
+            "tutor": "Mtro. Jorge Salinas",
             "risk_score": 0.45,
             "academic_data": {
                 "age": 21,
@@ -102,7 +133,9 @@ def get_student_list():
             "id": 5,
             "name": "Lucía Méndez",
             "email": "lucia.mendez@universidad.edu",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Lucia",
+            "avatar_seed": "Lucia",
+            "program": "Relaciones Internacionales",
+            "tutor": "Mtra. Elena Ríos",
             "risk_score": 0.12,
             "academic_data": {
                 "age": 20,
@@ -123,3 +156,144 @@ def get_student_list():
         }
     ]
     return students
+
+
+def get_store() -> StudentStore:
+    """
+    Almacén de estudiantes compartido por el proceso. Usa el archivo SQLite de
+    ``SAREP_STUDENT_DB`` si existe; si no, uno en memoria con los datos simulados.
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                db_path = os.environ.get("SAREP_STUDENT_DB")
+                store = StudentStore(db_path or ":memory:")
+                if store.count() == 0:
+                    store.upsert_many(_simulated_students())
+                _STORE = store
+    return _STORE
+
+
+def get_student_table() -> StudentTable:
+    """Copia columnar compacta de la matrícula, cargada una vez desde el almacén."""
+    global _TABLE
+    if _TABLE is None:
+        store = get_store()
+        with _STORE_LOCK:
+            if _TABLE is None:
+                _TABLE = StudentTable(store.rows())
+    return _TABLE
+
+
+def get_search_index() -> StudentSearchIndex:
+    """Índice de búsqueda construido una vez a partir de la tabla columnar."""
+    global _SEARCH_INDEX
+    if _SEARCH_INDEX is None:
+        table = get_student_table()
+        with _STORE_LOCK:
+            if _SEARCH_INDEX is None:
+                _SEARCH_INDEX = StudentSearchIndex.build(table)
+    return _SEARCH_INDEX
+
+
+def get_priority_index() -> RiskPriorityIndex:
+    """Listas de prioridad por riesgo (global, por programa y por tutor)."""
+    global _PRIORITY
+    if _PRIORITY is None:
+        table = get_student_table()
+        with _STORE_LOCK:
+            if _PRIORITY is None:
+                _PRIORITY = RiskPriorityIndex.build(
+                    {'id': r.id, 'risk_score': r.risk_score, 'program': r.program, 'tutor': r.tutor}
+                    for r in table
+                )
+    return _PRIORITY
+
+
+def get_student_list():
+    """Lista completa de estudiantes, ordenada por riesgo descendente."""
+    return get_store().query()
+
+
+def get_student_cursor(program=None, tutor=None):
+    """Cursor sobre los estudiantes (opcionalmente de un programa o tutor) ordenados por riesgo."""
+    return PriorityCursor(get_priority_index(), get_students, program=program, tutor=tutor,
+                          lock=_UPDATE_LOCK)
+
+
+def get_risk_tier_counts(program=None, tutor=None):
+    """Conteo por nivel de riesgo ('danger', 'warning', 'success'), mantenido incrementalmente."""
+    return get_priority_index().tier_counts(program=program, tutor=tutor)
+
+
+def get_student(student_id):
+    """Registro de un estudiante por id (None si no existe)."""
+    record = get_student_table().get(student_id)
+    return None if record is None else record.to_dict()
+
+
+def get_students(student_ids):
+    """Varios registros por id, en el orden solicitado."""
+    return [record.to_dict() for record in get_student_table().get_many(student_ids)]
+
+
+def search_students(text="", **filters):
+    """Cursor sobre los resultados de búsqueda (prefijos de nombre/correo + facetas)."""
+    # La búsqueda ordena con el riesgo de la tabla columnar
+    with _UPDATE_LOCK:
+        ids = get_search_index().search(text, **filters)
+    return StudentIdCursor(get_store(), ids)
+
+
+def update_student_risk(student_id, risk_score):
+    """Actualiza el riesgo en el almacén y, de forma incremental, en los índices."""
+    store, table = get_store(), get_student_table()
+    search_index, priority = get_search_index(), get_priority_index()
+    with _UPDATE_LOCK:
+        store.update_risk(student_id, risk_score)
+        table.update_risk(student_id, risk_score)
+        search_index.update_risk(student_id, risk_score)
+        priority.update_risk(student_id, risk_score)
+
+
+def update_student_fields(student_id, changes, meta=None):
+    """
+    Aplica cambios de columnas planas (p. ej. ``{'s2_aprobadas': 4}``) al almacén,
+    a la tabla columnar y al índice de búsqueda. ``meta`` (p. ej. el offset
+    del log de eventos) se guarda en el almacén en la misma transacción.
+
+    Raises:
+        ValueError: columna desconocida o valor inválido; se valida todo
+            antes de escribir, así que almacén y tabla no quedan desalineados.
+    """
+    store, table = get_store(), get_student_table()
+    search_index, priority = get_search_index(), get_priority_index()
+    changes = table.coerce(changes)
+    with _UPDATE_LOCK:
+        with search_index.reindexing(student_id):
+            store.update_fields(student_id, changes, meta=meta)
+            table.update_fields(student_id, changes)
+        record = table.get(student_id)
+        if record is not None and {'program', 'tutor', 'risk_score'} & changes.keys():
+            priority.add(record.id, record.risk_score, program=record.program, tutor=record.tutor)
+
+
+def get_store_meta(key, default=None):
+    """Metadato guardado en el almacén (texto; ``default`` si no existe)."""
+    return get_store().get_meta(key, default)
+
+
+def set_store_meta(key, value):
+    get_store().set_meta(key, value)
+
+
+def get_filter_options():
+    """Programas y tutores disponibles para filtrar la lista."""
+    store = get_store()
+    return store.distinct('program'), store.distinct('tutor')
+
+
+def get_facet_values(field):
+    """Valores disponibles de una faceta del índice (p. ej. 'modalidad', 'desafio')."""
+    return get_search_index().values(field)
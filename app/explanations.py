@@ -0,0 +1,134 @@
+"""
+🔎 Explicaciones por Estudiante (Contribuciones XGBoost)
+==========================================================================
+Calcula las contribuciones por característica (``pred_contribs``) del modelo
+XGBoost para lotes de estudiantes y las traduce a ``feature_names``.
+
+Las contribuciones se cachean por (estudiante, versión del modelo), de modo
+que una lista priorizada de miles de estudiantes solo paga el cálculo una
+vez por modelo cargado.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import xgboost as xgb
+
+try:
+    from telemetry import TELEMETRY
+except ImportError:
+    from app.telemetry import TELEMETRY
+
+DEFAULT_BATCH_SIZE = 2048
+DEFAULT_CACHE_SIZE = 50_000
+
+
+def get_model_version(model) -> str:
+    """Huella corta (sha1) del booster serializado; cambia al reentrenar."""
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    return hashlib.sha1(bytes(booster.save_raw())).hexdigest()[:12]
+
+
+class ContributionExplainer:
+    """
+    Explicador por lotes con cache LRU por (clave del estudiante, versión del modelo).
+
+    Args:
+        model: XGBClassifier (o Booster) ya entrenado.
+        feature_names: Nombres de las columnas de entrada del modelo, en orden.
+        class_index: Clase explicada (0 = 'Dropout').
+        batch_size: Filas por llamada a ``pred_contribs``.
+        cache_size: Máximo de estudiantes cacheados.
+    """
+
+    def __init__(self, model, feature_names, class_index=0,
+                 batch_size=DEFAULT_BATCH_SIZE, cache_size=DEFAULT_CACHE_SIZE):
+        self.booster = model.get_booster() if hasattr(model, "get_booster") else model
+        self.feature_names = list(feature_names)
+        self.class_index = class_index
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.model_version = get_model_version(self.booster)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contributions(self, X) -> np.ndarray:
+        """
+        Contribuciones sin cache para una matriz ya preprocesada.
+
+        Returns:
+            np.ndarray: (n, n_features + 1); la última columna es el sesgo (bias).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        n_cols = len(self.feature_names) + 1
+        blocks = []
+        for start in range(0, len(X), self.batch_size):
+            with TELEMETRY.timed('explain'):
+                contribs = self.booster.predict(
+                    xgb.DMatrix(X[start:start + self.batch_size]), pred_contribs=True
+                )
+            # Multiclase: (n, n_clases, n_features + 1); versiones antiguas lo aplanan
+            if contribs.ndim == 2 and contribs.shape[1] != n_cols:
+                contribs = contribs.reshape(len(contribs), -1, n_cols)
+            if contribs.ndim == 3:
+                contribs = contribs[:, self.class_index, :]
+            blocks.append(contribs.astype(np.float32, copy=False))
+        if not blocks:
+            return np.empty((0, n_cols), dtype=np.float32)
+        return np.vstack(blocks)
+
+    def explain(self, keys, build_matrix, top_k=3) -> dict:
+        """
+        Principales factores de riesgo para cada clave.
+
+        Args:
+            keys: Identificadores de estudiante (hashables).
+            build_matrix: Callable que recibe la lista de claves sin cache y
+                devuelve su matriz preprocesada (mismo orden). Solo se invoca
+                si hay fallos de cache.
+            top_k: Número de factores a devolver por estudiante.
+
+        Returns:
+            dict: {clave: [(feature, contribución), ...]} ordenado de mayor a menor.
+        """
+        keys = list(keys)
+        rows = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                cached = self._cache.get((key, self.model_version))
+                if cached is None:
+                    missing.append(key)
+                else:
+                    self._cache.move_to_end((key, self.model_version))
+                    rows[key] = cached
+
+        TELEMETRY.record_cache('explanations', hits=len(keys) - len(missing), misses=len(missing))
+        if missing:
+            contribs = self.contributions(build_matrix(missing))
+            with self._lock:
+                for key, row in zip(missing, contribs):
+                    self._cache[(key, self.model_version)] = row
+                    rows[key] = row
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return {key: self.top_drivers(rows[key], top_k) for key in keys}
+
+    def invalidate(self, keys):
+        """Descarta las contribuciones cacheadas de esas claves (p. ej. datos actualizados)."""
+        with self._lock:
+            for key in keys:
+                self._cache.pop((key, self.model_version), None)
+
+    def top_drivers(self, contrib_row, top_k=3) -> list:
+        """Los ``top_k`` features que más empujan hacia la clase explicada."""
+        values = np.asarray(contrib_row)[:len(self.feature_names)]
+        top_k = min(top_k, len(values))
+        if top_k <= 0:
+            return []
+        idx = np.argpartition(-values, top_k - 1)[:top_k]
+        idx = idx[np.argsort(-values[idx])]
+        return [(self.feature_names[i], float(values[i])) for i in idx]
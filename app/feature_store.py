@@ -0,0 +1,173 @@
+"""
+📦 Almacén de Features por Estudiante (SQLite)
+==========================================================================
+Persiste el vector final que recibe el modelo (ya mapeado y preprocesado)
+por (id de estudiante, versión del conjunto de features). El serving lee
+vectores listos en lugar de reconstruirlos con ``map_unrc_to_model_inputs``
+y ``preprocessor.transform`` en cada petición.
+
+La versión combina los nombres de features, el preprocesador serializado y
+la versión de la lógica de mapeo: si cualquiera cambia, los vectores viejos
+dejan de leerse y se recalculan bajo la nueva clave. Cada vector guarda
+además la huella de los campos crudos del estudiante con que se calculó
+(``source_hash``): si el registro cambió, el vector guardado no se sirve.
+
+El pipeline llena el almacén por lotes (``python src/models/build_feature_store.py``);
+el serving solo calcula los vectores que faltan o quedaron viejos.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_FEATURE_DB = BASE_DIR / "reports" / "features" / "student_features.sqlite"
+VECTOR_DTYPE = np.float32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    student_id INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    source_hash TEXT,
+    PRIMARY KEY (student_id, version)
+) WITHOUT ROWID;
+"""
+
+
+def get_feature_db_path() -> Path:
+    """Ruta del almacén (variable de entorno ``SAREP_FEATURE_DB`` o ubicación por defecto)."""
+    return Path(os.environ.get("SAREP_FEATURE_DB", DEFAULT_FEATURE_DB))
+
+
+def feature_set_version(feature_names, preprocessor, mapping_version) -> str:
+    """Huella corta del conjunto de features (nombres + preprocesador + mapeo)."""
+    digest = hashlib.sha1()
+    digest.update("\x1f".join(map(str, feature_names)).encode("utf-8"))
+    digest.update(pickle.dumps(preprocessor))
+    digest.update(str(mapping_version).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def source_hash(values: dict) -> str:
+    """Huella corta de los campos crudos con que se calcula el vector de un estudiante."""
+    payload = json.dumps(values, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class FeatureStore:
+    """
+    Vectores listos para el modelo, con lectura puntual y por lotes.
+
+    Args:
+        path: Archivo SQLite o ``":memory:"``.
+        version: Versión del conjunto de features usada por defecto.
+    """
+
+    def __init__(self, path=":memory:", version=None):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if str(path) != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(features)")}
+            if 'source_hash' not in columns:
+                # Almacenes previos a la huella: sus vectores quedan sin huella y se recalculan
+                self._conn.execute("ALTER TABLE features ADD COLUMN source_hash TEXT")
+
+    @staticmethod
+    def _decode(blob) -> np.ndarray:
+        return np.frombuffer(blob, dtype=VECTOR_DTYPE)
+
+    # ─── LECTURA ─────────────────────────────────────────────────────────
+
+    def get(self, student_id, version=None, source_hash=None):
+        """
+        Vector de un estudiante (búsqueda por clave primaria) o None. Con
+        ``source_hash``, también None si el vector se calculó con otros datos.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector, source_hash FROM features WHERE student_id = ? AND version = ?",
+                (student_id, version or self.version)
+            ).fetchone()
+        if row is None or (source_hash is not None and row[1] != source_hash):
+            return None
+        return self._decode(row[0])
+
+    def get_many(self, student_ids, version=None, source_hashes=None) -> dict:
+        """
+        {id: vector} para los ids presentes (omite los que faltan). Con
+        ``source_hashes`` ({id: huella}) omite también los vectores viejos.
+        """
+        ids = list(student_ids)
+        version = version or self.version
+        found = {}
+        # SQLite limita el número de parámetros por sentencia
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT student_id, vector, source_hash FROM features "
+                    f"WHERE version = ? AND student_id IN ({', '.join('?' * len(chunk))})",
+                    [version, *chunk]
+                ).fetchall()
+            found.update(
+                (sid, self._decode(blob)) for sid, blob, digest in rows
+                if source_hashes is None or source_hashes.get(sid) == digest
+            )
+        return found
+
+    def count(self, version=None) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM features WHERE version = ?", (version or self.version,)
+            ).fetchone()[0]
+
+    # ─── ESCRITURA ───────────────────────────────────────────────────────
+
+    def upsert_many(self, student_ids, matrix, version=None, source_hashes=None):
+        """
+        Inserta o reemplaza los vectores (una fila de ``matrix`` por id), con la
+        huella de los datos de cada uno si se pasa ``source_hashes``.
+        """
+        matrix = np.asarray(matrix, dtype=VECTOR_DTYPE)
+        now = time.time()
+        source_hashes = source_hashes or {}
+        rows = [
+            (sid, version or self.version, matrix[i].tobytes(), now, source_hashes.get(sid))
+            for i, sid in enumerate(student_ids)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features "
+                "(student_id, version, vector, updated_at, source_hash) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def delete(self, student_ids, version=None):
+        ids = list(student_ids)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM features WHERE student_id = ? AND version = ?",
+                [(sid, version or self.version) for sid in ids]
+            )
+
+    def prune_versions(self, keep_version=None) -> int:
+        """Elimina vectores de versiones anteriores; retorna cuántos se borraron."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM features WHERE version != ?", (keep_version or self.version,)
+            ).rowcount
@@ -0,0 +1,147 @@
+"""
+🧵 Ejecutor de Inferencia Compartido
+==========================================================================
+Pool de hilos único por proceso para ``predict_proba``. Las sesiones de
+Streamlit encolan el trabajo y esperan el ``Future`` en lugar de llamar al
+modelo directamente desde su hilo de script.
+
+- El modelo se comparte entre hilos; ``nthread`` de XGBoost se fija una vez
+  para que ``workers × nthread`` no supere los núcleos disponibles.
+- La cola es acotada: si está llena, ``submit`` espera hasta
+  ``queue_timeout`` y luego rechaza con ``InferenceOverloaded``.
+- Métricas de contrapresión (en cola, en ejecución, pico, rechazos y
+  tiempo de espera) para el panel de operaciones.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from telemetry import TELEMETRY
+except ImportError:
+    from app.telemetry import TELEMETRY
+
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_QUEUE_TIMEOUT_S = 2.0
+
+
+class InferenceOverloaded(RuntimeError):
+    """La cola de inferencia está llena y no se liberó a tiempo."""
+
+
+def plan_threads(max_workers=None, cpu_count=None):
+    """
+    Reparte los núcleos entre hilos del pool y ``nthread`` de XGBoost.
+
+    Returns:
+        tuple: (workers, nthread) con ``workers * nthread <= cpu_count``.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max_workers or min(4, cpu_count)
+    workers = max(1, min(workers, cpu_count))
+    return workers, max(1, cpu_count // workers)
+
+
+class InferenceExecutor:
+    """
+    Ejecutor de ``predict_proba`` con pool acotado y cola limitada.
+
+    Args:
+        model: Modelo compartido (XGBClassifier o compatible con sklearn).
+        max_workers: Hilos del pool (None = min(4, núcleos)).
+        max_queue: Máximo de peticiones pendientes (en cola + en ejecución).
+        queue_timeout: Segundos que ``submit`` espera un hueco antes de rechazar.
+    """
+
+    def __init__(self, model, max_workers=None, max_queue=DEFAULT_MAX_QUEUE,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT_S):
+        self.model = model
+        self.workers, self.nthread = plan_threads(max_workers)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._configure_nthread()
+
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sarep-infer")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._peak_pending = 0
+
+    def _configure_nthread(self):
+        # Se fija antes de compartir el modelo: cambiar parámetros del booster
+        # mientras otros hilos predicen no es seguro.
+        if hasattr(self.model, "set_params"):
+            self.model.set_params(n_jobs=self.nthread)
+        if hasattr(self.model, "get_booster"):
+            self.model.get_booster().set_param({'nthread': self.nthread})
+
+    def submit(self, X):
+        """
+        Encola ``predict_proba(X)``.
+
+        Returns:
+            Future: resuelve a (probas, latencia_predict_ns).
+
+        Raises:
+            InferenceOverloaded: si la cola sigue llena tras ``queue_timeout``.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            TELEMETRY.increment('inference.rejected')
+            raise InferenceOverloaded(
+                f"Cola de inferencia llena ({self.max_queue} pendientes)."
+            )
+        with self._lock:
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        TELEMETRY.increment('inference.submitted')
+        future = self._executor.submit(self._run, np.asarray(X), time.perf_counter_ns())
+        future.add_done_callback(self._on_done)
+        return future
+
+    def predict_proba(self, X, timeout=None):
+        """Atajo síncrono: encola y espera el resultado."""
+        return self.submit(X).result(timeout=timeout)
+
+    def _run(self, X, enqueued_ns):
+        start = time.perf_counter_ns()
+        TELEMETRY.record_latency('inference_queue', start - enqueued_ns)
+        with self._lock:
+            self._running += 1
+        try:
+            probas = self.model.predict_proba(X)
+        finally:
+            with self._lock:
+                self._running -= 1
+        latency_ns = time.perf_counter_ns() - start
+        TELEMETRY.record_latency('predict', latency_ns)
+        return probas, latency_ns
+
+    def _on_done(self, future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+        if future.exception() is not None:
+            TELEMETRY.increment('inference.errors')
+
+    def stats(self) -> dict:
+        """Estado de la cola para el panel de operaciones."""
+        with self._lock:
+            pending, running, peak = self._pending, self._running, self._peak_pending
+        counters = TELEMETRY.counters()
+        return {
+            'workers': self.workers,
+            'nthread': self.nthread,
+            'max_queue': self.max_queue,
+            'queued': pending - running,
+            'running': running,
+            'peak_pending': peak,
+            'submitted': counters.get('inference.submitted', 0),
+            'rejected': counters.get('inference.rejected', 0),
+            'errors': counters.get('inference.errors', 0),
+            'queue_wait': TELEMETRY.histogram('inference_queue').summary(),
+        }
@@ -0,0 +1,167 @@
+"""
+📈 Estructura de Prioridad por Riesgo
+==========================================================================
+Listas ordenadas por (riesgo descendente, id), una global y una por tutor y
+por programa, más conteos por nivel de ``classify_risk_level`` mantenidos
+de forma incremental.
+
+- Actualizar el riesgo de un estudiante: quitar e insertar su clave en cada
+  grupo al que pertenece, O(log n) con ``sortedcontainers.SortedList``.
+- Top-k o una página de la lista: ``islice`` de la lista ordenada,
+  O(log n + k).
+- Conteos por nivel: ajuste de ±1 al cruzar un umbral, sin recorrer a nadie.
+"""
+
+import threading
+from contextlib import nullcontext
+
+from sortedcontainers import SortedList
+
+try:
+    from search_index import risk_tier
+except ImportError:
+    from app.search_index import risk_tier
+
+TIERS = ('danger', 'warning', 'success')
+ALL = ('all', None)
+
+
+class RiskPriorityIndex:
+    """Listas de prioridad por grupo con actualización incremental del riesgo."""
+
+    def __init__(self):
+        self._lists = {}       # (campo, valor) -> SortedList[(-riesgo, id)]
+        self._tiers = {}       # (campo, valor) -> {nivel: conteo}
+        self._members = {}     # id -> (riesgo, [grupos])
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, students):
+        index = cls()
+        for student in students:
+            index.add(student['id'], student['risk_score'],
+                      program=student.get('program'), tutor=student.get('tutor'))
+        return index
+
+    def __len__(self):
+        return len(self._members)
+
+    # ─── ESCRITURA ───────────────────────────────────────────────────────
+
+    def add(self, student_id, risk_score: float, program=None, tutor=None):
+        with self._lock:
+            if student_id in self._members:
+                self.remove(student_id)
+            groups = [ALL]
+            for field, value in (('program', program), ('tutor', tutor)):
+                if value is not None:
+                    groups.append((field, value))
+            tier = risk_tier(risk_score)
+            for group in groups:
+                self._lists.setdefault(group, SortedList()).add((-risk_score, student_id))
+                counts = self._tiers.setdefault(group, dict.fromkeys(TIERS, 0))
+                counts[tier] += 1
+            self._members[student_id] = (risk_score, groups)
+
+    def remove(self, student_id):
+        with self._lock:
+            member = self._members.pop(student_id, None)
+            if member is None:
+                return
+            risk_score, groups = member
+            tier = risk_tier(risk_score)
+            for group in groups:
+                self._lists[group].discard((-risk_score, student_id))
+                self._tiers[group][tier] -= 1
+
+    def update_risk(self, student_id, risk_score: float):
+        """Reubica al estudiante en cada grupo y ajusta los conteos por nivel."""
+        with self._lock:
+            member = self._members.get(student_id)
+            if member is None:
+                return
+            old_score, groups = member
+            old_tier, new_tier = risk_tier(old_score), risk_tier(risk_score)
+            for group in groups:
+                ranked = self._lists[group]
+                ranked.discard((-old_score, student_id))
+                ranked.add((-risk_score, student_id))
+                if old_tier != new_tier:
+                    self._tiers[group][old_tier] -= 1
+                    self._tiers[group][new_tier] += 1
+            self._members[student_id] = (risk_score, groups)
+
+    # ─── LECTURA ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _group(program=None, tutor=None):
+        if program is not None:
+            return ('program', program)
+        if tutor is not None:
+            return ('tutor', tutor)
+        return ALL
+
+    def ids(self, program=None, tutor=None, offset=0, limit=None) -> list:
+        """Ids del grupo en orden de prioridad, ventana ``[offset, offset + limit)``."""
+        with self._lock:
+            if program is not None and tutor is not None:
+                # Ambos filtros: se recorre el grupo más chico y se filtra por el otro
+                by_program = self._lists.get(('program', program), ())
+                by_tutor = self._lists.get(('tutor', tutor), ())
+                if len(by_program) <= len(by_tutor):
+                    ranked, other = by_program, ('tutor', tutor)
+                else:
+                    ranked, other = by_tutor, ('program', program)
+                ids = [sid for _, sid in ranked if other in self._members[sid][1]]
+                end = None if limit is None else offset + limit
+                return ids[offset:end]
+            ranked = self._lists.get(self._group(program, tutor))
+            if ranked is None:
+                return []
+            end = None if limit is None else offset + limit
+            return [sid for _, sid in ranked.islice(offset, end)]
+
+    def top_k(self, k: int, program=None, tutor=None) -> list:
+        return self.ids(program=program, tutor=tutor, limit=k)
+
+    def count(self, program=None, tutor=None) -> int:
+        if program is not None and tutor is not None:
+            return len(self.ids(program=program, tutor=tutor))
+        with self._lock:
+            return len(self._lists.get(self._group(program, tutor), ()))
+
+    def tier_counts(self, program=None, tutor=None) -> dict:
+        """Conteo por nivel de riesgo ('danger', 'warning', 'success') del grupo."""
+        with self._lock:
+            if program is not None and tutor is not None:
+                counts = dict.fromkeys(TIERS, 0)
+                for sid in self.ids(program=program, tutor=tutor):
+                    counts[risk_tier(self._members[sid][0])] += 1
+                return counts
+            return dict(self._tiers.get(self._group(program, tutor), dict.fromkeys(TIERS, 0)))
+
+
+class PriorityCursor:
+    """
+    Cursor sobre un grupo de la estructura de prioridad; solo materializa la ventana pedida.
+
+    Args:
+        lock: Lock opcional bajo el que se leen juntos los ids y sus registros
+            (el mismo que toman quienes actualizan índice y registros).
+    """
+
+    def __init__(self, index: RiskPriorityIndex, fetch_students, program=None, tutor=None,
+                 lock=None):
+        self._index = index
+        self._fetch_students = fetch_students
+        self._program = program
+        self._tutor = tutor
+        self._lock = lock or nullcontext()
+
+    def __len__(self):
+        return self._index.count(program=self._program, tutor=self._tutor)
+
+    def fetch(self, offset: int, limit: int) -> list:
+        with self._lock:
+            ids = self._index.ids(program=self._program, tutor=self._tutor, offset=offset, limit=limit)
+            return self._fetch_students(ids)
@@ -0,0 +1,283 @@
+"""
+🔄 Re-scoring Incremental por Eventos
+==========================================================================
+Consume eventos de cambio (calificación publicada, inscripción modificada,
+encuesta respondida) de un archivo JSONL de solo-anexar, marca a los
+estudiantes afectados como "sucios" y los vuelve a puntuar en micro-lotes.
+
+El riesgo se actualiza en el almacén, la tabla columnar y el índice de
+búsqueda, por lo que la lista priorizada se reordena sin re-puntuar a toda
+la matrícula.
+
+El offset del log ya consumido se guarda junto al almacén de estudiantes
+(tabla ``metadata``, en la misma transacción que los cambios del evento), así
+que un proceso nuevo retoma donde quedó el anterior en lugar de releer todo
+el historial.
+
+Formato de una línea del log::
+
+    {"student_id": 3, "type": "grade_posted", "changes": {"s2_aprobadas": 4}}
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    from telemetry import TELEMETRY
+    from inference import InferenceOverloaded
+except ImportError:
+    from app.telemetry import TELEMETRY
+    from app.inference import InferenceOverloaded
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_EVENTS_PATH = BASE_DIR / "reports" / "events" / "student_events.jsonl"
+
+EVENT_TYPES = ('grade_posted', 'enrollment_changed', 'survey_answered')
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_POLL_INTERVAL_S = 2.0
+
+# Campos que recalculan el momentum (Ratio S2 - Ratio S1) si el evento no lo trae
+_RATIO_FIELDS = {'s1_aprobadas', 's1_inscritas', 's2_aprobadas', 's2_inscritas'}
+
+
+def get_events_path() -> Path:
+    """Ruta del log de eventos (variable de entorno ``SAREP_EVENTS_FILE`` o por defecto)."""
+    return Path(os.environ.get("SAREP_EVENTS_FILE", DEFAULT_EVENTS_PATH))
+
+
+def compute_momentum(academic: dict) -> float:
+    """Momentum = ratio de aprobación S2 - ratio de aprobación S1."""
+    s1 = academic['s1_aprobadas'] / academic['s1_inscritas'] if academic['s1_inscritas'] else 0
+    s2 = academic['s2_aprobadas'] / academic['s2_inscritas'] if academic['s2_inscritas'] else 0
+    return round(s2 - s1, 2)
+
+
+class EventLog:
+    """Log JSONL de solo-anexar; la lectura avanza por offset de bytes."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or get_events_path())
+
+    @property
+    def offset_key(self) -> str:
+        """Clave con la que se guarda el offset consumido de este log."""
+        return f"events_offset:{self.path.resolve()}"
+
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, student_id, event_type: str, changes: dict):
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Tipo de evento desconocido: {event_type}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({
+            'student_id': student_id, 'type': event_type,
+            'changes': changes, 'ts': time.time(),
+        }, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def entries_from(self, offset: int) -> list:
+        """
+        Líneas completas a partir de ``offset``.
+
+        Returns:
+            list: pares (evento, offset tras la línea); el evento es None si
+            la línea no es JSON válido. Una última línea sin salto de línea
+            (escritura en curso) se deja para la próxima lectura.
+        """
+        try:
+            if self.path.stat().st_size <= offset:
+                return []
+        except FileNotFoundError:
+            return []
+        entries = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                try:
+                    entries.append((json.loads(raw), offset))
+                except json.JSONDecodeError:
+                    entries.append((None, offset))
+        return entries
+
+    def read_from(self, offset: int):
+        """
+        Eventos completos a partir de ``offset``.
+
+        Returns:
+            tuple: (lista de eventos válidos, nuevo offset).
+        """
+        entries = self.entries_from(offset)
+        events = [event for event, _ in entries if event is not None]
+        return events, (entries[-1][1] if entries else offset)
+
+
+class IncrementalScorer:
+    """
+    Re-puntúa solo a los estudiantes con eventos pendientes.
+
+    Args:
+        log: ``EventLog`` a consumir.
+        get_students: Callable ids -> registros anidados (en ese orden).
+        apply_changes: Callable (id, cambios planos, offset) que persiste los
+            cambios y, en la misma transacción, el offset del log tras el evento.
+        score: Callable lista de registros -> probabilidades de abandono.
+        on_scored: Callable (id, riesgo) que actualiza el riesgo en su lugar.
+        batch_size: Máximo de estudiantes por micro-lote.
+        load_offset: Callable sin argumentos -> offset guardado (por defecto, 0).
+            Si supera el tamaño del log (log reemplazado), se empieza de 0.
+        save_offset: Callable (offset) para los eventos descartados, que no
+            pasan por ``apply_changes``.
+    """
+
+    def __init__(self, log, get_students, apply_changes, score, on_scored,
+                 batch_size=DEFAULT_BATCH_SIZE, load_offset=None, save_offset=None):
+        self.log = log
+        self._get_students = get_students
+        self._apply_changes = apply_changes
+        self._score = score
+        self._on_scored = on_scored
+        self.batch_size = batch_size
+        self._save_offset = save_offset
+        self.offset = int(load_offset()) if load_offset is not None else 0
+        if self.offset > log.size():
+            self.offset = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._consume_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def mark_dirty(self, student_ids):
+        with self._lock:
+            self._dirty.update(student_ids)
+
+    def _changes_for(self, event) -> tuple:
+        """
+        (id, cambios planos) de un evento, con el momentum recalculado si
+        cambian los créditos.
+
+        Raises:
+            ValueError: evento sin id entero, sin cambios como objeto, o con
+                créditos que no permiten calcular el momentum.
+        """
+        sid = event.get('student_id') if isinstance(event, dict) else None
+        changes = event.get('changes') if isinstance(event, dict) else None
+        if not isinstance(sid, int) or isinstance(sid, bool):
+            raise ValueError(f"student_id inválido: {sid!r}")
+        if not isinstance(changes, dict):
+            raise ValueError(f"changes inválido: {changes!r}")
+        changes = dict(changes)
+        if _RATIO_FIELDS & changes.keys() and 'momentum' not in changes:
+            current = self._get_students([sid])
+            if not current:
+                raise ValueError(f"Estudiante desconocido: {sid}")
+            academic = {**current[0]['academic_data'], **changes}
+            try:
+                changes['momentum'] = compute_momentum(academic)
+            except (TypeError, ZeroDivisionError) as e:
+                raise ValueError(f"Créditos inválidos: {e}") from None
+        return sid, changes
+
+    def consume(self) -> int:
+        """
+        Lee eventos nuevos, aplica sus cambios y marca sucios a los afectados.
+
+        Cada evento se valida y aplica por separado: uno inválido (rechazado
+        con ``ValueError`` o ``TypeError``) se cuenta como malformado y se
+        salta, y cada estudiante se marca sucio en cuanto se aplica su
+        evento. ``offset`` avanza (y se persiste) evento por evento, solo
+        después de aplicarlo; ante otro error (p. ej. el almacén no responde) queda en
+        ese evento, que se reintenta en la próxima lectura.
+
+        Returns:
+            int: eventos procesados (aplicados o descartados).
+        """
+        with self._consume_lock:
+            processed = 0
+            for event, end in self.log.entries_from(self.offset):
+                try:
+                    if event is None:
+                        raise ValueError("Línea no es JSON válido")
+                    sid, changes = self._changes_for(event)
+                    self._apply_changes(sid, changes, end)
+                except (ValueError, TypeError):
+                    TELEMETRY.increment('rescoring.malformed')
+                    if self._save_offset is not None:
+                        self._save_offset(end)
+                else:
+                    self.mark_dirty([sid])
+                self.offset = end
+                processed += 1
+                TELEMETRY.increment('rescoring.events')
+            return processed
+
+    def flush(self) -> int:
+        """
+        Re-puntúa a todos los sucios en micro-lotes; retorna cuántos se puntuaron.
+        Si un lote falla, los estudiantes que no alcanzaron a actualizarse
+        vuelven a quedar sucios antes de propagar el error.
+        """
+        scored = 0
+        while True:
+            with self._lock:
+                batch = [self._dirty.pop() for _ in range(min(self.batch_size, len(self._dirty)))]
+            if not batch:
+                return scored
+            pending, done = batch, 0
+            try:
+                students = self._get_students(batch)
+                pending = [s['id'] for s in students]
+                with TELEMETRY.timed('rescore_batch'):
+                    risks = self._score(students)
+                for student, risk in zip(students, risks):
+                    self._on_scored(student['id'], float(risk))
+                    done += 1
+            except BaseException:
+                self.mark_dirty(pending[done:])
+                raise
+            scored += len(students)
+            TELEMETRY.increment('rescoring.scored', len(students))
+
+    def run_once(self) -> int:
+        self.consume()
+        return self.flush()
+
+    # ─── HILO DE FONDO ───────────────────────────────────────────────────
+
+    def start(self, interval=DEFAULT_POLL_INTERVAL_S):
+        """Sondea el log cada ``interval`` segundos en un hilo daemon."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval,), name="sarep-rescoring", daemon=True
+        )
+        self._thread.start()
+
+    def _loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.run_once()
+            except InferenceOverloaded:
+                # Cola de inferencia llena: el lote quedó sucio y se reintenta
+                # en el próximo ciclo, sin competir con las sesiones interactivas
+                TELEMETRY.increment('rescoring.overloaded')
+            except Exception:
+                TELEMETRY.increment('rescoring.errors')
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,193 @@
+"""
+🔍 Índice de Búsqueda de Estudiantes
+==========================================================================
+Índice en memoria sobre la tabla columnar de estudiantes (``StudentTable``):
+
+- Trie de prefijos sobre los tokens del nombre y del correo.
+- Listas invertidas (postings) por programa, tutor, modalidad, desafío y
+  nivel de riesgo.
+
+El índice solo guarda ids: nombre, correo, facetas y riesgo se leen de la
+tabla, que es la única copia en memoria de los registros. Una consulta
+intersecta los conjuntos de ids de cada término y ordena por el riesgo
+de la tabla. El nivel de riesgo se actualiza de forma incremental cuando
+cambia la puntuación de un estudiante.
+"""
+
+import re
+import threading
+import unicodedata
+from contextlib import contextmanager
+
+try:
+    from utils import classify_risk_level
+except ImportError:
+    from app.utils import classify_risk_level
+
+# Facetas indexadas (columnas de la tabla)
+FACETS = ('program', 'tutor', 'modalidad', 'desafio')
+RISK_TIER = 'risk_tier'
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin acentos, para que 'garces' encuentre 'Garcés'."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_SPLIT.split(normalize(text)) if t]
+
+
+def risk_tier(risk_score: float) -> str:
+    """Etiqueta del nivel de ``classify_risk_level`` ('danger', 'warning', 'success')."""
+    return classify_risk_level(risk_score)[2]
+
+
+class StudentSearchIndex:
+    """
+    Índice de prefijos + postings por faceta, seguro para lecturas concurrentes.
+
+    Args:
+        table: ``StudentTable`` de la que se leen los campos indexados.
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._trie = {}            # char -> nodo; nodo['ids'] = ids con tokens bajo ese prefijo
+        self._postings = {field: {} for field in (*FACETS, RISK_TIER)}
+        self._ids = set()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, table):
+        index = cls(table)
+        for sid in table.column('id').tolist():
+            index.add(sid)
+        return index
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _tokens(self, pos) -> set:
+        email_user = (self._table.value(pos, 'email') or '').split('@')[0]
+        return set(tokenize(self._table.value(pos, 'name'))) | set(tokenize(email_user))
+
+    def _facets(self, pos) -> dict:
+        facets = {field: self._table.value(pos, field) for field in FACETS}
+        facets[RISK_TIER] = risk_tier(self._table.value(pos, 'risk_score'))
+        return facets
+
+    # ─── ESCRITURA ───────────────────────────────────────────────────────
+
+    def add(self, student_id):
+        """Indexa la fila actual del estudiante en la tabla."""
+        pos = self._table.position(student_id)
+        if pos is None:
+            return
+        with self._lock:
+            if student_id in self._ids:
+                self.remove(student_id)
+            for token in self._tokens(pos):
+                node = self._trie
+                for char in token:
+                    node = node.setdefault(char, {'ids': set()})
+                    node['ids'].add(student_id)
+            for field, value in self._facets(pos).items():
+                self._postings[field].setdefault(value, set()).add(student_id)
+            self._ids.add(student_id)
+
+    def remove(self, student_id):
+        """
+        Quita al estudiante; los tokens y facetas se leen de la tabla, así que
+        debe llamarse antes de modificar su fila (ver ``reindexing``).
+        """
+        pos = self._table.position(student_id)
+        with self._lock:
+            if pos is None or student_id not in self._ids:
+                return
+            for token in self._tokens(pos):
+                node = self._trie
+                for char in token:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    node['ids'].discard(student_id)
+            for field, value in self._facets(pos).items():
+                self._postings[field].get(value, set()).discard(student_id)
+            for ids in self._postings[RISK_TIER].values():
+                ids.discard(student_id)
+            self._ids.discard(student_id)
+
+    @contextmanager
+    def reindexing(self, student_id):
+        """Quita al estudiante, deja modificar su fila y lo vuelve a indexar, sin lecturas intermedias."""
+        with self._lock:
+            self.remove(student_id)
+            try:
+                yield
+            finally:
+                self.add(student_id)
+
+    def update_risk(self, student_id, risk_score: float):
+        """Mueve al estudiante de nivel si corresponde (el riesgo se lee de la tabla al buscar)."""
+        with self._lock:
+            if student_id not in self._ids:
+                return
+            new_tier = risk_tier(risk_score)
+            for tier, ids in self._postings[RISK_TIER].items():
+                if tier != new_tier:
+                    ids.discard(student_id)
+            self._postings[RISK_TIER].setdefault(new_tier, set()).add(student_id)
+
+    # ─── LECTURA ─────────────────────────────────────────────────────────
+
+    def _prefix_ids(self, prefix: str) -> set:
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node['ids']
+
+    def values(self, field: str) -> list:
+        """Valores con al menos un estudiante para una faceta."""
+        with self._lock:
+            return sorted(v for v, ids in self._postings[field].items() if ids and v is not None)
+
+    def search(self, text: str = "", limit=None, **filters) -> list:
+        """
+        Ids que cumplen todos los términos, ordenados por riesgo descendente.
+
+        Args:
+            text: Prefijos de nombre o correo (todos deben coincidir).
+            limit: Máximo de resultados (None = todos).
+            **filters: Faceta -> valor, p. ej. ``modalidad="A Distancia"``,
+                ``risk_tier="danger"``. Valores None se ignoran.
+        """
+        with self._lock:
+            candidates = []
+            for token in tokenize(text):
+                candidates.append(self._prefix_ids(token))
+            for field, value in filters.items():
+                if value is None:
+                    continue
+                if field not in self._postings:
+                    raise ValueError(f"Faceta no indexada: {field}")
+                candidates.append(self._postings[field].get(value, set()))
+
+            if candidates:
+                candidates.sort(key=len)   # intersectar empezando por el conjunto más chico
+                ids = set(candidates[0])
+                for other in candidates[1:]:
+                    ids &= other
+                    if not ids:
+                        break
+            else:
+                ids = set(self._ids)
+
+            risk, position = self._table.column('risk_score'), self._table.position
+            ranked = sorted(ids, key=lambda sid: (-risk[position(sid)], sid))
+        return ranked if limit is None else ranked[:limit]
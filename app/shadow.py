@@ -0,0 +1,180 @@
+"""
+🌗 Shadow Scoring del Modelo Candidato
+==========================================================================
+Modo de registro de modelos: junto al modelo de producción se puede cargar
+un modelo candidato (``models/candidate/xgboost_model.pkl`` o la ruta en
+``SAREP_CANDIDATE_MODEL``) que puntúa las mismas entradas en un hilo de
+fondo, sin bloquear la respuesta al tutor.
+
+Cada comparación (probabilidades, clase y latencia de ambos modelos) se
+guarda en un SQLite local para decidir la promoción con evidencia de
+tráfico real.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from explanations import get_model_version
+    from telemetry import TELEMETRY
+except ImportError:
+    from app.explanations import get_model_version
+    from app.telemetry import TELEMETRY
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CANDIDATE_PATH = BASE_DIR / "models" / "candidate" / "xgboost_model.pkl"
+DEFAULT_LOG_PATH = BASE_DIR / "reports" / "shadow" / "shadow_scores.sqlite"
+
+# Umbrales de promoción por defecto
+MIN_CLASS_AGREEMENT = 0.95
+MAX_LATENCY_RATIO = 1.10
+
+
+def get_candidate_path() -> Path:
+    """Ruta del modelo candidato (variable de entorno o ubicación por defecto)."""
+    return Path(os.environ.get("SAREP_CANDIDATE_MODEL", DEFAULT_CANDIDATE_PATH))
+
+
+class ShadowLog:
+    """Almacén SQLite de comparaciones producción vs. candidato."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shadow_scores (
+                    ts REAL NOT NULL,
+                    prod_version TEXT NOT NULL,
+                    cand_version TEXT NOT NULL,
+                    prod_dropout REAL NOT NULL,
+                    cand_dropout REAL NOT NULL,
+                    prod_class INTEGER NOT NULL,
+                    cand_class INTEGER NOT NULL,
+                    prod_latency_ms REAL NOT NULL,
+                    cand_latency_ms REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_shadow_versions "
+                "ON shadow_scores (prod_version, cand_version)"
+            )
+
+    def _connect(self):
+        # Una conexión por operación: el hilo de fondo escribe y los hilos de
+        # Streamlit leen, sin compartir objetos sqlite3 entre hilos.
+        return sqlite3.connect(str(self.path), timeout=5.0)
+
+    def record(self, rows):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO shadow_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def summary(self, prod_version=None, cand_version=None) -> dict:
+        """Estadísticas de acuerdo y latencia para un par de versiones (o todas)."""
+        query = ("SELECT prod_dropout, cand_dropout, prod_class, cand_class, "
+                 "prod_latency_ms, cand_latency_ms FROM shadow_scores")
+        params = []
+        if prod_version and cand_version:
+            query += " WHERE prod_version = ? AND cand_version = ?"
+            params = [prod_version, cand_version]
+        with self._connect() as conn:
+            data = np.array(conn.execute(query, params).fetchall(), dtype=float)
+
+        if data.size == 0:
+            return {'n': 0}
+        prod_p, cand_p, prod_c, cand_c, prod_ms, cand_ms = data.T
+        abs_diff = np.abs(prod_p - cand_p)
+        return {
+            'n': int(len(data)),
+            'class_agreement': float(np.mean(prod_c == cand_c)),
+            'mean_abs_diff': float(abs_diff.mean()),
+            'max_abs_diff': float(abs_diff.max()),
+            'prod_p50_ms': float(np.percentile(prod_ms, 50)),
+            'prod_p95_ms': float(np.percentile(prod_ms, 95)),
+            'cand_p50_ms': float(np.percentile(cand_ms, 50)),
+            'cand_p95_ms': float(np.percentile(cand_ms, 95)),
+        }
+
+
+def promotion_check(summary: dict, min_agreement=MIN_CLASS_AGREEMENT,
+                    max_latency_ratio=MAX_LATENCY_RATIO):
+    """
+    Evalúa si el candidato puede promoverse.
+
+    Returns:
+        tuple: (aprobado, lista de motivos)
+    """
+    if not summary.get('n'):
+        return False, ["Sin comparaciones registradas."]
+    reasons = []
+    if summary['class_agreement'] < min_agreement:
+        reasons.append(f"Acuerdo de clase {summary['class_agreement']:.1%} < {min_agreement:.0%}.")
+    if summary['cand_p95_ms'] > summary['prod_p95_ms'] * max_latency_ratio:
+        reasons.append(
+            f"Latencia p95 del candidato {summary['cand_p95_ms']:.2f} ms > "
+            f"{max_latency_ratio:.2f}× producción ({summary['prod_p95_ms']:.2f} ms)."
+        )
+    return not reasons, reasons
+
+
+class ShadowScorer:
+    """
+    Puntúa con el candidato en un hilo de fondo; nunca bloquea al llamador.
+
+    Si hay más de ``max_pending`` comparaciones en cola, las nuevas se
+    descartan (y se cuentan en la telemetría) en lugar de esperar.
+    """
+
+    def __init__(self, candidate_model, prod_model, log=None, max_pending=256):
+        self.candidate_model = candidate_model
+        self.log = log or ShadowLog()
+        self.prod_version = get_model_version(prod_model)
+        self.cand_version = get_model_version(candidate_model)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sarep-shadow")
+
+    def submit(self, X, prod_proba, prod_latency_ns):
+        """Encola la comparación para las filas ``X`` ya preprocesadas."""
+        if not self._slots.acquire(blocking=False):
+            TELEMETRY.increment('shadow.dropped')
+            return None
+        future = self._executor.submit(
+            self._score, np.array(X, copy=True), np.atleast_2d(prod_proba), prod_latency_ns
+        )
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        self._slots.release()
+        if future.exception() is not None:
+            TELEMETRY.increment('shadow.errors')
+
+    def _score(self, X, prod_proba, prod_latency_ns):
+        start = time.perf_counter_ns()
+        cand_proba = self.candidate_model.predict_proba(X)
+        cand_latency_ns = time.perf_counter_ns() - start
+        TELEMETRY.record_latency('shadow_predict', cand_latency_ns)
+
+        now = time.time()
+        # La latencia se reparte por fila para comparar lotes de distinto tamaño
+        n = len(X)
+        rows = [
+            (now, self.prod_version, self.cand_version,
+             float(p[0]), float(c[0]), int(np.argmax(p)), int(np.argmax(c)),
+             prod_latency_ns / n / 1e6, cand_latency_ns / n / 1e6)
+            for p, c in zip(prod_proba, cand_proba)
+        ]
+        self.log.record(rows)
+        TELEMETRY.increment('shadow.scored', n)
+
+    def summary(self) -> dict:
+        return self.log.summary(self.prod_version, self.cand_version)
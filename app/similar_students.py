@@ -0,0 +1,89 @@
+"""
+👥 Estudiantes Similares (k-NN sobre el histórico)
+==========================================================================
+Carga el BallTree construido por ``src/models/similar_students.py`` con
+``mmap_mode='r'`` (los arrays quedan en disco y se comparten entre
+procesos) y responde consultas k-NN con los vectores listos del modelo. El
+árbol solo usa las features que llena el mapeo UNRC; de cada vector de
+consulta se toman esas columnas.
+"""
+
+import time
+from collections import Counter
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+try:
+    from telemetry import TELEMETRY
+except ImportError:
+    from app.telemetry import TELEMETRY
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_DIR = BASE_DIR / "models" / "similar_students"
+OUTCOMES = ('Dropout', 'Enrolled', 'Graduate')
+
+
+class SimilarStudentsIndex:
+    """Índice de vecinos del histórico con sus desenlaces."""
+
+    def __init__(self, tree, outcomes, display, feature_names, model_feature_names=None):
+        self.tree = tree
+        self.outcomes = outcomes
+        self.display = display
+        self.feature_names = list(feature_names)
+        # Índices anteriores guardaban el vector completo del modelo
+        self.model_feature_names = list(model_feature_names or feature_names)
+        self._columns = [self.model_feature_names.index(f) for f in self.feature_names]
+
+    @classmethod
+    def load(cls, index_dir=DEFAULT_INDEX_DIR):
+        """Carga el índice (memory-mapped); retorna None si no se ha construido."""
+        index_dir = Path(index_dir)
+        if not (index_dir / "ball_tree.joblib").exists():
+            return None
+        meta = joblib.load(index_dir / "meta.joblib")
+        return cls(
+            tree=joblib.load(index_dir / "ball_tree.joblib", mmap_mode='r'),
+            outcomes=joblib.load(index_dir / "outcomes.joblib", mmap_mode='r'),
+            display=joblib.load(index_dir / "display.joblib"),
+            feature_names=meta['feature_names'],
+            model_feature_names=meta.get('model_feature_names'),
+        )
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def query(self, X, k=10):
+        """
+        Los ``k`` vecinos más cercanos de cada fila de ``X`` (vectores
+        completos del modelo, en el orden de ``model_feature_names``).
+
+        Returns:
+            tuple: (distancias, índices), cada uno de forma (n, k).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if X.shape[1] != len(self.model_feature_names):
+            raise ValueError(
+                f"Se esperaban {len(self.model_feature_names)} features y llegaron {X.shape[1]}."
+            )
+        start = time.perf_counter_ns()
+        distances, indices = self.tree.query(X[:, self._columns], k=min(k, len(self)))
+        TELEMETRY.record_latency('knn', time.perf_counter_ns() - start)
+        return distances, indices
+
+    def similar(self, x, k=10):
+        """
+        Vecinos de un solo estudiante.
+
+        Returns:
+            tuple: (DataFrame de vecinos con 'distancia' y 'desenlace',
+            {desenlace: conteo}).
+        """
+        distances, indices = self.query(x, k)
+        rows = self.display.iloc[indices[0]].copy()
+        rows.insert(0, 'distancia', np.round(distances[0], 3))
+        rows.insert(1, 'desenlace', [self.outcomes[i] for i in indices[0]])
+        counts = Counter(rows['desenlace'])
+        return rows.reset_index(drop=True), {o: counts.get(o, 0) for o in OUTCOMES}
@@ -0,0 +1,264 @@
+"""
+🧱 Registros Compactos de Estudiantes (columnar)
+==========================================================================
+Representación en memoria de la matrícula como columnas NumPy en lugar de
+una lista de dicts anidados:
+
+- Campos numéricos en arrays tipados (``int16`` / ``float64``). Los
+  faltantes (NULL en el almacén) se guardan como ``MISSING_INT`` en las
+  columnas enteras y como NaN en las de punto flotante; ``value`` los
+  devuelve como None.
+- Campos de texto repetidos (programa, tutor, satisfacción, modalidad,
+  desafío, diagnóstico, intervención) como códigos categóricos ``int16``
+  más una tabla de categorías compartida (valores nuevos se agregan al final).
+- Texto libre (nombre, correo, descripción) en arrays de objetos.
+
+``StudentRecord`` es una vista ligera (``__slots__``) de una fila; su método
+``to_dict`` devuelve la forma anidada que usan las plantillas del dashboard.
+"""
+
+import threading
+
+import numpy as np
+
+try:
+    from student_store import COLUMNS, COLUMN_NAMES
+except ImportError:
+    from app.student_store import COLUMNS, COLUMN_NAMES
+
+# Tipo de cada columna; las categóricas se guardan como códigos
+NUMERIC_DTYPES = {
+    'id': np.int64,
+    'risk_score': np.float64,
+    'age': np.int16,
+    's1_aprobadas': np.int16,
+    's1_inscritas': np.int16,
+    's2_aprobadas': np.int16,
+    's2_inscritas': np.int16,
+    'momentum': np.float64,
+}
+CATEGORICAL = (
+    'program', 'tutor', 'satisfaccion', 'modalidad', 'desafio',
+    'risk_diagnosis', 'intervention',
+)
+CODE_DTYPE = np.int16
+MISSING_CODE = -1
+MISSING_INT = np.iinfo(np.int16).min   # centinela de las columnas enteras
+
+
+def _coerce_numeric(name, value):
+    """
+    Valor Python válido para la columna numérica ``name`` (None = faltante).
+
+    Raises:
+        ValueError: nulo en ``id``/``risk_score``, tipo no numérico, decimal
+            en una columna entera o fuera del rango de ``int16``.
+    """
+    if value is None:
+        if name in ('id', 'risk_score'):
+            raise ValueError(f"{name} no puede ser nulo")
+        return None
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.number)):
+        raise ValueError(f"{name} debe ser numérico, no {type(value).__name__}")
+    dtype = NUMERIC_DTYPES[name]
+    if not np.issubdtype(dtype, np.integer):
+        return float(value)
+    if value != value or float(value) != int(value):
+        raise ValueError(f"{name} debe ser entero, no {value!r}")
+    if not MISSING_INT < int(value) <= np.iinfo(dtype).max:
+        raise ValueError(f"{name} fuera de rango: {value!r}")
+    return int(value)
+
+
+def _to_cell(name, value):
+    """Valor ya validado -> celda del array (centinela o NaN para None)."""
+    if value is not None:
+        return value
+    return MISSING_INT if np.issubdtype(NUMERIC_DTYPES[name], np.integer) else np.nan
+
+
+def _numeric_column(name, values):
+    return np.array(
+        [_to_cell(name, _coerce_numeric(name, v)) for v in values], dtype=NUMERIC_DTYPES[name]
+    )
+
+
+def _encode(values):
+    """Valores de texto -> (códigos, categorías ordenadas); None se codifica como -1."""
+    categories = sorted({v for v in values if v is not None})
+    lookup = {v: i for i, v in enumerate(categories)}
+    codes = np.fromiter(
+        (lookup.get(v, MISSING_CODE) if v is not None else MISSING_CODE for v in values),
+        dtype=CODE_DTYPE, count=len(values)
+    )
+    return codes, tuple(categories)
+
+
+class StudentTable:
+    """
+    Tabla columnar de estudiantes con acceso por id en O(1).
+
+    Args:
+        rows: Filas planas en el orden de ``student_store.COLUMNS``.
+    """
+
+    def __init__(self, rows):
+        rows = list(rows)
+        self._columns = {}
+        self._categories = {}
+        self._lock = threading.Lock()
+        for i, (name, _) in enumerate(COLUMNS):
+            values = [row[i] for row in rows]
+            if name in NUMERIC_DTYPES:
+                self._columns[name] = _numeric_column(name, values)
+            elif name in CATEGORICAL:
+                self._columns[name], self._categories[name] = _encode(values)
+            else:
+                self._columns[name] = np.array(values, dtype=object)
+        self._positions = {int(sid): pos for pos, sid in enumerate(self._columns['id'])}
+
+    @classmethod
+    def from_students(cls, students):
+        """Construye la tabla desde registros anidados (forma de ``app/data.py``)."""
+        return cls(
+            tuple(s[section][name] if section else s.get(name) for name, section in COLUMNS)
+            for s in students
+        )
+
+    def __len__(self):
+        return len(self._columns['id'])
+
+    def __iter__(self):
+        return (StudentRecord(self, pos) for pos in range(len(self)))
+
+    def __contains__(self, student_id):
+        return student_id in self._positions
+
+    # ─── ACCESO ──────────────────────────────────────────────────────────
+
+    def value(self, pos: int, name: str):
+        """Valor Python de la columna ``name`` en la fila ``pos``."""
+        if name in self._categories:
+            code = self._columns[name][pos]
+            return None if code == MISSING_CODE else self._categories[name][code]
+        value = self._columns[name][pos]
+        if name in NUMERIC_DTYPES:
+            missing = value != value if value.dtype.kind == 'f' else value == MISSING_INT
+            return None if missing else value.item()
+        return value
+
+    def position(self, student_id):
+        """Fila del estudiante (None si no existe)."""
+        return self._positions.get(student_id)
+
+    def get(self, student_id):
+        """Vista del estudiante con ese id (None si no existe)."""
+        pos = self._positions.get(student_id)
+        return None if pos is None else StudentRecord(self, pos)
+
+    def get_many(self, student_ids) -> list:
+        """Vistas en el orden solicitado (omite ids inexistentes)."""
+        return [StudentRecord(self, self._positions[i]) for i in student_ids if i in self._positions]
+
+    def column(self, name: str) -> np.ndarray:
+        """Array de la columna; las categóricas se devuelven como códigos."""
+        return self._columns[name]
+
+    def categories(self, name: str) -> tuple:
+        return self._categories[name]
+
+    def decoded(self, name: str) -> np.ndarray:
+        """Columna categórica decodificada a texto (None para faltantes)."""
+        lookup = np.array((*self._categories[name], None), dtype=object)
+        return lookup[self._columns[name]]   # el código -1 apunta al None final
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de los arrays (sin contar el texto libre)."""
+        return sum(col.nbytes for col in self._columns.values())
+
+    # ─── ESCRITURA ───────────────────────────────────────────────────────
+
+    def update_risk(self, student_id, risk_score: float):
+        pos = self._positions.get(student_id)
+        if pos is not None:
+            with self._lock:
+                self._columns['risk_score'][pos] = risk_score
+
+    @staticmethod
+    def coerce(changes: dict) -> dict:
+        """
+        Valida y convierte cambios de columnas planas antes de escribirlos.
+
+        Raises:
+            ValueError: columna desconocida o no editable (``id``), o valor de
+                tipo o rango inválido para una columna numérica.
+        """
+        coerced = {}
+        for name, value in changes.items():
+            if name == 'id' or name not in COLUMN_NAMES:
+                raise ValueError(f"Columna no editable: {name}")
+            if name == 'name' and value is None:
+                raise ValueError("name no puede ser nulo")
+            if name in NUMERIC_DTYPES:
+                coerced[name] = _coerce_numeric(name, value)
+            elif value is not None and not isinstance(value, str):
+                raise ValueError(f"{name} debe ser texto, no {type(value).__name__}")
+            else:
+                coerced[name] = value
+        return coerced
+
+    def update_fields(self, student_id, changes: dict):
+        """
+        Actualiza columnas de una fila; valores categóricos nuevos se agregan al
+        final. Todos los cambios se validan (``coerce``) antes de escribir.
+        """
+        changes = self.coerce(changes)
+        pos = self._positions.get(student_id)
+        if pos is None:
+            return
+        with self._lock:
+            for name, value in changes.items():
+                if name in self._categories:
+                    categories = self._categories[name]
+                    if value is None:
+                        code = MISSING_CODE
+                    elif value in categories:
+                        code = categories.index(value)
+                    else:
+                        code = len(categories)
+                        self._categories[name] = (*categories, value)
+                    self._columns[name][pos] = code
+                elif name in NUMERIC_DTYPES:
+                    self._columns[name][pos] = _to_cell(name, value)
+                else:
+                    self._columns[name][pos] = value
+
+
+class StudentRecord:
+    """Vista de una fila de ``StudentTable``; no copia datos."""
+
+    __slots__ = ('_table', '_pos')
+
+    def __init__(self, table: StudentTable, pos: int):
+        self._table = table
+        self._pos = pos
+
+    def __getattr__(self, name):
+        try:
+            return self._table.value(self._pos, name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return f"StudentRecord(id={self.id}, name={self.name!r})"
+
+    def to_dict(self) -> dict:
+        """Registro anidado (``academic_data`` / ``context_data``) para las plantillas."""
+        student = {'academic_data': {}, 'context_data': {}}
+        for name, section in COLUMNS:
+            value = self._table.value(self._pos, name)
+            if section:
+                student[section][name] = value
+            else:
+                student[name] = value
+        return student
@@ -0,0 +1,296 @@
+"""
+🗄️ Almacén Local de Estudiantes (SQLite)
+==========================================================================
+Stand-in local del sistema escolar: una tabla plana de estudiantes con
+índices por id, riesgo, programa y tutor. Expone top-k por riesgo, búsqueda
+puntual por id y consultas filtradas por rango, de modo que el dashboard ya
+no materializa, ordena y recorre la lista completa en cada interacción.
+
+Los registros se devuelven con la misma forma anidada que ``app/data.py``
+(``academic_data`` / ``context_data``).
+"""
+
+import sqlite3
+import threading
+from urllib.parse import parse_qs, urlparse
+
+# Columnas planas en el orden de la tabla: (columna, sección anidada o None)
+COLUMNS = (
+    ('id', None),
+    ('name', None),
+    ('email', None),
+    ('avatar_seed', None),
+    ('program', None),
+    ('tutor', None),
+    ('risk_score', None),
+    ('age', 'academic_data'),
+    ('s1_aprobadas', 'academic_data'),
+    ('s1_inscritas', 'academic_data'),
+    ('s2_aprobadas', 'academic_data'),
+    ('s2_inscritas', 'academic_data'),
+    ('momentum', 'academic_data'),
+    ('satisfaccion', 'context_data'),
+    ('modalidad', 'context_data'),
+    ('desafio', 'context_data'),
+    ('risk_diagnosis', None),
+    ('risk_description', None),
+    ('intervention', None),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT,
+    avatar_seed TEXT,
+    program TEXT,
+    tutor TEXT,
+    risk_score REAL NOT NULL,
+    age INTEGER,
+    s1_aprobadas INTEGER,
+    s1_inscritas INTEGER,
+    s2_aprobadas INTEGER,
+    s2_inscritas INTEGER,
+    momentum REAL,
+    satisfaccion TEXT,
+    modalidad TEXT,
+    desafio TEXT,
+    risk_diagnosis TEXT,
+    risk_description TEXT,
+    intervention TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_students_risk ON students (risk_score DESC, id);
+CREATE INDEX IF NOT EXISTS idx_students_program_risk ON students (program, risk_score DESC, id);
+CREATE INDEX IF NOT EXISTS idx_students_tutor_risk ON students (tutor, risk_score DESC, id);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _seed_from_avatar_url(url):
+    """Semilla de una URL de dicebear (``...?seed=Sofia``); None si no la tiene."""
+    if not url:
+        return None
+    if not url.startswith(("http://", "https://")):
+        return url
+    seeds = parse_qs(urlparse(url).query).get("seed")
+    return seeds[0] if seeds else None
+
+
+# Orden canónico de la lista priorizada (usa idx_students_risk)
+RISK_ORDER = "ORDER BY risk_score DESC, id"
+
+
+def flatten_student(student: dict) -> tuple:
+    """Registro anidado -> fila plana en el orden de ``COLUMNS``."""
+    return tuple(
+        student[section][name] if section else student.get(name)
+        for name, section in COLUMNS
+    )
+
+
+def row_to_student(row) -> dict:
+    """Fila plana -> registro anidado con la forma que usan las plantillas."""
+    student = {'academic_data': {}, 'context_data': {}}
+    for (name, section), value in zip(COLUMNS, row):
+        if section:
+            student[section][name] = value
+        else:
+            student[name] = value
+    return student
+
+
+class StudentStore:
+    """
+    Almacén SQLite compartido por todas las sesiones del proceso.
+
+    Args:
+        path: Ruta del archivo SQLite o ``":memory:"``.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._migrate()
+            self._conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """
+        Lleva un archivo existente al esquema actual. Bases creadas antes de
+        los avatares locales tienen ``avatar`` (URL de dicebear) en lugar de
+        ``avatar_seed``: se renombra la columna y se conserva solo la semilla.
+        """
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(students)")}
+        if 'avatar' not in existing or 'avatar_seed' in existing:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE students RENAME COLUMN avatar TO avatar_seed")
+            rows = self._conn.execute(
+                "SELECT id, avatar_seed FROM students WHERE avatar_seed IS NOT NULL"
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE students SET avatar_seed = ? WHERE id = ?",
+                [(_seed_from_avatar_url(url), student_id) for student_id, url in rows]
+            )
+
+    def _fetch(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _where(self, program=None, tutor=None, min_risk=None, max_risk=None):
+        clauses, params = [], []
+        if program is not None:
+            clauses.append("program = ?")
+            params.append(program)
+        if tutor is not None:
+            clauses.append("tutor = ?")
+            params.append(tutor)
+        if min_risk is not None:
+            clauses.append("risk_score >= ?")
+            params.append(min_risk)
+        if max_risk is not None:
+            clauses.append("risk_score <= ?")
+            params.append(max_risk)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    # ─── ESCRITURA ───────────────────────────────────────────────────────
+
+    def upsert_many(self, students):
+        placeholders = ", ".join("?" * len(COLUMNS))
+        rows = [flatten_student(s) for s in students]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO students ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})",
+                rows
+            )
+
+    def update_risk(self, student_id, risk_score: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE students SET risk_score = ? WHERE id = ?", (float(risk_score), student_id)
+            )
+
+    def update_fields(self, student_id, changes: dict, meta=None):
+        """
+        Actualiza columnas de un estudiante (nombres planos de ``COLUMNS``).
+        Las claves de ``meta`` se guardan en la misma transacción (ver ``set_meta``).
+        """
+        unknown = set(changes) - set(COLUMN_NAMES[1:])
+        if unknown:
+            raise ValueError(f"Columnas desconocidas: {sorted(unknown)}")
+        if not changes and not meta:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in changes)
+        with self._lock, self._conn:
+            if changes:
+                self._conn.execute(
+                    f"UPDATE students SET {assignments} WHERE id = ?", [*changes.values(), student_id]
+                )
+            self._write_meta(meta or {})
+
+    def _write_meta(self, meta: dict):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in meta.items()]
+        )
+
+    def set_meta(self, key: str, value):
+        """Guarda un valor de metadatos (p. ej. el offset del log de eventos) como texto."""
+        with self._lock, self._conn:
+            self._write_meta({key: value})
+
+    # ─── LECTURA ─────────────────────────────────────────────────────────
+
+    def get_meta(self, key: str, default=None):
+        rows = self._fetch("SELECT value FROM metadata WHERE key = ?", (key,))
+        return rows[0][0] if rows else default
+
+    def get(self, student_id):
+        """Búsqueda puntual por id (clave primaria)."""
+        rows = self._fetch(f"SELECT {', '.join(COLUMN_NAMES)} FROM students WHERE id = ?", (student_id,))
+        return row_to_student(rows[0]) if rows else None
+
+    def get_many(self, student_ids) -> list:
+        """Varios estudiantes por id, en el orden solicitado (omite ids inexistentes)."""
+        ids = list(student_ids)
+        if not ids:
+            return []
+        by_id = {}
+        # SQLite limita el número de parámetros por sentencia
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self._fetch(
+                f"SELECT {', '.join(COLUMN_NAMES)} FROM students WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            by_id.update((row[0], row) for row in rows)
+        return [row_to_student(by_id[i]) for i in ids if i in by_id]
+
+    def query(self, program=None, tutor=None, min_risk=None, max_risk=None,
+              offset=0, limit=None) -> list:
+        """Consulta filtrada por programa/tutor y rango de riesgo, en orden de prioridad."""
+        where, params = self._where(program, tutor, min_risk, max_risk)
+        sql = f"SELECT {', '.join(COLUMN_NAMES)} FROM students{where} {RISK_ORDER} LIMIT ? OFFSET ?"
+        rows = self._fetch(sql, [*params, -1 if limit is None else limit, offset])
+        return [row_to_student(r) for r in rows]
+
+    def rows(self) -> list:
+        """Todas las filas planas (orden de ``COLUMNS``) por riesgo descendente."""
+        return self._fetch(f"SELECT {', '.join(COLUMN_NAMES)} FROM students {RISK_ORDER}")
+
+    def top_k(self, k: int, program=None, tutor=None) -> list:
+        """Los ``k`` estudiantes de mayor riesgo (opcionalmente por programa o tutor)."""
+        return self.query(program=program, tutor=tutor, limit=k)
+
+    def count(self, program=None, tutor=None, min_risk=None, max_risk=None) -> int:
+        where, params = self._where(program, tutor, min_risk, max_risk)
+        return self._fetch(f"SELECT COUNT(*) FROM students{where}", params)[0][0]
+
+    def distinct(self, column: str) -> list:
+        """Valores distintos de ``program`` o ``tutor`` (para filtros del dashboard)."""
+        if column not in ('program', 'tutor'):
+            raise ValueError(f"Columna no indexada para filtros: {column}")
+        rows = self._fetch(f"SELECT DISTINCT {column} FROM students WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [r[0] for r in rows]
+
+    def cursor(self, **filters) -> "StudentCursor":
+        return StudentCursor(self, **filters)
+
+
+class StudentCursor:
+    """
+    Cursor de solo lectura sobre la lista priorizada (riesgo descendente).
+    El dashboard pide únicamente la ventana visible con ``fetch``.
+    """
+
+    def __init__(self, store: StudentStore, **filters):
+        self._store = store
+        self._filters = filters
+        self._total = None
+
+    def __len__(self):
+        if self._total is None:
+            self._total = self._store.count(**self._filters)
+        return self._total
+
+    def fetch(self, offset: int, limit: int) -> list:
+        """Filas ``[offset, offset + limit)`` del orden por riesgo."""
+        return self._store.query(offset=offset, limit=limit, **self._filters)
+
+
+class StudentIdCursor:
+    """Cursor sobre una lista de ids ya ordenada (p. ej. resultados de búsqueda)."""
+
+    def __init__(self, store: StudentStore, student_ids):
+        self._store = store
+        self._ids = list(student_ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def fetch(self, offset: int, limit: int) -> list:
+        return self._store.get_many(self._ids[offset:offset + limit])
@@ -1,3 +1,11 @@
+import html
+from string import Template
+
+try:
+    from avatars import student_avatar_uri
+except ImportError:
+    from app.avatars import student_avatar_uri
+
 
 def get_css():
     return """
@@ -144,12 +152,47 @@ def get_css():
         .list-item-container {
             transition: all 0.2s ease;
             cursor: pointer;
+            background-color: #ffffff;
+            border-left: 4px solid #eee;
+            padding: 12px;
+            border-radius: 8px;
+            margin-bottom: 12px;
+            display: flex;
+            align-items: center;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
         }
         
         .list-item-container:hover {
             transform: translateX(4px);
         }
 
+        .list-item-container.selected {
+            background-color: #e3f2fd;
+            border-left-color: var(--unrc-guinda);
+        }
+
+        .list-item-avatar {
+            width: 42px;
+            height: 42px;
+            border-radius: 50%;
+            margin-right: 12px;
+            border: 2px solid #fff;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+
+        .list-item-body { flex-grow: 1; }
+        .list-item-name { font-weight: 600; font-size: 0.95rem; color: #333; }
+        .list-item-meta { font-size: 0.75rem; color: #888 !important; margin-top: 2px; }
+
+        .list-item-risk {
+            font-weight: 700;
+            font-size: 0.9rem;
+            background: #fff;
+            padding: 4px 8px;
+            border-radius: 12px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        }
+
         /* CIRCLE PROGRESS */
         .progress-ring__circle {
             transition: stroke-dashoffset 1s ease-in-out;
@@ -170,3 +213,38 @@ def get_css():
 
     </style>
     """
+
+
+# Plantilla de un elemento de la lista priorizada; los estilos viven en get_css()
+LIST_ITEM_TEMPLATE = Template(
+    '<div class="list-item-container$selected">'
+    '<img class="list-item-avatar" src="$avatar">'
+    '<div class="list-item-body">'
+    '<div class="list-item-name">$name</div>'
+    '<div class="list-item-meta">Estudiante • ID: $id</div>'
+    '</div>'
+    '<div class="list-item-risk" style="color: $color;">$risk%</div>'
+    '</div>'
+)
+
+
+def get_student_list_html(students, selected_id, risk_color):
+    """
+    Construye en un solo bloque HTML la página visible de la lista.
+
+    Args:
+        students: Registros de la página actual.
+        selected_id: Id del estudiante seleccionado (se resalta).
+        risk_color: Función probabilidad -> color del badge de riesgo.
+    """
+    return "".join(
+        LIST_ITEM_TEMPLATE.substitute(
+            selected=" selected" if s['id'] == selected_id else "",
+            avatar=student_avatar_uri(s),
+            name=html.escape(s['name']),
+            id=s['id'],
+            color=risk_color(s['risk_score']),
+            risk=int(s['risk_score'] * 100),
+        )
+        for s in students
+    )
@@ -0,0 +1,234 @@
+"""
+⏱️ Telemetría de Inferencia
+==========================================================================
+Histogramas de latencia por etapa del camino de inferencia (mapeo,
+construcción del DataFrame, transform y predict), tasas de acierto de
+caches y conteo de reruns por sesión.
+
+Registrar una muestra no toma locks: cada hilo de Streamlit escribe en su
+propio shard y la lectura (panel de operaciones) fusiona los shards. Los
+shards de hilos terminados (cada rerun de Streamlit corre en un hilo nuevo)
+se acumulan en un shard base, así que la lista solo crece con los hilos vivos.
+Los reruns se cuentan por sesión en un LRU acotado (``MAX_SESSIONS``).
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+# Etapas del camino de inferencia, en orden
+INFERENCE_STAGES = ('mapping', 'frame', 'transform', 'predict')
+
+# Límites de bucket en nanosegundos: 10 µs · √2^k, hasta ~40 s
+BUCKET_BOUNDS_NS = tuple(int(10_000 * 2 ** (k / 2)) for k in range(45))
+
+# Sesiones con conteo de reruns; se descarta la de actividad más antigua
+MAX_SESSIONS = 1000
+
+
+class LatencyHistogram:
+    """Histograma de buckets fijos con un shard por hilo vivo (registro sin locks)."""
+
+    def __init__(self, bounds_ns=BUCKET_BOUNDS_NS):
+        self.bounds_ns = tuple(bounds_ns)
+        self._local = threading.local()
+        # [conteos por bucket..., desbordamiento, suma_ns]
+        self._base = self._empty()
+        self._shards = []          # (hilo, shard) de hilos que registraron muestras
+        self._shards_lock = threading.Lock()
+
+    def _empty(self):
+        return [0] * (len(self.bounds_ns) + 2)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._empty()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._fold_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_dead_shards(self):
+        """Suma al shard base los de hilos terminados (ya no escriben) y los descarta."""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for i, value in enumerate(shard):
+                    self._base[i] += value
+        self._shards = alive
+
+    def record(self, elapsed_ns: int):
+        shard = self._shard()
+        shard[bisect_left(self.bounds_ns, elapsed_ns)] += 1
+        shard[-1] += elapsed_ns
+
+    def counts(self):
+        """Conteos fusionados por bucket (el último es desbordamiento) y suma total en ns."""
+        with self._shards_lock:
+            self._fold_dead_shards()
+            merged = list(self._base)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for i, value in enumerate(shard):
+                merged[i] += value
+        return merged[:-1], merged[-1]
+
+    def reset(self):
+        with self._shards_lock:
+            self._fold_dead_shards()
+            self._base = self._empty()
+            for _, shard in self._shards:
+                shard[:] = [0] * len(shard)
+
+    def summary(self) -> dict:
+        """Conteo, media y percentiles (cota superior del bucket) en milisegundos."""
+        counts, total_ns = self.counts()
+        n = sum(counts)
+        result = {'count': n, 'mean_ms': (total_ns / n / 1e6) if n else 0.0}
+        for label, q in (('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+            result[label] = self._quantile_ms(counts, n, q)
+        return result
+
+    def _quantile_ms(self, counts, n, q):
+        if not n:
+            return 0.0
+        target = q * n
+        cumulative = 0
+        for i, c in enumerate(counts):
+            cumulative += c
+            if cumulative >= target:
+                bound = self.bounds_ns[min(i, len(self.bounds_ns) - 1)]
+                return bound / 1e6
+        return self.bounds_ns[-1] / 1e6
+
+
+class Telemetry:
+    """Registro de procesos: latencias por etapa, caches y reruns por sesión."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self._histograms = {}
+        self._counters = {}
+        self._sessions = OrderedDict()   # sesión -> reruns, en orden de actividad
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, LatencyHistogram())
+        return hist
+
+    def record_latency(self, stage: str, elapsed_ns: int):
+        self.histogram(stage).record(elapsed_ns)
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_latency(stage, time.perf_counter_ns() - start)
+
+    def increment(self, name: str, amount: int = 1):
+        """Contador genérico (bajo el lock: ``reset`` reemplaza el diccionario)."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record_cache(self, cache: str, hits: int = 0, misses: int = 0):
+        if hits:
+            self.increment(f'cache.{cache}.hits', hits)
+        if misses:
+            self.increment(f'cache.{cache}.misses', misses)
+
+    def record_rerun(self, session_key: str):
+        """Cuenta un rerun de la sesión; si hay más de ``max_sessions``, olvida la más inactiva."""
+        with self._lock:
+            self._sessions[session_key] = self._sessions.pop(session_key, 0) + 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def reset(self):
+        with self._lock:
+            for hist in self._histograms.values():
+                hist.reset()
+            self._counters = {}
+            self._sessions = OrderedDict()
+            self.started_at = time.time()
+
+    def _counters_copy(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    # ─── LECTURA / EXPORTACIÓN ───────────────────────────────────────────
+
+    def latency_frame(self) -> pd.DataFrame:
+        stages = list(INFERENCE_STAGES) + sorted(set(self._histograms) - set(INFERENCE_STAGES))
+        rows = [{'stage': s, **self.histogram(s).summary()} for s in stages]
+        return pd.DataFrame(rows).set_index('stage')
+
+    def cache_frame(self) -> pd.DataFrame:
+        counters = self._counters_copy()
+        caches = sorted({k.split('.')[1] for k in counters if k.startswith('cache.')})
+        rows = []
+        for cache in caches:
+            hits = counters.get(f'cache.{cache}.hits', 0)
+            misses = counters.get(f'cache.{cache}.misses', 0)
+            total = hits + misses
+            rows.append({'cache': cache, 'hits': hits, 'misses': misses,
+                         'hit_rate': hits / total if total else 0.0})
+        return pd.DataFrame(rows, columns=['cache', 'hits', 'misses', 'hit_rate']).set_index('cache')
+
+    def session_frame(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{'session': k, 'reruns': v} for k, v in self._sessions.items()]
+        return pd.DataFrame(rows, columns=['session', 'reruns']).set_index('session')
+
+    def counters(self) -> dict:
+        return {k: v for k, v in self._counters_copy().items() if not k.startswith('cache.')}
+
+    def snapshot(self) -> dict:
+        return {
+            'started_at': self.started_at,
+            'uptime_s': time.time() - self.started_at,
+            'latency': self.latency_frame().to_dict(orient='index'),
+            'histograms_ns': {
+                stage: dict(zip([*map(str, BUCKET_BOUNDS_NS), 'overflow'], hist.counts()[0]))
+                for stage, hist in self._histograms.items()
+            },
+            'caches': self.cache_frame().to_dict(orient='index'),
+            'sessions': self.session_frame()['reruns'].to_dict(),
+            'counters': self.counters(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+
+# Instancia compartida por todas las sesiones del proceso
+TELEMETRY = Telemetry()
+
+
+def timed_stage(stage: str):
+    """Decorador que registra la latencia de cada llamada en ``TELEMETRY``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TELEMETRY.record_latency(stage, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
@@ -1,9 +1,27 @@
 
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
+try:
+    from explanations import ContributionExplainer
+    from telemetry import TELEMETRY, timed_stage
+    from shadow import ShadowScorer, get_candidate_path
+    from inference import InferenceExecutor, InferenceOverloaded
+    from feature_store import FeatureStore, feature_set_version, get_feature_db_path, source_hash
+    from rescoring import EventLog, IncrementalScorer
+    from similar_students import SimilarStudentsIndex
+except ImportError:
+    from app.explanations import ContributionExplainer
+    from app.telemetry import TELEMETRY, timed_stage
+    from app.shadow import ShadowScorer, get_candidate_path
+    from app.inference import InferenceExecutor, InferenceOverloaded
+    from app.feature_store import FeatureStore, feature_set_version, get_feature_db_path, source_hash
+    from app.rescoring import EventLog, IncrementalScorer
+    from app.similar_students import SimilarStudentsIndex
 
 # ═══════════════════════════════════════════════════════════════════════════
 # FUNCIONES DE CARGA DE ARTEFACTOS
@@ -42,20 +60,108 @@ def load_model_artifacts():
         st.error(f"❌ Error al cargar artefactos: {e}")
         st.stop()
 
+
+@st.cache_resource
+def load_explainer(_model, feature_names):
+    """Explicador de contribuciones compartido entre sesiones (cache por modelo)."""
+    return ContributionExplainer(_model, feature_names)
+
+
+@st.cache_resource
+def load_inference_executor(_model):
+    """Pool de inferencia compartido por todas las sesiones (un modelo, cola acotada)."""
+    return InferenceExecutor(_model)
+
+
+@st.cache_resource
+def load_feature_store(_preprocessor, feature_names):
+    """Almacén de vectores listos para el modelo, versionado por conjunto de features."""
+    version = feature_set_version(feature_names, _preprocessor, FEATURE_MAPPING_VERSION)
+    return FeatureStore(get_feature_db_path(), version=version)
+
+
+@st.cache_resource
+def load_incremental_scorer(_executor, _preprocessor, feature_names, _feature_store, _explainer):
+    """
+    Re-scoring por eventos en un hilo de fondo: aplica los cambios del log,
+    recalcula los vectores de los estudiantes afectados y actualiza su riesgo.
+    """
+    # Import diferido: data -> search_index -> utils
+    try:
+        from data import (get_students, update_student_fields, update_student_risk,
+                          get_store_meta, set_store_meta)
+    except ImportError:
+        from app.data import (get_students, update_student_fields, update_student_risk,
+                              get_store_meta, set_store_meta)
+
+    def score(students):
+        ids = [s['id'] for s in students]
+        X = build_model_matrix(students, feature_names, _preprocessor)
+        _feature_store.upsert_many(ids, X, source_hashes=student_source_hashes(students))
+        _explainer.invalidate(ids)
+        probas, _ = _executor.predict_proba(X)
+        return probas[:, 0]
+
+    log = EventLog()
+    key = log.offset_key
+
+    def apply_changes(student_id, changes, offset):
+        update_student_fields(student_id, changes, meta={key: offset})
+
+    scorer = IncrementalScorer(
+        log, get_students, apply_changes, score, update_student_risk,
+        load_offset=lambda: get_store_meta(key, 0),
+        save_offset=lambda offset: set_store_meta(key, offset),
+    )
+    scorer.start()
+    return scorer
+
+
+@st.cache_resource
+def load_similar_students():
+    """
+    Índice k-NN del histórico (memory-mapped). Retorna None si aún no se construyó
+    con ``python src/models/similar_students.py``.
+    """
+    return SimilarStudentsIndex.load()
+
+
+@st.cache_resource
+def load_shadow_scorer(_model):
+    """
+    Carga el modelo candidato si existe (modo shadow); si no, retorna None.
+    El candidato comparte preprocesador y features con el modelo de producción.
+    """
+    candidate_path = get_candidate_path()
+    if not candidate_path.exists():
+        return None
+    try:
+        candidate = joblib.load(str(candidate_path))
+    except Exception as e:
+        st.warning(f"⚠️ No se pudo cargar el modelo candidato: {e}")
+        return None
+    return ShadowScorer(candidate, _model)
+
 # ═══════════════════════════════════════════════════════════════════════════
 # FUNCIONES DE LÓGICA DE NEGOCIO
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Umbrales de probabilidad de abandono para los niveles de riesgo
+HIGH_RISK_THRESHOLD = 0.7
+MODERATE_RISK_THRESHOLD = 0.4
+
+
 def classify_risk_level(dropout_probability: float):
     """Retorna (nivel, color, tag) según probabilidad de abandono."""
-    if dropout_probability > 0.7:
+    if dropout_probability > HIGH_RISK_THRESHOLD:
         return "🔴 ALTO RIESGO", "#d32f2f", "danger"
-    elif dropout_probability > 0.4:
+    elif dropout_probability > MODERATE_RISK_THRESHOLD:
         return "🟠 RIESGO MODERADO", "#f57c00", "warning"
     else:
         return "🟢 BAJO RIESGO", "#388e3c", "success"
 
 
+@timed_stage('frame')
 def create_student_input_df(inputs_dict: dict, feature_names) -> pd.DataFrame:
     """Construye un DataFrame de una fila con todos los features esperados."""
     full = {feat: 0 for feat in feature_names}
@@ -63,12 +169,120 @@ def create_student_input_df(inputs_dict: dict, feature_names) -> pd.DataFrame:
     return pd.DataFrame([full])
 
 
-def make_prediction(student_input_df: pd.DataFrame, model, preprocessor, class_names) -> dict:
+def create_students_input_df(inputs_list, feature_names) -> pd.DataFrame:
+    """
+    Versión por lotes de ``create_student_input_df``: una fila por estudiante.
+    No se mide: los lotes (contrafactuales, re-scoring) no son latencia de serving.
+    """
+    df = pd.DataFrame.from_records(list(inputs_list))
+    return df.reindex(columns=list(feature_names), fill_value=0).fillna(0)
+
+
+def student_to_unrc_inputs(student: dict) -> dict:
+    """Extrae del registro del estudiante las variables UNRC que usa el mapeo."""
+    academic = student['academic_data']
+    context = student['context_data']
+    return {
+        'momentum': academic['momentum'],
+        'age': academic['age'],
+        's1_aprobadas': academic['s1_aprobadas'],
+        's1_inscritas': academic['s1_inscritas'],
+        's2_aprobadas': academic['s2_aprobadas'],
+        's2_inscritas': academic['s2_inscritas'],
+        'satisfaccion': context['satisfaccion'],
+        'modalidad': context['modalidad'],
+        'desafio': context['desafio'],
+    }
+
+
+def build_model_matrix(students, feature_names, preprocessor):
+    """Mapea y preprocesa un lote de estudiantes en una sola llamada a ``transform``."""
+    inputs = [map_unrc_to_model_inputs(student_to_unrc_inputs(s)) for s in students]
+    frame = create_students_input_df(inputs, feature_names)
+    with TELEMETRY.timed('transform'):
+        return preprocessor.transform(frame)
+
+
+def student_source_hashes(students) -> dict:
+    """{id: huella de las variables UNRC} con que se calcula el vector de cada estudiante."""
+    return {s['id']: source_hash(student_to_unrc_inputs(s)) for s in students}
+
+
+def get_model_vectors(students, feature_names, preprocessor, feature_store):
+    """
+    Vectores listos para el modelo, en el orden de ``students``.
+    Lee del almacén de features y solo calcula (y guarda) los que faltan o
+    se calcularon con datos del estudiante que ya cambiaron.
+    """
+    ids = [s['id'] for s in students]
+    hashes = student_source_hashes(students)
+    found = feature_store.get_many(ids, source_hashes=hashes)
+    TELEMETRY.record_cache('features', hits=len(found), misses=len(ids) - len(found))
+    missing = [s for s in students if s['id'] not in found]
+    if missing:
+        fresh = build_model_matrix(missing, feature_names, preprocessor)
+        feature_store.upsert_many([s['id'] for s in missing], fresh, source_hashes=hashes)
+        found.update(zip((s['id'] for s in missing), np.asarray(fresh, dtype=np.float32)))
+    return np.vstack([found[i] for i in ids])
+
+
+def write_feature_vectors(students, feature_names, preprocessor, feature_store, batch_size=1000) -> int:
+    """
+    Escritor del pipeline: calcula y guarda por lotes los vectores (con su
+    huella) de todos los ``students``. Retorna cuántos se escribieron.
+    """
+    written = 0
+    batch = []
+    for student in students:
+        batch.append(student)
+        if len(batch) == batch_size:
+            written += _write_feature_batch(batch, feature_names, preprocessor, feature_store)
+            batch = []
+    if batch:
+        written += _write_feature_batch(batch, feature_names, preprocessor, feature_store)
+    return written
+
+
+def _write_feature_batch(students, feature_names, preprocessor, feature_store) -> int:
+    X = build_model_matrix(students, feature_names, preprocessor)
+    feature_store.upsert_many([s['id'] for s in students], X, source_hashes=student_source_hashes(students))
+    return len(students)
+
+
+def make_prediction(student_input_df: pd.DataFrame, model, preprocessor, class_names,
+                    shadow=None, executor=None) -> dict:
     """Aplica preprocesamiento y predice probabilidades/clase."""
     try:
         # with st.spinner("⏳ Calculando riesgo..."): # Removed spinner for cleaner UI logic
-        X = preprocessor.transform(student_input_df)
-        proba = model.predict_proba(X)[0]
+        with TELEMETRY.timed('transform'):
+            X = preprocessor.transform(student_input_df)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    return predict_from_vectors(X, model, class_names, shadow=shadow, executor=executor)
+
+
+def predict_from_vectors(X, model, class_names, shadow=None, executor=None) -> dict:
+    """
+    Predice probabilidades/clase a partir de vectores ya preprocesados (una fila).
+    Si se pasa un ``InferenceExecutor``, la predicción corre en su pool en lugar
+    del hilo de la sesión. Si se pasa un ``ShadowScorer``, el candidato puntúa
+    la misma entrada en segundo plano.
+
+    Si falla retorna ``{'success': False, 'error': ..., 'overloaded': bool}``;
+    ``overloaded`` indica que la cola de inferencia rechazó la petición
+    (``InferenceOverloaded``) y conviene reintentar en unos segundos.
+    """
+    try:
+        if executor is not None:
+            probas, latency_ns = executor.submit(X).result()
+        else:
+            start = time.perf_counter_ns()
+            probas = model.predict_proba(X)
+            latency_ns = time.perf_counter_ns() - start
+            TELEMETRY.record_latency('predict', latency_ns)
+        if shadow is not None:
+            shadow.submit(X, probas, latency_ns)
+        proba = probas[0]
         pred = int(np.argmax(proba))
         return {
             'prediction': pred,
@@ -81,7 +295,7 @@ def make_prediction(student_input_df: pd.DataFrame, model, preprocessor, class_n
             'success': True,
         }
     except Exception as e:
-        return {'success': False, 'error': str(e)}
+        return {'success': False, 'error': str(e), 'overloaded': isinstance(e, InferenceOverloaded)}
 
 
 def calculate_contextual_risk_score(unrc_inputs):
@@ -120,9 +334,16 @@ def calculate_contextual_risk_score(unrc_inputs):
     return min(risk_score, 1.0)
 
 
+# Incrementar al cambiar la lógica de mapeo: invalida los vectores del almacén de features
+FEATURE_MAPPING_VERSION = 1
+
+
 def map_unrc_to_model_inputs(unrc_inputs):
     """
     Traduce variables contextuales de UNRC a las variables esperadas por el modelo XGBoost.
+
+    No se mide aquí: los contrafactuales y los lotes la llaman muchas veces por
+    solicitud; la etapa 'mapping' se mide en la llamada del serving.
     """
     model_inputs = {}
     
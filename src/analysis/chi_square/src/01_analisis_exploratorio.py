@@ -3,6 +3,9 @@ import os
 import json
 from pathlib import Path
 
+from dataset_encuesta import cargar_datos, matriz_desafios
+from multiseleccion import conteos_opciones
+
 # --- Configuración de Rutas ---
 # Determinar si estamos ejecutando desde el directorio raíz o desde analisis_chi_cuadrado/src
 if os.path.basename(os.getcwd()) == 'src':
@@ -19,62 +22,68 @@ else:
 # Crear directorios si no existen
 os.makedirs(RESULTS_PATH, exist_ok=True)
 
-# --- Carga de Datos ---
-try:
-    df = pd.read_csv(PROCESSED_DATA_PATH)
-except Exception as e:
-    print(f"Error al cargar o procesar el archivo: {e}")
-    exit()
 
-# --- Análisis Descriptivo Básico ---
+def main(df):
+    # --- Análisis Descriptivo Básico ---
+
+    print("--- Análisis Exploratorio Inicial ---")
+
+    # 1. Porcentaje de estudiantes que consideraron abandonar
+    print("\n1. ¿Consideró abandonar sus estudios?")
+    considero_counts = df['abandono_considerado'].value_counts()
+    considero_perc = df['abandono_considerado'].value_counts(normalize=True) * 100
+    print(pd.concat([considero_counts, considero_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']))
 
-print("--- Análisis Exploratorio Inicial ---")
+    # 2. Distribución por licenciatura
+    print("\n2. Distribución por Licenciatura")
+    licenciatura_counts = df['licenciatura'].value_counts()
+    licenciatura_perc = df['licenciatura'].value_counts(normalize=True) * 100
+    print(pd.concat([licenciatura_counts, licenciatura_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']))
 
-# 1. Porcentaje de estudiantes que consideraron abandonar
-print("\n1. ¿Consideró abandonar sus estudios?")
-considero_counts = df['abandono_considerado'].value_counts()
-considero_perc = df['abandono_considerado'].value_counts(normalize=True) * 100
-print(pd.concat([considero_counts, considero_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']))
+    # 3. Distribución de la frecuencia de pensamientos de abandono
+    print("\n3. Frecuencia de pensamientos de abandono (1-5)")
+    print(df['frecuencia_abandono'].describe())
+    print("\nDistribución de Frecuencia:")
+    print(df['frecuencia_abandono'].value_counts().sort_index())
 
-# 2. Distribución por licenciatura
-print("\n2. Distribución por Licenciatura")
-licenciatura_counts = df['licenciatura'].value_counts()
-licenciatura_perc = df['licenciatura'].value_counts(normalize=True) * 100
-print(pd.concat([licenciatura_counts, licenciatura_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']))
+    # 4. Top desafíos no académicos
+    print("\n4. Desafíos no académicos más comunes")
+    # Matriz multi-hot: una columna por opción (respeta las comas dentro de paréntesis)
+    desafios, vocabulario = matriz_desafios(df)
+    desafios_counts = conteos_opciones(desafios, vocabulario)
+    desafios_perc = desafios_counts / desafios.nnz * 100
+    print(pd.concat([desafios_counts, desafios_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']).head())
 
-# 3. Distribución de la frecuencia de pensamientos de abandono
-print("\n3. Frecuencia de pensamientos de abandono (1-5)")
-print(df['frecuencia_abandono'].describe())
-print("\nDistribución de Frecuencia:")
-print(df['frecuencia_abandono'].value_counts().sort_index())
+    # --- Generar Métricas para DVC ---
+    metrics = {
+        "total_estudiantes": len(df),
+        "consideraron_abandonar": int(df['abandono_considerado'].value_counts().get('Sí', 0)),
+        "porcentaje_abandono": float(considero_perc.get('Sí', 0)),
+        "count_licenciaturas": int(len(df['licenciatura'].unique())),
+        "licenciatura_mayoritaria": str(df['licenciatura'].value_counts().index[0]),
+        "frecuencia_abandono_promedio": float(df['frecuencia_abandono'].mean()),
+        "frecuencia_abandono_mediana": float(df['frecuencia_abandono'].median()),
+        "total_respustas_desafios": int(desafios.nnz),
+        "desafio_mas_comun": str(desafios_counts.index[0]),
+        "desafios_unicos": int(desafios_counts.nunique())
+    }
 
-# 4. Top desafíos no académicos
-print("\n4. Desafíos no académicos más comunes")
-# Limpiar y separar los desafíos
-desafios = df['desafios_no_academicos'].str.split(', ').explode().str.strip()
-desafios_counts = desafios.value_counts()
-desafios_perc = desafios.value_counts(normalize=True) * 100
-print(pd.concat([desafios_counts, desafios_perc], axis=1, keys=['Frecuencia', 'Porcentaje (%)']).head())
+    # Guardar las métricas en formato JSON
+    metrics_path = METRICS_PATH
+    Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
 
-# --- Generar Métricas para DVC ---
-metrics = {
-    "total_estudiantes": len(df),
-    "consideraron_abandonar": int(df['abandono_considerado'].value_counts().get('Sí', 0)),
-    "porcentaje_abandono": float(considero_perc.get('Sí', 0)),
-    "count_licenciaturas": int(len(df['licenciatura'].unique())),
-    "licenciatura_mayoritaria": str(df['licenciatura'].value_counts().index[0]),
-    "frecuencia_abandono_promedio": float(df['frecuencia_abandono'].mean()),
-    "frecuencia_abandono_mediana": float(df['frecuencia_abandono'].median()),
-    "total_respustas_desafios": int(len(desafios)),
-    "desafio_mas_comun": str(desafios_counts.index[0]),
-    "desafios_unicos": int(desafios_counts.nunique())
-}
+    print(f"\nMétricas guardadas en: {metrics_path}")
+    print(f"Análisis completado con {len(df)} estudiantes.")
+    return metrics
 
-# Guardar las métricas en formato JSON
-metrics_path = METRICS_PATH
-Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
-with open(metrics_path, 'w') as f:
-    json.dump(metrics, f, indent=2)
 
-print(f"\nMétricas guardadas en: {metrics_path}")
-print(f"Análisis completado con {len(df)} estudiantes.")
+if __name__ == "__main__":
+    # --- Carga de Datos ---
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except Exception as e:
+        print(f"Error al cargar o procesar el archivo: {e}")
+        exit()
+    main(df)
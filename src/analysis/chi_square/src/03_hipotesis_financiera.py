@@ -1,11 +1,13 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy.stats import chi2_contingency
 import os
 import json
 from pathlib import Path
 
+from dataset_encuesta import cargar_datos
+from figuras import figura_barras, renderizar_figuras, imprimir_estado
+from pvalor_montecarlo import pvalor_montecarlo
+
 # --- Configuración de Rutas ---
 # Determinar si estamos ejecutando desde el directorio raíz o desde analisis_chi_cuadrado/src
 if os.path.basename(os.getcwd()) == 'src':
@@ -20,15 +22,8 @@ else:
     METRICS_PATH = os.path.join("metrics", "hipotesis2.json")
 os.makedirs(RESULTS_PATH, exist_ok=True)
 
-# --- Cargar Datos ---
-try:
-    df = pd.read_csv(PROCESSED_DATA_PATH)
-except FileNotFoundError:
-    print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
-    exit()
-
 # --- Función para Análisis y Visualización ---
-def analizar_y_visualizar(dataframe, variable_independiente, titulo, nombre_archivo):
+def analizar_y_visualizar(dataframe, variable_independiente, titulo, nombre_archivo, figuras):
     print(f"\n--- Análisis: {titulo} ---")
     
     # Para almacenar resultados de métricas
@@ -47,6 +42,11 @@ def analizar_y_visualizar(dataframe, variable_independiente, titulo, nombre_arch
     chi2, p, dof, expected = chi2_contingency(contingency_table)
     print(f"\nEstadístico Chi-Cuadrado: {chi2:.4f}")
     print(f"P-valor: {p:.4f}")
+    # p-valor Monte Carlo (márgenes fijos): con frecuencias esperadas < 5 el asintótico no es confiable
+    montecarlo = pvalor_montecarlo(contingency_table)
+    print(f"P-valor Monte Carlo: {montecarlo['p_value']:.4f} "
+          f"(IC 95%: {montecarlo['ci95'][0]:.4f}-{montecarlo['ci95'][1]:.4f}, "
+          f"{montecarlo['simulations']} simulaciones; frecuencia esperada mínima {expected.min():.2f})")
 
     # Interpretación
     alpha = 0.05
@@ -62,6 +62,10 @@ def analizar_y_visualizar(dataframe, variable_independiente, titulo, nombre_arch
         "chi2_statistic": float(chi2),
         "p_value": float(p),
         "degrees_freedom": int(dof),
+        "p_value_montecarlo": montecarlo['p_value'],
+        "p_value_montecarlo_ci95": montecarlo['ci95'],
+        "montecarlo_simulations": montecarlo['simulations'],
+        "min_expected_count": float(expected.min()),
         "significance": significance,
         "alpha_level": float(alpha),
         "contingency_table_shape": list(contingency_table.shape),
@@ -76,49 +80,57 @@ def analizar_y_visualizar(dataframe, variable_independiente, titulo, nombre_arch
         resultados[variable_independiente]['max_abandono_rate'] = float(ct_percent['Sí'].max())
         resultados[variable_independiente]['min_abandono_rate'] = float(ct_percent['Sí'].min())
     
-    plt.style.use('seaborn-v0_8-whitegrid')
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ct_percent.plot(kind='bar', ax=ax, color=['#2ca02c', '#d62728'], width=0.7)
-
-    for container in ax.containers:
-        ax.bar_label(container, fmt='%.1f%%', label_type='center', color='white', fontsize=10, fontweight='bold')
-
-    ax.set_title(f'{titulo}\n(p={p:.3f})', fontsize=14, fontweight='bold')
-    ax.set_xlabel(variable_independiente.replace('_', ' ').title(), fontsize=12)
-    ax.set_ylabel('Porcentaje de Estudiantes (%)', fontsize=12)
-    ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
-    ax.legend(title='¿Consideró Abandonar?')
-    ax.set_ylim(0, 100)
-    
-    plt.tight_layout()
-    output_path = os.path.join(RESULTS_PATH, nombre_archivo)
-    plt.savefig(output_path)
-    print(f"Gráfico guardado en: {output_path}")
-    
+    # La figura se dibuja al final de main, junto con las demás
+    figuras.append(figura_barras(
+        ct_percent, os.path.join(RESULTS_PATH, nombre_archivo),
+        titulo=f'{titulo}\n(p={p:.3f})',
+        eje_x=variable_independiente.replace('_', ' ').title(),
+        titulo_fontsize=14,
+        ancho=0.7,
+        figsize=(10, 6),
+    ))
+
     return resultados
 
-# --- Hipótesis 2a: Beca vs. Abandono ---
-resultados_beca = analizar_y_visualizar(df, 'beca_actual', 'Intención de Abandono según Tenencia de Beca', 'hipotesis_2a_beca_vs_abandono.png')
-
-# --- Hipótesis 2b: Desafío Económico vs. Abandono ---
-# Crear variable derivada 'desafio_economico'
-df['desafio_economico'] = df['desafios_no_academicos'].str.contains('económicas|trabajo', case=False, na=False).map({True: 'Sí', False: 'No'})
-resultados_economico = analizar_y_visualizar(df, 'desafio_economico', 'Intención de Abandono por Desafíos Económicos', 'hipotesis_2b_economia_vs_abandono.png')
-
-# --- Generar Métricas para DVC ---
-metrics = {
-    "sample_size": int(len(df)),
-    "beca_actual": resultados_beca.get('beca_actual', {}),
-    "desafio_economico": resultados_economico.get('desafio_economico', {}),
-    "con_beca": int(df['beca_actual'].eq('Sí').sum()),
-    "sin_beca": int(df['beca_actual'].eq('No').sum()),
-    "con_desafio_economico": int(df['desafio_economico'].eq('Sí').sum())
-}
-
-# Guardar las métricas en formato JSON
-metrics_path = METRICS_PATH
-Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
-with open(metrics_path, 'w') as f:
-    json.dump(metrics, f, indent=2)
-
-print(f"\nMétricas guardadas en: {metrics_path}")
\ No newline at end of file
+
+def main(df):
+    figuras = []
+
+    # --- Hipótesis 2a: Beca vs. Abandono ---
+    resultados_beca = analizar_y_visualizar(df, 'beca_actual', 'Intención de Abandono según Tenencia de Beca', 'hipotesis_2a_beca_vs_abandono.png', figuras)
+
+    # --- Hipótesis 2b: Desafío Económico vs. Abandono ---
+    # Variable derivada 'desafio_economico' (construida en dataset_encuesta)
+    resultados_economico = analizar_y_visualizar(df, 'desafio_economico', 'Intención de Abandono por Desafíos Económicos', 'hipotesis_2b_economia_vs_abandono.png', figuras)
+
+    # Ambas figuras en paralelo (solo las que cambiaron)
+    imprimir_estado(renderizar_figuras(figuras))
+
+    # --- Generar Métricas para DVC ---
+    metrics = {
+        "sample_size": int(len(df)),
+        "beca_actual": resultados_beca.get('beca_actual', {}),
+        "desafio_economico": resultados_economico.get('desafio_economico', {}),
+        "con_beca": int(df['beca_actual'].eq('Sí').sum()),
+        "sin_beca": int(df['beca_actual'].eq('No').sum()),
+        "con_desafio_economico": int(df['desafio_economico'].eq('Sí').sum())
+    }
+
+    # Guardar las métricas en formato JSON
+    metrics_path = METRICS_PATH
+    Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+    print(f"\nMétricas guardadas en: {metrics_path}")
+    return metrics
+
+
+if __name__ == "__main__":
+    # --- Cargar Datos ---
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
+        exit()
+    main(df)
@@ -1,11 +1,12 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import kruskal, mannwhitneyu
 import os
 import json
 from pathlib import Path
 
+from dataset_encuesta import cargar_datos
+from figuras import figura_cajas, renderizar_figuras, imprimir_estado
+from pruebas_rangos import pruebas_por_grupos
+
 # --- Configuración de Rutas ---
 # Determinar si estamos ejecutando desde el directorio raíz o desde analisis_chi_cuadrado/src
 if os.path.basename(os.getcwd()) == 'src':
@@ -20,136 +21,109 @@ else:
     METRICS_PATH = os.path.join("metrics", "ordinal.json")
 os.makedirs(RESULTS_PATH, exist_ok=True)
 
-# --- Cargar Datos ---
-try:
-    df = pd.read_csv(PROCESSED_DATA_PATH)
-except FileNotFoundError:
-    print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
-    exit()
-
-# --- Preprocesamiento para el análisis ordinal ---
-# 1. Derivar 'desafio_economico' (necesario para H2b)
-df['desafio_economico'] = df['desafios_no_academicos'].str.contains('económicas|trabajo', case=False, na=False).map({True: 'Sí', False: 'No'})
-
-# 2. Limpiar categorías de rendimiento y expectativas para el análisis ordinal
-rendimiento_map = {
-    'Aprobé todas o casi todas las materias que cursé': 'Alto Rendimiento',
-    'Aprobé aproximadamente la mitad de las materias': 'Medio Rendimiento',
-    'Reprobé más de la mitad de las materias que cursé': 'Bajo Rendimiento'
-}
-df['rendimiento_ordinal'] = df['rendimiento_semestre_pasado'].map(rendimiento_map)
+ALPHA = 0.05
 
-expectativas_map = {
-    'Sí, totalmente': 'Satisfecho',
-    'Parcialmente, tengo algunas dudas': 'Parcialmente Satisfecho',
-    'No, o casi no': 'Insatisfecho'
-}
-df['expectativas_ordinal'] = df['expectativas_carrera'].map(expectativas_map)
+# --- Función para Análisis y Visualización (Boxplots) ---
+def analizar_y_visualizar_ordinal(dataframe, variable_independiente, prueba, titulo, nombre_archivo, figuras):
+    """Reporta una fila de `pruebas_por_grupos` y agrega su boxplot a `figuras`."""
+    print(f"\n--- Análisis: {titulo} ---")
+    grupos_a_comparar = prueba['grupos']
 
+    if prueba['n_grupos'] < 2:
+        print("No hay suficientes grupos para comparar.")
+        return {"error": "No hay suficientes grupos para comparar"}
 
-print("--- Análisis de Frecuencia de Pensamientos (Ordinal) ---")
+    stat, p = prueba['estadistico'], prueba['p_value']
+    print(f"Estadístico {prueba['prueba_nombre']}: {stat:.4f}")
+    print(f"P-valor: {p:.4f}")
 
-# --- Función para Análisis y Visualización (Boxplots) ---
-def analizar_y_visualizar_ordinal(dataframe, variable_independiente, grupos_a_comparar, prueba_func, titulo, nombre_archivo):
-    print(f"\n--- Análisis: {titulo} ---")
-    resultados = {}
-    
-    # Filtrar para asegurar que solo tenemos las categorías relevantes
-    df_filtrado = dataframe.dropna(subset=[variable_independiente, grupos_a_comparar])
-    
-    # Preparar datos para la prueba estadística
-    grupos_data = [df_filtrado[df_filtrado[grupos_a_comparar] == grupo][variable_independiente] 
-                   for grupo in set(df_filtrado[grupos_a_comparar])]
-    
-    # Ejecutar prueba
-    if len(grupos_data) >= 2:
-        if prueba_func == kruskal:
-            stat, p = prueba_func(*grupos_data)
-            prueba_nombre = "Kruskal-Wallis H"
-        elif prueba_func == mannwhitneyu:
-            # Mann-Whitney U solo acepta dos muestras, se usa para beca (2 grupos)
-            if len(grupos_data) == 2:
-                stat, p = prueba_func(grupos_data[0], grupos_data[1])
-                prueba_nombre = "Mann-Whitney U"
-            else:
-                print(f"Error: Mann-Whitney U requiere exactamente 2 grupos, se encontraron {len(grupos_data)}.")
-                return
-        else:
-            print(f"Prueba no soportada: {prueba_func.__name__}")
-            return
-
-        print(f"Estadístico {prueba_nombre}: {stat:.4f}")
-        print(f"P-valor: {p:.4f}")
-
-        # Interpretación
-        alpha = 0.05
-        significance = p < alpha
-        if p < alpha:
-            print("Resultado: La diferencia en la frecuencia de pensamientos es estadísticamente significativa.")
-        else:
-            print("Resultado: No hay diferencia significativa en la frecuencia de pensamientos.")
-        
-        # Almacenar resultados
-        resultados = {
-            "prueba_nombre": prueba_nombre,
-            "estadistico": float(stat),
-            "p_value": float(p),
-            "significance": bool(significance),
-            "alpha_level": float(alpha),
-            "grupo_etiquetas": list(set(df_filtrado[grupos_a_comparar])),
-            "output_graph_path": str(os.path.join(RESULTS_PATH, nombre_archivo))
-        }
-
-        # Visualización (Boxplots)
-        plt.style.use('seaborn-v0_8-whitegrid')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.boxplot(x=grupos_a_comparar, y=variable_independiente, data=df_filtrado, ax=ax, palette="viridis")
-        
-        ax.set_title(f'{titulo} (p={p:.3f})', fontsize=14, fontweight='bold')
-        ax.set_xlabel(grupos_a_comparar.replace('_', ' ').title(), fontsize=12)
-        ax.set_ylabel('Frecuencia de Pensamientos de Abandono (1-5)', fontsize=12)
-        
-        plt.tight_layout()
-        output_path = os.path.join(RESULTS_PATH, nombre_archivo)
-        plt.savefig(output_path)
-        print(f"Gráfico guardado en: {output_path}")
+    # Interpretación
+    alpha = ALPHA
+    if p < alpha:
+        print("Resultado: La diferencia en la frecuencia de pensamientos es estadísticamente significativa.")
     else:
-        print("No hay suficientes grupos para comparar.")
-        resultados = {"error": "No hay suficientes grupos para comparar"}
-    
+        print("Resultado: No hay diferencia significativa en la frecuencia de pensamientos.")
+
+    # Almacenar resultados
+    resultados = {
+        "prueba_nombre": prueba['prueba_nombre'],
+        "estadistico": float(stat),
+        "p_value": float(p),
+        "significance": bool(prueba['significance']),
+        "alpha_level": float(alpha),
+        "grupo_etiquetas": prueba['grupo_etiquetas'],
+        "output_graph_path": str(os.path.join(RESULTS_PATH, nombre_archivo))
+    }
+
+    # Visualización (Boxplots): se dibuja al final de main, junto con las demás
+    df_filtrado = dataframe.dropna(subset=[variable_independiente, grupos_a_comparar])
+    figuras.append(figura_cajas(
+        df_filtrado, grupos_a_comparar, variable_independiente,
+        os.path.join(RESULTS_PATH, nombre_archivo),
+        titulo=f'{titulo} (p={p:.3f})',
+        eje_x=grupos_a_comparar.replace('_', ' ').title(),
+        eje_y='Frecuencia de Pensamientos de Abandono (1-5)',
+    ))
+
     return resultados
 
 
-# 5a. Frecuencia vs. Rendimiento (Ordinal) -> Kruskal-Wallis
-resultados_rendimiento = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', 'rendimiento_ordinal', kruskal, 
-                              "Frecuencia de Pensamientos vs. Rendimiento Académico", 
-                              "ordinal_rendimiento_vs_frecuencia.png")
-
-# 5b. Frecuencia vs. Beca (Binario) -> Mann-Whitney U
-resultados_beca = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', 'beca_actual', mannwhitneyu, 
-                              "Frecuencia de Pensamientos vs. Tenencia de Beca", 
-                              "ordinal_beca_vs_frecuencia.png")
-
-# 5c. Frecuencia vs. Expectativas (Ordinal) -> Kruskal-Wallis
-resultados_expectativas = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', 'expectativas_ordinal', kruskal, 
-                              "Frecuencia de Pensamientos vs. Expectativas de Carrera", 
-                              "ordinal_expectativas_vs_frecuencia.png")
-
-# --- Generar Métricas para DVC ---
-metrics = {
-    "sample_size": int(len(df)),
-    "rendimiento": resultados_rendimiento,
-    "beca": resultados_beca,
-    "expectativas": resultados_expectativas,
-    "pruebas_realizadas": 3,
-    "frecuencia_promedio": float(df['frecuencia_abandono'].mean()),
-    "frecuencia_mediana": float(df['frecuencia_abandono'].median())
-}
-
-# Guardar las métricas en formato JSON
-metrics_path = METRICS_PATH
-Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
-with open(metrics_path, 'w') as f:
-    json.dump(metrics, f, indent=2)
-
-print(f"\nMétricas guardadas en: {metrics_path}")
+def main(df):
+    # 'desafio_economico', 'rendimiento_ordinal' y 'expectativas_ordinal' vienen
+    # construidas (y tipadas como categóricas) desde dataset_encuesta.
+    print("--- Análisis de Frecuencia de Pensamientos (Ordinal) ---")
+    figuras = []
+
+    # Las tres pruebas con una sola ordenación de la frecuencia: Kruskal-Wallis
+    # para rendimiento y expectativas, Mann-Whitney U para beca (2 grupos)
+    pruebas = pruebas_por_grupos(
+        df, 'frecuencia_abandono', ['rendimiento_ordinal', 'beca_actual', 'expectativas_ordinal'],
+        alpha=ALPHA).set_index('grupos', drop=False)
+
+    # 5a. Frecuencia vs. Rendimiento (Ordinal) -> Kruskal-Wallis
+    resultados_rendimiento = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', pruebas.loc['rendimiento_ordinal'], 
+                                  "Frecuencia de Pensamientos vs. Rendimiento Académico", 
+                                  "ordinal_rendimiento_vs_frecuencia.png", figuras)
+
+    # 5b. Frecuencia vs. Beca (Binario) -> Mann-Whitney U
+    resultados_beca = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', pruebas.loc['beca_actual'], 
+                                  "Frecuencia de Pensamientos vs. Tenencia de Beca", 
+                                  "ordinal_beca_vs_frecuencia.png", figuras)
+
+    # 5c. Frecuencia vs. Expectativas (Ordinal) -> Kruskal-Wallis
+    resultados_expectativas = analizar_y_visualizar_ordinal(df, 'frecuencia_abandono', pruebas.loc['expectativas_ordinal'], 
+                                  "Frecuencia de Pensamientos vs. Expectativas de Carrera", 
+                                  "ordinal_expectativas_vs_frecuencia.png", figuras)
+
+    # Boxplots en paralelo (solo los que cambiaron)
+    imprimir_estado(renderizar_figuras(figuras))
+
+    # --- Generar Métricas para DVC ---
+    metrics = {
+        "sample_size": int(len(df)),
+        "rendimiento": resultados_rendimiento,
+        "beca": resultados_beca,
+        "expectativas": resultados_expectativas,
+        "pruebas_realizadas": 3,
+        "frecuencia_promedio": float(df['frecuencia_abandono'].mean()),
+        "frecuencia_mediana": float(df['frecuencia_abandono'].median())
+    }
+
+    # Guardar las métricas en formato JSON
+    metrics_path = METRICS_PATH
+    Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+    print(f"\nMétricas guardadas en: {metrics_path}")
+    return metrics
+
+
+if __name__ == "__main__":
+    # --- Cargar Datos ---
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
+        exit()
+    main(df)
@@ -1,10 +1,14 @@
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
-from scipy.stats import chi2_contingency, kruskal, mannwhitneyu
+from scipy.stats import chi2_contingency
 import json
 from pathlib import Path
 
+from dataset_encuesta import cargar_datos
+from intervalos_bootstrap import intervalos_porcentajes, intervalos_a_dict, filas_wilson
+from pruebas_rangos import pruebas_por_grupos
+
 # --- Configuración de Rutas ---
 # Determinar si estamos ejecutando desde el directorio raíz o desde analisis_chi_cuadrado/src
 if os.path.basename(os.getcwd()) == 'src':
@@ -18,14 +22,9 @@ else:
     RESULTS_PATH = os.path.join("results")
     METRICS_PATH = os.path.join("metrics", "resumen.json")
 
-# --- Cargar Datos ---
-try:
-    df = pd.read_csv(PROCESSED_DATA_PATH)
-except FileNotFoundError:
-    print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
-    exit()
+# Intervalos bootstrap de los porcentajes (percentil, 95%)
+N_REMUESTRAS_BOOTSTRAP = 5000
 
-# --- Funciones de Cálculo ---
 
 def get_chi2_pvalue(df, var_independiente, var_dependiente='abandono_considerado'):
     """Calcula el p-valor de Chi-Cuadrado para dos variables categóricas."""
@@ -35,139 +34,157 @@ def get_chi2_pvalue(df, var_independiente, var_dependiente='abandono_considerado
     _, p, _, _ = chi2_contingency(contingency_table)
     return p
 
-def get_kruskal_pvalue(df, var_ordinal, var_grupos):
-    """Calcula el p-valor de Kruskal-Wallis para una variable ordinal y grupos."""
-    grupos_data = [df[df[var_grupos] == grupo][var_ordinal].dropna()
-                   for grupo in df[var_grupos].unique()]
-    # Filtrar grupos vacíos
-    grupos_data = [g for g in grupos_data if not g.empty]
-    
-    if len(grupos_data) < 2:
-        return float('nan')
-    
-    # Usar Mann-Whitney U si solo hay dos grupos, Kruskal si hay más
-    if len(grupos_data) == 2:
-        _, p = mannwhitneyu(grupos_data[0], grupos_data[1])
-    else:
-        _, p = kruskal(*grupos_data)
-    return p
 
-# --- Mapeos de Categorías ---
-
-rendimiento_map = {
-    'Aprobé todas o casi todas las materias que cursé': 'Alto Rendimiento',
-    'Aprobé aproximadamente la mitad de las materias': 'Medio Rendimiento',
-    'Reprobé más de la mitad de las materias que cursé': 'Bajo Rendimiento'
-}
-df['rendimiento_ordinal'] = df['rendimiento_semestre_pasado'].map(rendimiento_map)
-
-expectativas_map = {
-    'Sí, totalmente': 'Satisfecho',
-    'Parcialmente, tengo algunas dudas': 'Parcialmente Satisfecho',
-    'No, o casi no': 'Insatisfecho'
-}
-df['expectativas_ordinal'] = df['expectativas_carrera'].map(expectativas_map)
-
-df['desafio_economico'] = df['desafios_no_academicos'].str.contains('económicas|trabajo', case=False, na=False).map({True: 'Sí', False: 'No'})
-
-
-print("--- Resumen Final y Tablas de Contingencia (Porcentajes Fila-por-Fila) ---")
-
-# --- 1. Tablas de Contingencia con P-valores Dinámicos ---
-
-# H1: Rendimiento vs Abandono
-p_h1 = get_chi2_pvalue(df, 'rendimiento_semestre_pasado')
-ct_h1 = pd.crosstab(df['rendimiento_ordinal'], df['abandono_considerado'], normalize='index') * 100
-print("\nTabla H1: Rendimiento vs. Abandono (%)")
-print(ct_h1.round(1))
-print(f"P-valor H1: {p_h1:.3f}")
-
-# H2a: Beca vs Abandono
-p_h2a = get_chi2_pvalue(df, 'beca_actual')
-ct_h2a = pd.crosstab(df['beca_actual'], df['abandono_considerado'], normalize='index') * 100
-print("\nTabla H2a: Beca vs. Abandono (%)")
-print(ct_h2a.round(1))
-print(f"P-valor H2a: {p_h2a:.3f}")
-
-# H2b: Desafío Económico vs Abandono
-p_h2b = get_chi2_pvalue(df, 'desafio_economico')
-ct_h2b = pd.crosstab(df['desafio_economico'], df['abandono_considerado'], normalize='index') * 100
-print("\nTabla H2b: Desafío Económico vs. Abandono (%)")
-print(ct_h2b.round(1))
-print(f"P-valor H2b: {p_h2b:.3f}")
-
-# H3: Expectativas vs Abandono
-p_h3 = get_chi2_pvalue(df, 'expectativas_carrera')
-ct_h3 = pd.crosstab(df['expectativas_ordinal'], df['abandono_considerado'], normalize='index') * 100
-print("\nTabla H3: Expectativas vs. Abandono (%)")
-print(ct_h3.round(1))
-print(f"P-valor H3: {p_h3:.3f}")
-
-
-# --- 2. Resumen de Insights para el Informe (Ordinal) ---
-
-p_ord_rendimiento = get_kruskal_pvalue(df, 'frecuencia_abandono', 'rendimiento_ordinal')
-p_ord_expectativas = get_kruskal_pvalue(df, 'frecuencia_abandono', 'expectativas_ordinal')
-p_ord_beca = get_kruskal_pvalue(df, 'frecuencia_abandono', 'beca_actual') # Usará Mann-Whitney internamente
-
-print("\n=====================================================")
-print("INSIGHTS CLAVE PARA EL INFORME (Validación Hipotética)")
-print("=====================================================")
-
-print("\n[Insight 1: Rendimiento Académico (Factor Predictivo Fuerte)]")
-print(f"El rendimiento pasado está significativamente asociado con la intención de abandono (Chi-Cuadrado p={p_h1:.3f}).")
-print(f"Estudiantes con 'Bajo Rendimiento' tienen {ct_h1.loc['Bajo Rendimiento', 'Sí']:.1f}% de intención de abandono, mientras que los de 'Alto Rendimiento' tienen {ct_h1.loc['Alto Rendimiento', 'Sí']:.1f}%.")
-print("Recomendación: SAREP debe priorizar alertas tempranas basadas en calificaciones.")
-
-print("\n[Insight 2: Expectativas de Carrera (Factor Predictivo Moderado)]")
-print(f"Existe una tendencia significativa (Chi-Cuadrado p={p_h3:.3f}) donde la insatisfacción aumenta la intención de abandono.")
-print(f"Estudiantes 'Insatisfechos' tienen {ct_h3.loc['Insatisfecho', 'Sí']:.1f}% de intención de abandono, mientras que los 'Satisfechos' tienen {ct_h3.loc['Satisfecho', 'Sí']:.1f}%.")
-print("Recomendación: Intervenciones vocacionales tempranas son cruciales.")
-
-print("\n[Insight 3: Factores Financieros (No Significativos en esta muestra)]")
-print(f"Ni la tenencia de beca (p={p_h2a:.3f}) ni la mención explícita de desafíos económicos (p={p_h2b:.3f}) mostraron una asociación estadísticamente significativa con la intención de abandono.")
-print("Recomendación: Si bien son importantes, no son los predictores más fuertes en este modelo binario.")
-
-print("\n[Insight 4: Intensidad del Pensamiento (Ordinal)]")
-print(f"La intensidad de los pensamientos de abandono (1-5) se correlaciona significativamente con el Rendimiento (Kruskal p={p_ord_rendimiento:.3f}) y las Expectativas (Kruskal p={p_ord_expectativas:.3f}), pero no con la Beca (Mann-Whitney p={p_ord_beca:.3f}).")
-print("Esto sugiere que el rendimiento y la satisfacción afectan la *frecuencia* del pensamiento, no solo la decisión binaria.")
-
-# --- Generar Métricas para DVC ---
-metrics = {
-    "summary": {
-        "total_estudiantes": int(len(df)),
-        "hipotesis_rendimiento_sig": bool(p_h1 < 0.05),
-        "hipotesis_beca_sig": bool(p_h2a < 0.05),
-        "hipotesis_economia_sig": bool(p_h2b < 0.05),
-        "hipotesis_expectativas_sig": bool(p_h3 < 0.05),
-        "ordinal_rendimiento_sig": bool(p_ord_rendimiento < 0.05),
-        "ordinal_expectativas_sig": bool(p_ord_expectativas < 0.05),
-        "ordinal_beca_sig": bool(p_ord_beca < 0.05)
-    },
-    "tablas_resumen": {
-        "h1_tabla": ct_h1.round(1).to_dict(),
-        "h1_pvalor": float(p_h1),
-        "h2a_tabla": ct_h2a.round(1).to_dict(),
-        "h2a_pvalor": float(p_h2a),
-        "h2b_tabla": ct_h2b.round(1).to_dict(),
-        "h2b_pvalor": float(p_h2b),
-        "h3_tabla": ct_h3.round(1).to_dict(),
-        "h3_pvalor": float(p_h3)
-    },
-    "insights_generados": 4
-}
-
-# Guardar las métricas en formato JSON
-metrics_path = METRICS_PATH
-Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
-with open(metrics_path, 'w') as f:
-    json.dump(metrics, f, indent=2)
-
-print(f"\nMétricas guardadas en: {metrics_path}")
-
-# --- Referencias a gráficos generados en scripts anteriores ---
-# Para el informe, se recomienda usar los gráficos generados en:
-# - H1: hipotesis_1_rendimiento_vs_abandono.png
-# - H2: hipotesis_2a_beca_vs_abandono.png y hipotesis_2b_economia_vs_abandono.png
-# - H3: hipotesis_3_expectativas_vs_abandono.png
-# - Ordinal: ordinal_rendimiento_vs_frecuencia.png y ordinal_expectativas_vs_frecuencia.png
+def formatear_intervalos(inferior, superior):
+    """
+    Tabla de texto con '[inferior, superior]' por celda, redondeado a 1 decimal,
+    y una nota con las filas que usan el intervalo de Wilson.
+    """
+    tabla = (inferior.round(1).astype(str).radd('[') + ', ' + superior.round(1).astype(str) + ']').to_string()
+    wilson = filas_wilson(inferior)
+    if wilson:
+        tabla += f"\n* Wilson (n pequeño o proporción de 0/100%): {', '.join(wilson)}"
+    return tabla
+
+
+def main(df):
+    # --- Funciones de Cálculo ---
+
+    # --- Mapeos de Categorías ---
+    # 'rendimiento_ordinal', 'expectativas_ordinal' y 'desafio_economico' vienen
+    # construidas desde dataset_encuesta.
+
+    print("--- Resumen Final y Tablas de Contingencia (Porcentajes Fila-por-Fila) ---")
+
+    # --- 1. Tablas de Contingencia con P-valores Dinámicos ---
+
+    # H1: Rendimiento vs Abandono
+    p_h1 = get_chi2_pvalue(df, 'rendimiento_semestre_pasado')
+    ct_h1 = pd.crosstab(df['rendimiento_ordinal'], df['abandono_considerado'], normalize='index') * 100
+    print("\nTabla H1: Rendimiento vs. Abandono (%)")
+    print(ct_h1.round(1))
+    ic_h1 = intervalos_porcentajes(df, 'rendimiento_ordinal', 'abandono_considerado', n_remuestras=N_REMUESTRAS_BOOTSTRAP)
+    print("IC 95% bootstrap H1 (%):")
+    print(formatear_intervalos(*ic_h1))
+    print(f"P-valor H1: {p_h1:.3f}")
+
+    # H2a: Beca vs Abandono
+    p_h2a = get_chi2_pvalue(df, 'beca_actual')
+    ct_h2a = pd.crosstab(df['beca_actual'], df['abandono_considerado'], normalize='index') * 100
+    print("\nTabla H2a: Beca vs. Abandono (%)")
+    print(ct_h2a.round(1))
+    ic_h2a = intervalos_porcentajes(df, 'beca_actual', 'abandono_considerado', n_remuestras=N_REMUESTRAS_BOOTSTRAP)
+    print("IC 95% bootstrap H2a (%):")
+    print(formatear_intervalos(*ic_h2a))
+    print(f"P-valor H2a: {p_h2a:.3f}")
+
+    # H2b: Desafío Económico vs Abandono
+    p_h2b = get_chi2_pvalue(df, 'desafio_economico')
+    ct_h2b = pd.crosstab(df['desafio_economico'], df['abandono_considerado'], normalize='index') * 100
+    print("\nTabla H2b: Desafío Económico vs. Abandono (%)")
+    print(ct_h2b.round(1))
+    ic_h2b = intervalos_porcentajes(df, 'desafio_economico', 'abandono_considerado', n_remuestras=N_REMUESTRAS_BOOTSTRAP)
+    print("IC 95% bootstrap H2b (%):")
+    print(formatear_intervalos(*ic_h2b))
+    print(f"P-valor H2b: {p_h2b:.3f}")
+
+    # H3: Expectativas vs Abandono
+    p_h3 = get_chi2_pvalue(df, 'expectativas_carrera')
+    ct_h3 = pd.crosstab(df['expectativas_ordinal'], df['abandono_considerado'], normalize='index') * 100
+    print("\nTabla H3: Expectativas vs. Abandono (%)")
+    print(ct_h3.round(1))
+    ic_h3 = intervalos_porcentajes(df, 'expectativas_ordinal', 'abandono_considerado', n_remuestras=N_REMUESTRAS_BOOTSTRAP)
+    print("IC 95% bootstrap H3 (%):")
+    print(formatear_intervalos(*ic_h3))
+    print(f"P-valor H3: {p_h3:.3f}")
+
+    # --- 2. Resumen de Insights para el Informe (Ordinal) ---
+
+    # Kruskal-Wallis (Mann-Whitney U con 2 grupos) con una sola ordenación de la frecuencia
+    p_ordinales = pruebas_por_grupos(
+        df, 'frecuencia_abandono', ['rendimiento_ordinal', 'expectativas_ordinal', 'beca_actual']
+    ).set_index('grupos')['p_value']
+    p_ord_rendimiento = p_ordinales['rendimiento_ordinal']
+    p_ord_expectativas = p_ordinales['expectativas_ordinal']
+    p_ord_beca = p_ordinales['beca_actual']
+
+    print("\n=====================================================")
+    print("INSIGHTS CLAVE PARA EL INFORME (Validación Hipotética)")
+    print("=====================================================")
+
+    print("\n[Insight 1: Rendimiento Académico (Factor Predictivo Fuerte)]")
+    print(f"El rendimiento pasado está significativamente asociado con la intención de abandono (Chi-Cuadrado p={p_h1:.3f}).")
+    print(f"Estudiantes con 'Bajo Rendimiento' tienen {ct_h1.loc['Bajo Rendimiento', 'Sí']:.1f}% de intención de abandono (IC 95%: {ic_h1[0].loc['Bajo Rendimiento', 'Sí']:.1f}-{ic_h1[1].loc['Bajo Rendimiento', 'Sí']:.1f}%), mientras que los de 'Alto Rendimiento' tienen {ct_h1.loc['Alto Rendimiento', 'Sí']:.1f}% (IC 95%: {ic_h1[0].loc['Alto Rendimiento', 'Sí']:.1f}-{ic_h1[1].loc['Alto Rendimiento', 'Sí']:.1f}%).")
+    print("Recomendación: SAREP debe priorizar alertas tempranas basadas en calificaciones.")
+
+    print("\n[Insight 2: Expectativas de Carrera (Factor Predictivo Moderado)]")
+    print(f"Existe una tendencia significativa (Chi-Cuadrado p={p_h3:.3f}) donde la insatisfacción aumenta la intención de abandono.")
+    print(f"Estudiantes 'Insatisfechos' tienen {ct_h3.loc['Insatisfecho', 'Sí']:.1f}% de intención de abandono (IC 95%: {ic_h3[0].loc['Insatisfecho', 'Sí']:.1f}-{ic_h3[1].loc['Insatisfecho', 'Sí']:.1f}%), mientras que los 'Satisfechos' tienen {ct_h3.loc['Satisfecho', 'Sí']:.1f}% (IC 95%: {ic_h3[0].loc['Satisfecho', 'Sí']:.1f}-{ic_h3[1].loc['Satisfecho', 'Sí']:.1f}%).")
+    print("Recomendación: Intervenciones vocacionales tempranas son cruciales.")
+
+    print("\n[Insight 3: Factores Financieros (No Significativos en esta muestra)]")
+    print(f"Ni la tenencia de beca (p={p_h2a:.3f}) ni la mención explícita de desafíos económicos (p={p_h2b:.3f}) mostraron una asociación estadísticamente significativa con la intención de abandono.")
+    print("Recomendación: Si bien son importantes, no son los predictores más fuertes en este modelo binario.")
+
+    print("\n[Insight 4: Intensidad del Pensamiento (Ordinal)]")
+    print(f"La intensidad de los pensamientos de abandono (1-5) se correlaciona significativamente con el Rendimiento (Kruskal p={p_ord_rendimiento:.3f}) y las Expectativas (Kruskal p={p_ord_expectativas:.3f}), pero no con la Beca (Mann-Whitney p={p_ord_beca:.3f}).")
+    print("Esto sugiere que el rendimiento y la satisfacción afectan la *frecuencia* del pensamiento, no solo la decisión binaria.")
+
+    # --- Generar Métricas para DVC ---
+    metrics = {
+        "summary": {
+            "total_estudiantes": int(len(df)),
+            "hipotesis_rendimiento_sig": bool(p_h1 < 0.05),
+            "hipotesis_beca_sig": bool(p_h2a < 0.05),
+            "hipotesis_economia_sig": bool(p_h2b < 0.05),
+            "hipotesis_expectativas_sig": bool(p_h3 < 0.05),
+            "ordinal_rendimiento_sig": bool(p_ord_rendimiento < 0.05),
+            "ordinal_expectativas_sig": bool(p_ord_expectativas < 0.05),
+            "ordinal_beca_sig": bool(p_ord_beca < 0.05)
+        },
+        "tablas_resumen": {
+            "h1_tabla": ct_h1.round(1).to_dict(),
+            "h1_ic95": intervalos_a_dict(*ic_h1),
+            "h1_ic95_wilson": filas_wilson(ic_h1[0]),
+            "h1_pvalor": float(p_h1),
+            "h2a_tabla": ct_h2a.round(1).to_dict(),
+            "h2a_ic95": intervalos_a_dict(*ic_h2a),
+            "h2a_ic95_wilson": filas_wilson(ic_h2a[0]),
+            "h2a_pvalor": float(p_h2a),
+            "h2b_tabla": ct_h2b.round(1).to_dict(),
+            "h2b_ic95": intervalos_a_dict(*ic_h2b),
+            "h2b_ic95_wilson": filas_wilson(ic_h2b[0]),
+            "h2b_pvalor": float(p_h2b),
+            "h3_tabla": ct_h3.round(1).to_dict(),
+            "h3_ic95": intervalos_a_dict(*ic_h3),
+            "h3_ic95_wilson": filas_wilson(ic_h3[0]),
+            "h3_pvalor": float(p_h3)
+        },
+        "insights_generados": 4
+    }
+
+    # Guardar las métricas en formato JSON
+    metrics_path = METRICS_PATH
+    Path(os.path.dirname(metrics_path)).mkdir(parents=True, exist_ok=True)
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+    print(f"\nMétricas guardadas en: {metrics_path}")
+
+    # --- Referencias a gráficos generados en scripts anteriores ---
+    # Para el informe, se recomienda usar los gráficos generados en:
+    # - H1: hipotesis_1_rendimiento_vs_abandono.png
+    # - H2: hipotesis_2a_beca_vs_abandono.png y hipotesis_2b_economia_vs_abandono.png
+    # - H3: hipotesis_3_expectativas_vs_abandono.png
+    # - Ordinal: ordinal_rendimiento_vs_frecuencia.png y ordinal_expectativas_vs_frecuencia.png
+    return metrics
+
+
+if __name__ == "__main__":
+    # --- Cargar Datos ---
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo de datos procesados en {PROCESSED_DATA_PATH}")
+        exit()
+    main(df)
@@ -0,0 +1,277 @@
+"""
+Agregados incrementales de la encuesta para seguir las hipótesis en vivo.
+
+Durante la campaña el CSV de Google Forms solo crece. En lugar de releerlo
+completo, este módulo guarda por hipótesis la tabla de conteos
+(grupo × respuesta) y una marca de agua: el offset en bytes del CSV crudo
+hasta donde ya se contó (más la marca temporal más reciente vista). Cada
+actualización lee solo los bytes nuevos, los limpia igual que
+`00_preprocesamiento.py`, y suma sus conteos: O(respuestas nuevas).
+
+A partir de las tablas se recalculan sin releer el histórico:
+- chi-cuadrado (tabla variable × abandono_considerado), como `chi2_contingency`;
+- Kruskal-Wallis / Mann-Whitney (tabla grupo × nivel de frecuencia 1-5):
+  los rangos medios de cada nivel salen de los totales por nivel, y de ahí
+  las sumas de rangos y tamaños por grupo, con corrección por empates.
+
+Cada exportación del formulario reemplaza el archivo con las mismas filas
+previas más las nuevas, así que el offset sigue siendo válido. Si la
+cabecera cambia (otro formulario), el archivo se achica o cambian los
+últimos bytes ya contados (`VENTANA_COLA` antes del offset), los agregados
+se reconstruyen desde cero. Es una verificación barata, no una huella de
+todo lo contado: una edición de respuestas anteriores a esa ventana no se
+detecta; en ese caso usar `--reconstruir`.
+
+Solo se cuentan registros terminados en salto de línea. La exportación de
+Forms no termina en salto de línea, así que el último registro se cuenta
+recién cuando el archivo no cambió (tamaño y mtime) desde la revisión
+anterior: un registro a medio escribir nunca se toma como completo.
+
+Uso:
+    python agregados_incrementales.py                 # actualiza e imprime
+    python agregados_incrementales.py --vigilar 30    # cada 30 s
+    python agregados_incrementales.py --reconstruir
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from asociaciones import chi_cuadrado_lote
+from pruebas_rangos import kruskal_desde_conteos, mannwhitney_desde_conteos
+from dataset_encuesta import (
+    RAW_DATA_PATH, PROCESSED_DATA_PATH, CACHE_DIRNAME,
+    limpiar_respuestas, construir_columnas_derivadas,
+)
+
+AGREGADOS_PATH = Path(PROCESSED_DATA_PATH).parent / CACHE_DIRNAME / "agregados_encuesta.json"
+FORMATO_MARCA_TEMPORAL = '%d/%m/%Y %H:%M:%S'
+BYTES_CABECERA = 1 << 16
+VENTANA_COLA = 1 << 16   # bytes ya contados que se verifican en cada actualización
+VERSION = 2
+
+# hipótesis -> (prueba, variable de grupos, variable de respuesta)
+HIPOTESIS = {
+    'h1_rendimiento': ('chi2', 'rendimiento_semestre_pasado', 'abandono_considerado'),
+    'h2a_beca': ('chi2', 'beca_actual', 'abandono_considerado'),
+    'h2b_economia': ('chi2', 'desafio_economico', 'abandono_considerado'),
+    'h3_expectativas': ('chi2', 'expectativas_carrera', 'abandono_considerado'),
+    'ordinal_rendimiento': ('kruskal', 'rendimiento_ordinal', 'frecuencia_abandono'),
+    'ordinal_beca': ('kruskal', 'beca_actual', 'frecuencia_abandono'),
+    'ordinal_expectativas': ('kruskal', 'expectativas_ordinal', 'frecuencia_abandono'),
+}
+
+
+# --- Lectura Incremental del CSV ---
+
+def _fin_registro(datos):
+    """Posición después del último salto de línea fuera de comillas (registro completo)."""
+    fin = datos.rfind(b"\n")
+    while fin >= 0 and datos.count(b'"', 0, fin) % 2:
+        fin = datos.rfind(b"\n", 0, fin)
+    return fin + 1
+
+
+def _fin_cabecera(datos):
+    """Posición después de la cabecera (puede ocupar varias líneas entre comillas)."""
+    inicio = 0
+    while True:
+        fin = datos.find(b"\n", inicio)
+        if fin < 0:
+            return None
+        if datos.count(b'"', 0, fin) % 2 == 0:
+            return fin + 1
+        inicio = fin + 1
+
+
+class AgregadosEncuesta:
+    """Conteos por hipótesis con marca de agua sobre el CSV crudo del formulario."""
+
+    def __init__(self, raw_path=RAW_DATA_PATH, store_path=AGREGADOS_PATH, hipotesis=None):
+        self.raw_path = Path(raw_path)
+        self.store_path = Path(store_path)
+        self.hipotesis = dict(hipotesis or HIPOTESIS)
+        self._reiniciar()
+        self._cargar()
+
+    def _reiniciar(self):
+        self.offset = 0
+        self.huella = None
+        self.huella_cola = None
+        self.tamano = None
+        self.mtime_ns = None
+        self.n_respuestas = 0
+        self.marca_temporal_max = None
+        self.tablas = {nombre: {} for nombre in self.hipotesis}
+
+    def _cargar(self):
+        if not self.store_path.exists():
+            return
+        with open(self.store_path, encoding='utf-8') as f:
+            estado = json.load(f)
+        if estado.get('version') != VERSION or set(estado['tablas']) != set(self.hipotesis):
+            return
+        self.offset = estado['offset']
+        self.huella = estado['huella']
+        self.huella_cola = estado['huella_cola']
+        self.tamano = estado['tamano']
+        self.mtime_ns = estado['mtime_ns']
+        self.n_respuestas = estado['n_respuestas']
+        self.marca_temporal_max = estado['marca_temporal_max']
+        self.tablas = estado['tablas']
+
+    def guardar(self):
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        estado = {
+            'version': VERSION,
+            'offset': self.offset,
+            'huella': self.huella,
+            'huella_cola': self.huella_cola,
+            'tamano': self.tamano,
+            'mtime_ns': self.mtime_ns,
+            'n_respuestas': self.n_respuestas,
+            'marca_temporal_max': self.marca_temporal_max,
+            'tablas': self.tablas,
+        }
+        tmp_path = self.store_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.store_path)
+
+    def _huella_cola(self, f, fin_cabecera):
+        """sha256 de los últimos `VENTANA_COLA` bytes contados (después de la cabecera)."""
+        inicio = max(fin_cabecera, self.offset - VENTANA_COLA)
+        f.seek(inicio)
+        return hashlib.sha256(f.read(max(0, self.offset - inicio))).hexdigest()
+
+    def actualizar(self, reconstruir=False):
+        """
+        Suma las respuestas agregadas al CSV desde la última actualización.
+
+        Returns:
+            int: Respuestas nuevas contadas (después de la limpieza).
+        """
+        with open(self.raw_path, 'rb') as f:
+            inicio = f.read(BYTES_CABECERA)
+            fin_cabecera = _fin_cabecera(inicio)
+            if fin_cabecera is None:
+                return 0
+            cabecera = inicio[:fin_cabecera]
+            huella = hashlib.sha256(cabecera).hexdigest()
+            estado = os.fstat(f.fileno())
+            sin_cambios = (estado.st_size, estado.st_mtime_ns) == (self.tamano, self.mtime_ns)
+            if (reconstruir or self.huella != huella or estado.st_size < self.offset
+                    or self._huella_cola(f, fin_cabecera) != self.huella_cola):
+                self._reiniciar()
+                self.huella = huella
+                self.offset = fin_cabecera
+            f.seek(self.offset)
+            datos = f.read()
+            revisado = (estado.st_size, estado.st_mtime_ns) != (self.tamano, self.mtime_ns)
+            self.tamano, self.mtime_ns = estado.st_size, estado.st_mtime_ns
+
+            completos = _fin_registro(datos)
+            if completos < len(datos) and sin_cambios and datos.count(b'"') % 2 == 0:
+                # Archivo igual que en la revisión anterior: el último registro
+                # (sin salto de línea, como exporta Forms) ya está completo.
+                completos = len(datos)
+            bloque = datos[:completos]
+            self.offset += completos
+            # Del mismo descriptor: la ventana corresponde a los bytes contados
+            self.huella_cola = self._huella_cola(f, fin_cabecera)
+
+        if not bloque.strip():
+            # Nada nuevo, o solo el salto de línea que cierra el registro ya contado
+            if revisado or completos:
+                self.guardar()
+            return 0
+        columnas = pd.read_csv(io.BytesIO(cabecera), nrows=0).columns
+        nuevas = pd.read_csv(io.BytesIO(bloque), header=None, names=columnas)
+
+        nuevas = construir_columnas_derivadas(limpiar_respuestas(nuevas))
+        self._sumar(nuevas)
+        self.guardar()
+        return len(nuevas)
+
+    def _sumar(self, df):
+        self.n_respuestas += len(df)
+        marcas = pd.to_datetime(df['marca_temporal'], format=FORMATO_MARCA_TEMPORAL, errors='coerce')
+        if marcas.notna().any():
+            maxima = marcas.max().isoformat()
+            self.marca_temporal_max = max(filter(None, [self.marca_temporal_max, maxima]))
+        for nombre, (_, grupos, respuesta) in self.hipotesis.items():
+            tabla = self.tablas[nombre]
+            conteos = df.groupby([grupos, respuesta], observed=True).size()
+            for (grupo, valor), n in conteos.items():
+                fila = tabla.setdefault(str(grupo), {})
+                clave = str(valor)
+                fila[clave] = fila.get(clave, 0) + int(n)
+
+    # --- Resultados ---
+
+    def tabla(self, nombre):
+        """Tabla de conteos de una hipótesis como DataFrame (niveles numéricos en orden)."""
+        tabla = pd.DataFrame(self.tablas[nombre]).T.fillna(0).astype(np.int64)
+        columnas = sorted(tabla.columns, key=lambda c: (0, float(c)) if c.replace('.', '', 1).isdigit() else (1, c))
+        return tabla.sort_index()[columnas]
+
+    def resultados(self):
+        """Una fila por hipótesis con prueba, n, estadístico, grados de libertad y p-valor."""
+        filas = []
+        for nombre, (prueba, grupos, respuesta) in self.hipotesis.items():
+            fila = {'hipotesis': nombre, 'grupos': grupos, 'respuesta': respuesta}
+            if not self.tablas[nombre]:
+                filas.append({**fila, 'prueba': prueba, 'n': 0, 'estadistico': np.nan,
+                              'grados_libertad': np.nan, 'p_valor': np.nan})
+                continue
+            tabla = self.tabla(nombre)
+            conteos = tabla.to_numpy()
+            if prueba == 'chi2':
+                estadistico, _, gl, n = chi_cuadrado_lote(conteos[None])
+                estadistico, gl, n = float(estadistico[0]), int(gl[0]), int(n[0])
+                p = float(chi2.sf(estadistico, gl)) if gl > 0 else np.nan
+            else:
+                n = int(conteos.sum())
+                gl = int((conteos.sum(axis=1) > 0).sum() - 1)
+                if gl == 1:
+                    prueba = 'mann-whitney'
+                    estadistico, p = mannwhitney_desde_conteos(conteos)
+                else:
+                    estadistico, p = kruskal_desde_conteos(conteos)
+            filas.append({**fila, 'prueba': prueba, 'n': n, 'estadistico': estadistico,
+                          'grados_libertad': gl, 'p_valor': p})
+        return pd.DataFrame(filas)
+
+
+def imprimir(agregados):
+    print(f"--- Hipótesis en vivo: {agregados.n_respuestas} respuestas "
+          f"(última: {agregados.marca_temporal_max}) ---")
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(agregados.resultados().round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agregados incrementales de la encuesta.")
+    parser.add_argument('--reconstruir', action='store_true', help="Ignora los agregados guardados.")
+    parser.add_argument('--vigilar', type=float, default=None, metavar='SEGUNDOS',
+                        help="Revisa el CSV cada SEGUNDOS y reimprime si hay respuestas nuevas.")
+    args = parser.parse_args()
+
+    agregados = AgregadosEncuesta()
+    nuevas = agregados.actualizar(reconstruir=args.reconstruir)
+    print(f"Respuestas nuevas: {nuevas}")
+    imprimir(agregados)
+    while args.vigilar:
+        time.sleep(args.vigilar)
+        nuevas = agregados.actualizar()
+        if nuevas:
+            print(f"\nRespuestas nuevas: {nuevas}")
+            imprimir(agregados)
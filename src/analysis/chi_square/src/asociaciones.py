@@ -0,0 +1,275 @@
+"""
+Motor de asociaciones: todas las pruebas chi-cuadrado entre pares de columnas.
+
+En lugar de un `pd.crosstab` + `chi2_contingency` por hipótesis, codifica
+cada columna categórica una sola vez como enteros y arma la tabla de
+contingencia de cada par con un único `np.bincount`. Las tablas se apilan
+(rellenas con ceros hasta el mayor número de categorías) y chi-cuadrado,
+p-valor y V de Cramér se calculan para todos los pares a la vez, con
+corrección por comparaciones múltiples (Benjamini-Hochberg y Bonferroni).
+
+Uso:
+    from asociaciones import matriz_asociaciones
+    resultados = matriz_asociaciones(df, ['beca_actual', 'licenciatura', ...])
+
+    python asociaciones.py   # todas las columnas categóricas del dataset
+
+`asociaciones_opciones` hace lo mismo para cada opción de una pregunta de
+opción múltiple (matriz multi-hot de `multiseleccion`) contra una columna.
+"""
+
+import os
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from dataset_encuesta import cargar_datos, matriz_desafios, COLUMNAS_CATEGORICAS
+
+# --- Configuración de Rutas ---
+if os.path.basename(os.getcwd()) == 'src':
+    PROCESSED_DATA_PATH = os.path.join("..", "data", "processed", "datos_limpios.csv")
+    RESULTS_PATH = os.path.join("..", "results")
+else:
+    PROCESSED_DATA_PATH = os.path.join("data", "processed", "datos_limpios.csv")
+    RESULTS_PATH = os.path.join("results")
+
+ALPHA = 0.05
+COLUMNAS_ASOCIACION = COLUMNAS_CATEGORICAS + [
+    'rendimiento_ordinal',
+    'expectativas_ordinal',
+    'desafio_economico',
+]
+
+
+def codificar_columna(serie):
+    """
+    Códigos enteros (-1 = faltante) y categorías de una columna.
+
+    Las categóricas usan sus propios códigos; el resto se factoriza ordenado.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(dtype=np.int64), list(serie.cat.categories)
+    valores, categorias = pd.factorize(serie, sort=True)
+    return valores.astype(np.int64), list(categorias)
+
+
+def codificar_columnas(df, columnas):
+    """Códigos enteros por columna (-1 = faltante) y número de categorías."""
+    codigos, n_categorias = {}, {}
+    for col in columnas:
+        codigos[col], categorias = codificar_columna(df[col])
+        n_categorias[col] = len(categorias)
+    return codigos, n_categorias
+
+
+def tabla_contingencia(codigos_a, k_a, codigos_b, k_b):
+    """Tabla k_a × k_b de un par con un solo bincount (omite filas con faltantes)."""
+    validos = (codigos_a >= 0) & (codigos_b >= 0)
+    celdas = codigos_a[validos] * k_b + codigos_b[validos]
+    return np.bincount(celdas, minlength=k_a * k_b).reshape(k_a, k_b)
+
+
+def chi_cuadrado_lote(tablas, correccion_yates=True):
+    """
+    Chi-cuadrado para un lote de tablas apiladas (P, R, C) rellenas con ceros.
+
+    Las filas/columnas sin observaciones no cuentan para los grados de
+    libertad, igual que si la tabla se hubiera armado con `pd.crosstab`.
+    Con `correccion_yates`, las tablas con 1 grado de libertad usan la
+    corrección de continuidad de Yates (como `chi2_contingency`).
+
+    Returns:
+        tuple: (chi2, chi2 sin corrección, grados de libertad, n) por tabla.
+    """
+    tablas = tablas.astype(np.float64)
+    n = tablas.sum(axis=(1, 2))
+    filas = tablas.sum(axis=2)
+    columnas = tablas.sum(axis=1)
+    esperadas = filas[:, :, None] * columnas[:, None, :] / np.where(n > 0, n, 1)[:, None, None]
+
+    r = (filas > 0).sum(axis=1)
+    c = (columnas > 0).sum(axis=1)
+    gl = np.maximum(r - 1, 0) * np.maximum(c - 1, 0)
+
+    diferencia = tablas - esperadas
+    con_esperada = esperadas > 0
+    divisor = np.where(con_esperada, esperadas, 1)
+    estadistico = np.where(con_esperada, diferencia ** 2 / divisor, 0).sum(axis=(1, 2))
+
+    corregido = estadistico
+    if correccion_yates:
+        ajuste = np.abs(diferencia) - np.minimum(0.5, np.abs(diferencia))
+        yates = np.where(con_esperada, ajuste ** 2 / divisor, 0).sum(axis=(1, 2))
+        corregido = np.where(gl == 1, yates, estadistico)
+    return corregido, estadistico, gl, n
+
+
+def ajustar_benjamini_hochberg(p_valores):
+    """p-valores ajustados por FDR de Benjamini-Hochberg (NaN se conserva)."""
+    p = np.asarray(p_valores, dtype=np.float64)
+    ajustados = np.full_like(p, np.nan)
+    validos = ~np.isnan(p)
+    m = validos.sum()
+    if m == 0:
+        return ajustados
+    orden = np.argsort(p[validos])
+    escalados = p[validos][orden] * m / np.arange(1, m + 1)
+    escalados = np.minimum.accumulate(escalados[::-1])[::-1]
+    resultado = np.empty(m)
+    resultado[orden] = np.minimum(escalados, 1.0)
+    ajustados[validos] = resultado
+    return ajustados
+
+
+def ajustar_bonferroni(p_valores):
+    """p-valores ajustados por Bonferroni (NaN se conserva)."""
+    p = np.asarray(p_valores, dtype=np.float64)
+    return np.minimum(p * np.count_nonzero(~np.isnan(p)), 1.0)
+
+
+def matriz_asociaciones(df, columnas=None, alpha=ALPHA, correccion_yates=True, montecarlo=False):
+    """
+    Pruebas chi-cuadrado de independencia para todos los pares de `columnas`.
+
+    Args:
+        df: DataFrame de la encuesta.
+        columnas: Columnas categóricas (por defecto `COLUMNAS_ASOCIACION`).
+        alpha: Nivel de significancia para la columna `significativo`.
+        correccion_yates: Corrección de continuidad en tablas 2×2.
+        montecarlo: Agrega `p_montecarlo` (permutación con márgenes fijos,
+            ver `pvalor_montecarlo`) y su versión ajustada por BH.
+
+    Returns:
+        pd.DataFrame: una fila por par con variable_1, variable_2, n,
+        grados_libertad, chi2, p_valor, v_cramer, p_ajustado_bh,
+        p_ajustado_bonferroni y significativo (según BH), ordenado por p_valor.
+    """
+    columnas = list(columnas or COLUMNAS_ASOCIACION)
+    codigos, n_categorias = codificar_columnas(df, columnas)
+    pares = list(combinations(columnas, 2))
+    if not pares:
+        return pd.DataFrame(columns=[
+            'variable_1', 'variable_2', 'n', 'grados_libertad', 'chi2', 'p_valor',
+            'v_cramer', 'p_ajustado_bh', 'p_ajustado_bonferroni', 'significativo'])
+
+    k_max = max(n_categorias.values())
+    tablas = np.zeros((len(pares), k_max, k_max), dtype=np.int64)
+    for i, (a, b) in enumerate(pares):
+        k_a, k_b = n_categorias[a], n_categorias[b]
+        tablas[i, :k_a, :k_b] = tabla_contingencia(codigos[a], k_a, codigos[b], k_b)
+
+    estadistico, sin_correccion, gl, n = chi_cuadrado_lote(tablas, correccion_yates)
+    p_valor = np.where(gl > 0, chi2.sf(estadistico, np.maximum(gl, 1)), np.nan)
+
+    filas = (tablas.sum(axis=2) > 0).sum(axis=1)
+    cols = (tablas.sum(axis=1) > 0).sum(axis=1)
+    k_min = np.minimum(filas, cols) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_cramer = np.where((k_min > 0) & (n > 0), np.sqrt(sin_correccion / (n * k_min)), np.nan)
+
+    p_bh = ajustar_benjamini_hochberg(p_valor)
+    resultados = pd.DataFrame({
+        'variable_1': [a for a, _ in pares],
+        'variable_2': [b for _, b in pares],
+        'n': n.astype(np.int64),
+        'grados_libertad': gl.astype(np.int64),
+        'chi2': estadistico,
+        'p_valor': p_valor,
+        'v_cramer': v_cramer,
+        'p_ajustado_bh': p_bh,
+        'p_ajustado_bonferroni': ajustar_bonferroni(p_valor),
+        'significativo': p_bh < alpha,
+    })
+    if montecarlo:
+        # Import local: pvalor_montecarlo reutiliza chi_cuadrado_lote de este módulo
+        from pvalor_montecarlo import pvalor_montecarlo
+        resultados['p_montecarlo'] = [pvalor_montecarlo(tabla)['p_value'] for tabla in tablas]
+        resultados['p_montecarlo_ajustado_bh'] = ajustar_benjamini_hochberg(resultados['p_montecarlo'])
+    return resultados.sort_values('p_valor', na_position='last').reset_index(drop=True)
+
+
+def asociaciones_opciones(matriz, vocabulario, serie, alpha=ALPHA, correccion_yates=True):
+    """
+    Chi-cuadrado de cada opción (eligió / no eligió) contra las categorías de `serie`.
+
+    Las tablas 2 × k de todas las opciones salen de un solo producto
+    disperso `matriz.T @ indicadoras(serie)`: la fila "eligió" es ese
+    producto y la fila "no eligió" es el total por categoría menos él.
+
+    Args:
+        matriz: Matriz multi-hot CSR (encuestados × opciones).
+        vocabulario: Etiqueta de cada columna de `matriz`.
+        serie: Variable categórica de los mismos encuestados (p. ej. abandono_considerado).
+
+    Returns:
+        pd.DataFrame: una fila por opción con opcion, n_elegida, n, grados_libertad,
+        chi2, p_valor, v_cramer, p_ajustado_bh, p_ajustado_bonferroni,
+        significativo y el porcentaje de cada categoría de `serie` entre
+        quienes eligieron la opción, ordenado por p_valor.
+    """
+    codigos, categorias = pd.factorize(serie, sort=True)
+    validos = codigos >= 0
+    matriz = matriz[validos]
+    indicadoras = np.eye(len(categorias), dtype=np.int64)[codigos[validos]]
+    eligieron = np.asarray(matriz.T.astype(np.int64) @ indicadoras)
+    totales = indicadoras.sum(axis=0)
+    tablas = np.stack([totales - eligieron, eligieron], axis=1)
+
+    estadistico, sin_correccion, gl, n = chi_cuadrado_lote(tablas, correccion_yates)
+    p_valor = np.where(gl > 0, chi2.sf(estadistico, np.maximum(gl, 1)), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_cramer = np.where(gl > 0, np.sqrt(sin_correccion / n), np.nan)
+        porcentajes = eligieron / eligieron.sum(axis=1, keepdims=True) * 100
+
+    p_bh = ajustar_benjamini_hochberg(p_valor)
+    resultados = pd.DataFrame({
+        'opcion': list(vocabulario),
+        'n_elegida': eligieron.sum(axis=1),
+        'n': n.astype(np.int64),
+        'grados_libertad': gl.astype(np.int64),
+        'chi2': estadistico,
+        'p_valor': p_valor,
+        'v_cramer': v_cramer,
+        'p_ajustado_bh': p_bh,
+        'p_ajustado_bonferroni': ajustar_bonferroni(p_valor),
+        'significativo': p_bh < alpha,
+    })
+    for j, categoria in enumerate(categorias):
+        resultados[f'porcentaje_{categoria}'] = porcentajes[:, j]
+    return resultados.sort_values('p_valor', na_position='last').reset_index(drop=True)
+
+
+def main(df):
+    resultados = matriz_asociaciones(df, montecarlo=True)
+    print("--- Asociaciones entre Pares de Variables (Chi-Cuadrado) ---")
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(resultados.round(4).to_string(index=False))
+
+    output_path = os.path.join(RESULTS_PATH, "asociaciones.csv")
+    Path(RESULTS_PATH).mkdir(parents=True, exist_ok=True)
+    resultados.to_csv(output_path, index=False)
+    print(f"\nTabla de asociaciones guardada en: {output_path}")
+
+    desafios, vocabulario = matriz_desafios(df)
+    por_desafio = asociaciones_opciones(desafios, vocabulario, df['abandono_considerado'])
+    print("\n--- Cada Desafío No Académico vs. Abandono Considerado (Chi-Cuadrado) ---")
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.max_colwidth', 60):
+        print(por_desafio.round(4).to_string(index=False))
+
+    output_path = os.path.join(RESULTS_PATH, "asociaciones_desafios.csv")
+    por_desafio.to_csv(output_path, index=False)
+    print(f"\nTabla por desafío guardada en: {output_path}")
+    return resultados
+
+
+if __name__ == "__main__":
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except Exception as e:
+        print(f"Error al cargar o procesar el archivo: {e}")
+        exit()
+    main(df)
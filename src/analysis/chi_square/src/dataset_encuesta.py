@@ -0,0 +1,170 @@
+"""
+Dataset compartido de la encuesta para las etapas de chi-cuadrado.
+
+Lee `datos_limpios.csv` una sola vez, construye las columnas derivadas que
+usan varias etapas (`rendimiento_ordinal`, `expectativas_ordinal`,
+`desafio_economico`) con tipos categóricos, y guarda el resultado en un cache
+Parquet cuyo nombre incluye el hash del CSV de origen. Si el CSV cambia, el
+cache se reconstruye; si no, las etapas cargan el Parquet directamente.
+
+`desafios_no_academicos` (opción múltiple) se codifica con `multiseleccion`;
+`matriz_desafios` da la matriz multi-hot para conteos y pruebas por desafío.
+
+Uso:
+    from dataset_encuesta import cargar_datos
+    df = cargar_datos()
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from multiseleccion import codificar_multiseleccion, bandera
+
+# --- Configuración de Rutas ---
+# Mismo criterio que las etapas: desde analisis_chi_cuadrado/src o desde la raíz
+RAW_DATA_FILENAME = '_Pulso de la Trayectoria Estudiantil UNRC_ (Respuestas) - Respuestas de formulario 1.csv'
+if os.path.basename(os.getcwd()) == 'src':
+    RAW_DATA_PATH = os.path.join("..", "data", "raw", RAW_DATA_FILENAME)
+    PROCESSED_DATA_PATH = os.path.join("..", "data", "processed", "datos_limpios.csv")
+else:
+    RAW_DATA_PATH = os.path.join("data", "raw", RAW_DATA_FILENAME)
+    PROCESSED_DATA_PATH = os.path.join("data", "processed", "datos_limpios.csv")
+
+CACHE_DIRNAME = "cache"
+CACHE_PREFIX = "datos_encuesta_"
+
+# --- Columnas del Formulario (Google Forms) ---
+# Nombres cortos para las preguntas del formulario
+COLUMNAS_FORMULARIO = {
+    'Marca temporal': 'marca_temporal',
+    '2. En los últimos 6 meses, ¿has considerado seriamente la posibilidad de abandonar tus estudios o darte de baja temporal?': 'abandono_considerado',
+    '3. En una escala del 1 al 5, ¿con qué frecuencia has tenido estos pensamientos?\n(1) Nunca\n(2) Rara vez\n(3) A veces\n(4) Frecuentemente\n(5) Constantemente': 'frecuencia_abandono',
+    '4. Pensando en tu rendimiento del semestre pasado, ¿cuál de estas frases te describe mejor?': 'rendimiento_semestre_pasado',
+    '5. ¿Sientes que la carrera que elegiste ha cumplido con tus expectativas?': 'expectativas_carrera',
+    '1. De la siguiente lista, por favor selecciona los 3 desafíos NO académicos más importantes que has enfrentado en el último año.': 'desafios_no_academicos',
+    '2. ¿Cuentas actualmente con alguna beca (académica, de manutención, etc.)?': 'beca_actual',
+    '3. ¿Conoces los servicios de tutoría o apoyo psicopedagógico que ofrece la UNRC?': 'conoce_servicios_apoyo',
+    '¿Qué recompensa deseas?\nElige una opción ': 'recompensa',
+    'Gracias por tus respuestas, ¿Quieres participar en el sorteo?': 'participa_sorteo',
+    'Escribe tu correo electrónico': 'email',
+    '1. ¿Cual es tu licenciatura?': 'licenciatura',
+    'Columna 9': 'columna_9'
+}
+
+# Variantes de escritura de la misma licenciatura
+LICENCIATURA_VARIANTES = {
+    'Humanidades y Narrativa Multimedia': 'Humanidades y Narrativas Multimedia',
+    'Humanidades y Narrativas Multímedia': 'Humanidades y Narrativas Multimedia',
+    'Humanidades Narrativas y multimedia': 'Humanidades y Narrativas Multimedia'
+}
+LICENCIATURAS_EXCLUIDAS = ['Matemáticas']
+
+# --- Mapeos y Órdenes de Categorías ---
+RENDIMIENTO_MAP = {
+    'Aprobé todas o casi todas las materias que cursé': 'Alto Rendimiento',
+    'Aprobé aproximadamente la mitad de las materias': 'Medio Rendimiento',
+    'Reprobé más de la mitad de las materias que cursé': 'Bajo Rendimiento'
+}
+RENDIMIENTO_ORDEN = list(RENDIMIENTO_MAP)
+
+EXPECTATIVAS_MAP = {
+    'Sí, totalmente': 'Satisfecho',
+    'Parcialmente, tengo algunas dudas': 'Parcialmente Satisfecho',
+    'No, o casi no': 'Insatisfecho'
+}
+EXPECTATIVAS_ORDEN = list(EXPECTATIVAS_MAP)
+
+DESAFIO_ECONOMICO_PATRON = 'económicas|trabajo'
+SI_NO = ['No', 'Sí']
+
+# Columnas de respuesta única que se guardan como categóricas (orden alfabético)
+COLUMNAS_CATEGORICAS = [
+    'abandono_considerado',
+    'beca_actual',
+    'conoce_servicios_apoyo',
+    'licenciatura',
+]
+
+
+def hash_archivo(path):
+    """sha256 del contenido del archivo (clave del cache)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def limpiar_respuestas(df):
+    """Renombra las columnas del formulario y limpia 'licenciatura' (usado por 00_preprocesamiento)."""
+    df = df.rename(columns=COLUMNAS_FORMULARIO)
+    df['licenciatura'] = df['licenciatura'].str.strip().replace(LICENCIATURA_VARIANTES)
+    return df[~df['licenciatura'].isin(LICENCIATURAS_EXCLUIDAS)]
+
+
+def construir_columnas_derivadas(df):
+    """Agrega las columnas derivadas y aplica tipos categóricos."""
+    df = df.copy()
+
+    df['rendimiento_semestre_pasado'] = pd.Categorical(
+        df['rendimiento_semestre_pasado'], categories=RENDIMIENTO_ORDEN, ordered=True)
+    df['rendimiento_ordinal'] = pd.Categorical(
+        df['rendimiento_semestre_pasado'].map(RENDIMIENTO_MAP),
+        categories=list(RENDIMIENTO_MAP.values()), ordered=True)
+
+    df['expectativas_carrera'] = pd.Categorical(
+        df['expectativas_carrera'], categories=EXPECTATIVAS_ORDEN, ordered=True)
+    df['expectativas_ordinal'] = pd.Categorical(
+        df['expectativas_carrera'].map(EXPECTATIVAS_MAP),
+        categories=list(EXPECTATIVAS_MAP.values()), ordered=True)
+
+    # El patrón se evalúa sobre el vocabulario de opciones, no sobre cada respuesta
+    desafios, vocabulario = matriz_desafios(df)
+    df['desafio_economico'] = pd.Categorical(
+        np.where(bandera(desafios, vocabulario, DESAFIO_ECONOMICO_PATRON), 'Sí', 'No'),
+        categories=SI_NO)
+
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype('category')
+
+    return df
+
+
+def matriz_desafios(df):
+    """Matriz multi-hot (CSR) y vocabulario de `desafios_no_academicos`."""
+    return codificar_multiseleccion(df['desafios_no_academicos'])
+
+
+def cargar_datos(csv_path=None, usar_cache=True):
+    """
+    Dataset de la encuesta con columnas derivadas.
+
+    Args:
+        csv_path: CSV procesado (por defecto `datos_limpios.csv`).
+        usar_cache: Si es False, ignora el cache y reconstruye desde el CSV.
+
+    Returns:
+        pd.DataFrame
+    """
+    csv_path = Path(csv_path or PROCESSED_DATA_PATH)
+    if not usar_cache:
+        return construir_columnas_derivadas(pd.read_csv(csv_path))
+
+    cache_dir = csv_path.parent / CACHE_DIRNAME
+    cache_path = cache_dir / f"{CACHE_PREFIX}{hash_archivo(csv_path)[:16]}.parquet"
+    if cache_path.exists():
+        return pd.read_parquet(cache_path)
+
+    df = construir_columnas_derivadas(pd.read_csv(csv_path))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Los caches de versiones anteriores del CSV ya no se usan
+    for viejo in cache_dir.glob(f"{CACHE_PREFIX}*.parquet"):
+        viejo.unlink(missing_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    return df
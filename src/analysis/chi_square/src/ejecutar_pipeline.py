@@ -0,0 +1,135 @@
+"""
+Ejecuta todas las etapas de chi-cuadrado en un solo proceso.
+
+Equivale a correr 00_preprocesamiento.py, 01 a 06, asociaciones.py y
+pruebas_rangos.py por separado (los mismos metrics/*.json y archivos en results/), pero:
+- El intérprete, pandas, scipy y matplotlib se importan una sola vez.
+- El dataset se carga una sola vez con `cargar_datos` y se comparte.
+- Las etapas posteriores son independientes entre sí, así que corren en
+  paralelo en procesos hijos creados con fork (heredan el DataFrame sin
+  copiarlo ni serializarlo) con el backend Agg de matplotlib.
+- Las figuras que no cambiaron no se vuelven a dibujar (ver `figuras.py`).
+- Un mismo proceso hijo puede correr varias etapas (y en modo secuencial
+  todas corren en este proceso), así que antes de cada etapa se cierran
+  las figuras abiertas y se restauran los rcParams de matplotlib: el estilo
+  o las figuras de una etapa no se filtran a la siguiente.
+
+La salida de cada etapa se captura y se imprime completa, en el orden de las
+etapas, seguida de un resumen de tiempos. dvc.yaml sigue declarando cada
+etapa por separado; este script es para correr el pipeline completo rápido.
+
+Uso:
+    python ejecutar_pipeline.py [--workers N] [--secuencial]
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import figuras
+from dataset_encuesta import cargar_datos
+
+ETAPA_PREPROCESAMIENTO = '00_preprocesamiento'
+ETAPAS = [
+    '01_analisis_exploratorio',
+    '02_hipotesis_rendimiento',
+    '03_hipotesis_financiera',
+    '04_hipotesis_expectativas',
+    '05_analisis_ordinal',
+    '06_resumen_final',
+    'asociaciones',
+    'pruebas_rangos',
+]
+
+# Dataset compartido: se asigna antes de crear los procesos hijos (fork)
+_DF = None
+
+
+def reiniciar_matplotlib():
+    """Cierra las figuras abiertas y vuelve a los rcParams por defecto (el backend se conserva)."""
+    plt.close('all')
+    matplotlib.rcdefaults()
+
+
+def ejecutar_etapa(nombre):
+    """
+    Importa la etapa y corre su `main(df)` con el dataset compartido, partiendo
+    de un estado limpio de matplotlib.
+
+    Returns:
+        tuple: (nombre, segundos, error o None, salida capturada)
+    """
+    salida = io.StringIO()
+    inicio = time.perf_counter()
+    error = None
+    reiniciar_matplotlib()
+    with contextlib.redirect_stdout(salida):
+        try:
+            importlib.import_module(nombre).main(_DF)
+        except Exception:
+            error = traceback.format_exc()
+    return nombre, time.perf_counter() - inicio, error, salida.getvalue()
+
+
+def ejecutar_pipeline(etapas=ETAPAS, workers=None, secuencial=False):
+    """Corre el preprocesamiento y después las etapas; retorna los resultados por etapa."""
+    global _DF
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+
+    inicio = time.perf_counter()
+    print(f"=== {ETAPA_PREPROCESAMIENTO} ===")
+    runpy.run_path(os.path.join(src_dir, f"{ETAPA_PREPROCESAMIENTO}.py"), run_name="__main__")
+    tiempo_pre = time.perf_counter() - inicio
+
+    _DF = cargar_datos()
+
+    if secuencial or workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        resultados = [ejecutar_etapa(nombre) for nombre in etapas]
+    else:
+        workers = workers or min(len(etapas), os.cpu_count() or 1)
+        # Ya hay un proceso por etapa: cada etapa dibuja sus figuras sin otro pool
+        figuras.N_PROCESOS = 1
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            resultados = list(pool.map(ejecutar_etapa, etapas))
+
+    for nombre, _, error, salida in resultados:
+        print(f"\n=== {nombre} ===")
+        print(salida, end='')
+        if error:
+            print(error, end='')
+
+    print("\n=== Resumen de Tiempos ===")
+    print(f"{ETAPA_PREPROCESAMIENTO:<28} {tiempo_pre:6.2f} s")
+    for nombre, segundos, error, _ in resultados:
+        estado = 'ERROR' if error else 'ok'
+        print(f"{nombre:<28} {segundos:6.2f} s  {estado}")
+    print(f"{'Total':<28} {time.perf_counter() - inicio:6.2f} s")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline de chi-cuadrado en un solo proceso.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos para las etapas de análisis (por defecto, uno por etapa).")
+    parser.add_argument('--secuencial', action='store_true',
+                        help="Corre las etapas una tras otra en este proceso.")
+    args = parser.parse_args()
+
+    resultados = ejecutar_pipeline(workers=args.workers, secuencial=args.secuencial)
+    if any(error for _, _, error, _ in resultados):
+        sys.exit(1)
@@ -0,0 +1,222 @@
+"""
+Renderizado de figuras con cache por contenido.
+
+Las etapas describen cada gráfico como un diccionario (tipo, tabla de datos,
+textos, archivo de salida) en lugar de dibujarlo directamente. La clave de
+cada figura es el sha256 de su tabla, sus textos y el bloque `visualize` de
+params.yaml (más el tema de `analyze`); si el PNG existe y su clave coincide
+con la guardada en `results/.figuras_cache/`, no se vuelve a dibujar. Las
+figuras que sí cambiaron se dibujan en un pool de procesos con el backend Agg.
+
+`dvc repro` borra las salidas de una etapa antes de ejecutarla, así que en
+dvc.yaml los PNG se declaran con `persist: true` para que el cache aplique
+también ahí.
+
+Uso:
+    from figuras import figura_barras, renderizar_figuras
+    renderizar_figuras([figura_barras(ct_percent, ruta_png, titulo=..., eje_x=...)])
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+PARAMS_FILENAME = "params.yaml"
+CLAVES_DIRNAME = ".figuras_cache"
+# Cambiar si cambia la forma de dibujar (invalida todas las figuras)
+VERSION_RENDER = 1
+
+PARAMETROS_POR_DEFECTO = {
+    'fig_size': [12, 7],
+    'color_palette': ['#2ca02c', '#d62728'],
+    'dpi': 100,
+    'theme': 'seaborn-v0_8-whitegrid',
+}
+
+# Procesos para dibujar; ejecutar_pipeline lo fija en 1 porque ya paraleliza por etapa
+N_PROCESOS = None
+
+
+def buscar_params(desde=None):
+    """Ruta de params.yaml subiendo desde `desde` (por defecto, este archivo)."""
+    carpeta = Path(desde or __file__).resolve()
+    for padre in [carpeta, *carpeta.parents]:
+        candidato = padre / PARAMS_FILENAME
+        if candidato.is_file():
+            return candidato
+    return None
+
+
+def cargar_parametros_visualizacion(params_path=None):
+    """
+    Bloque `visualize` de params.yaml (+ `analyze.visualization_theme`) con valores por defecto.
+
+    Los valores por defecto solo se usan si no hay params.yaml; si existe y no
+    se puede leer, el error se propaga (las figuras no deben cambiar en silencio).
+    """
+    parametros = dict(PARAMETROS_POR_DEFECTO)
+    params_path = params_path or buscar_params()
+    if params_path is None:
+        return parametros
+    with open(params_path, encoding='utf-8') as f:
+        params = yaml.safe_load(f) or {}
+    parametros.update(params.get('visualize') or {})
+    tema = (params.get('analyze') or {}).get('visualization_theme')
+    if tema:
+        parametros['theme'] = tema
+    return parametros
+
+
+# --- Descripción de Figuras ---
+
+def figura_barras(tabla_porcentajes, archivo, titulo, eje_x, titulo_fontsize=16,
+                  etiquetas_x=None, ancho=0.8, figsize=None):
+    """Barras agrupadas de porcentajes por fila (No / Sí) con etiquetas centradas."""
+    return {
+        'tipo': 'barras',
+        'datos': tabla_porcentajes,
+        'archivo': str(archivo),
+        'titulo': titulo,
+        'titulo_fontsize': titulo_fontsize,
+        'eje_x': eje_x,
+        'eje_y': 'Porcentaje de Estudiantes (%)',
+        'etiquetas_x': list(etiquetas_x) if etiquetas_x is not None else None,
+        'ancho': ancho,
+        'figsize': list(figsize) if figsize else None,
+    }
+
+
+def figura_cajas(datos, x, y, archivo, titulo, eje_x, eje_y, figsize=(10, 6)):
+    """Boxplot de `y` por grupo `x` (paleta viridis)."""
+    return {
+        'tipo': 'cajas',
+        'datos': datos[[x, y]],
+        'archivo': str(archivo),
+        'x': x,
+        'y': y,
+        'titulo': titulo,
+        'eje_x': eje_x,
+        'eje_y': eje_y,
+        'figsize': list(figsize),
+    }
+
+
+def clave_figura(figura, parametros):
+    """sha256 de la tabla, los textos de la figura y los parámetros de visualización."""
+    digest = hashlib.sha256()
+    digest.update(figura['datos'].to_csv().encode('utf-8'))
+    textos = {k: v for k, v in figura.items() if k not in ('datos', 'archivo')}
+    digest.update(json.dumps([VERSION_RENDER, textos, parametros], sort_keys=True,
+                             ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+# --- Dibujo (en el proceso que renderiza) ---
+
+def _dibujar_barras(figura, parametros, ax):
+    figura['datos'].plot(kind='bar', ax=ax, color=parametros['color_palette'], width=figura['ancho'])
+    for container in ax.containers:
+        ax.bar_label(container, fmt='%.1f%%', label_type='center', color='white', fontsize=10, fontweight='bold')
+    ax.set_title(figura['titulo'], fontsize=figura['titulo_fontsize'], fontweight='bold')
+    ax.set_xlabel(figura['eje_x'], fontsize=12)
+    ax.set_ylabel(figura['eje_y'], fontsize=12)
+    if figura['etiquetas_x'] is not None:
+        ax.set_xticklabels(figura['etiquetas_x'], rotation=0, ha='center')
+    else:
+        ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
+    ax.legend(title='¿Consideró Abandonar?')
+    ax.set_ylim(0, 100)
+
+
+def _dibujar_cajas(figura, parametros, ax):
+    import seaborn as sns
+    sns.boxplot(x=figura['x'], y=figura['y'], hue=figura['x'], data=figura['datos'], ax=ax,
+                palette="viridis", dodge=False, legend=False)
+    ax.set_title(figura['titulo'], fontsize=14, fontweight='bold')
+    ax.set_xlabel(figura['eje_x'], fontsize=12)
+    ax.set_ylabel(figura['eje_y'], fontsize=12)
+
+
+_DIBUJOS = {'barras': _dibujar_barras, 'cajas': _dibujar_cajas}
+
+
+def dibujar_figura(figura, parametros):
+    """Dibuja y guarda una figura; retorna la ruta del PNG."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.style.use(parametros['theme'])
+    fig, ax = plt.subplots(figsize=figura['figsize'] or parametros['fig_size'])
+    _DIBUJOS[figura['tipo']](figura, parametros, ax)
+    plt.tight_layout()
+    Path(figura['archivo']).parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(figura['archivo'], dpi=parametros['dpi'])
+    plt.close(fig)
+    return figura['archivo']
+
+
+# --- Servicio de Renderizado ---
+
+def _ruta_clave(archivo):
+    """Archivo con la clave de una figura: results/.figuras_cache/<nombre>.sha256"""
+    archivo = Path(archivo)
+    return archivo.parent / CLAVES_DIRNAME / f"{archivo.name}.sha256"
+
+
+def _clave_guardada(archivo):
+    try:
+        return _ruta_clave(archivo).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+
+
+def renderizar_figuras(figuras, parametros=None, n_procesos=None, forzar=False):
+    """
+    Dibuja solo las figuras cuya clave cambió (o cuyo PNG no existe).
+
+    Args:
+        figuras: Descripciones de `figura_barras` / `figura_cajas`.
+        parametros: Parámetros de visualización (por defecto, de params.yaml).
+        n_procesos: Procesos para dibujar (por defecto `N_PROCESOS` o uno por figura).
+        forzar: Dibuja todas aunque no hayan cambiado.
+
+    Returns:
+        dict: archivo -> True si se dibujó, False si se reutilizó.
+    """
+    parametros = parametros or cargar_parametros_visualizacion()
+    claves = {f['archivo']: clave_figura(f, parametros) for f in figuras}
+    pendientes = [
+        f for f in figuras
+        if forzar or not Path(f['archivo']).exists() or _clave_guardada(f['archivo']) != claves[f['archivo']]
+    ]
+
+    n_procesos = min(n_procesos or N_PROCESOS or os.cpu_count() or 1, len(pendientes))
+    if n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            list(pool.map(dibujar_figura, pendientes, [parametros] * len(pendientes)))
+    else:
+        for figura in pendientes:
+            dibujar_figura(figura, parametros)
+
+    # La clave se escribe después del PNG: si el dibujo falla, se reintenta la próxima vez
+    for figura in pendientes:
+        ruta = _ruta_clave(figura['archivo'])
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_text(claves[figura['archivo']], encoding='utf-8')
+
+    dibujadas = {f['archivo'] for f in pendientes}
+    return {f['archivo']: f['archivo'] in dibujadas for f in figuras}
+
+
+def imprimir_estado(resultado):
+    """Mensaje por figura: guardada o sin cambios."""
+    for archivo, dibujada in resultado.items():
+        if dibujada:
+            print(f"Gráfico guardado en: {archivo}")
+        else:
+            print(f"Gráfico sin cambios (cache): {archivo}")
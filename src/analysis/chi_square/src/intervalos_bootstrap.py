@@ -0,0 +1,159 @@
+"""
+Intervalos de confianza bootstrap para tablas de porcentajes por fila.
+
+Las remuestras se generan como una matriz de índices (B × n). Cada
+encuestado se codifica como una celda `fila * k_columnas + columna`, así
+que los conteos de todas las remuestras salen de un solo `np.bincount`
+sobre `remuestra * n_celdas + celda`; los porcentajes por fila y los
+percentiles se calculan con operaciones de arreglos sobre (B, filas, cols).
+Opcionalmente las remuestras se reparten en bloques entre procesos, cada
+uno con su propia semilla derivada de la semilla principal.
+
+El percentil bootstrap degenera cuando la fila tiene pocos encuestados o
+una proporción observada de 0% o 100% (todas las remuestras repiten ese
+valor y el intervalo queda en, p. ej., [100.0, 100.0]). En esas filas se
+usa el intervalo de Wilson; esas filas quedan en
+`inferior.attrs['filas_wilson']`.
+
+Uso:
+    from intervalos_bootstrap import intervalos_porcentajes
+    inferior, superior = intervalos_porcentajes(df, 'beca_actual', 'abandono_considerado')
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from asociaciones import codificar_columnas
+
+N_REMUESTRAS = 5000
+NIVEL_CONFIANZA = 0.95
+SEMILLA = 42
+TAMANO_BLOQUE = 1000
+# Filas con menos encuestados usan el intervalo de Wilson en lugar del bootstrap
+N_MINIMO_BOOTSTRAP = 30
+
+
+def conteos_bootstrap(celdas, n_celdas, indices):
+    """Conteos por celda de cada remuestra: arreglo (B, n_celdas)."""
+    n_remuestras = indices.shape[0]
+    remuestreadas = celdas[indices]
+    desplazadas = np.arange(n_remuestras)[:, None] * n_celdas + remuestreadas
+    return np.bincount(desplazadas.ravel(), minlength=n_remuestras * n_celdas).reshape(n_remuestras, n_celdas)
+
+
+def porcentajes_fila(conteos):
+    """Porcentajes por fila de conteos (..., filas, cols); filas vacías -> NaN."""
+    conteos = conteos.astype(np.float64)
+    totales = conteos.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(totales > 0, conteos / totales * 100, np.nan)
+
+
+def intervalos_wilson(exitos, n, nivel=NIVEL_CONFIANZA):
+    """Intervalo de Wilson (en %) para `exitos` de `n`; admite arreglos."""
+    exitos, n = np.asarray(exitos, dtype=np.float64), np.asarray(n, dtype=np.float64)
+    z = norm.ppf(1 - (1 - nivel) / 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = exitos / n
+        denominador = 1 + z ** 2 / n
+        centro = (p + z ** 2 / (2 * n)) / denominador
+        margen = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominador
+    return np.clip(centro - margen, 0, 1) * 100, np.clip(centro + margen, 0, 1) * 100
+
+
+def _porcentajes_bloque(celdas, k_filas, k_columnas, n_remuestras, semilla):
+    """Porcentajes (B, filas, cols) de un bloque de remuestras con su propia semilla."""
+    rng = np.random.default_rng(semilla)
+    indices = rng.integers(0, len(celdas), size=(n_remuestras, len(celdas)))
+    conteos = conteos_bootstrap(celdas, k_filas * k_columnas, indices)
+    return porcentajes_fila(conteos.reshape(n_remuestras, k_filas, k_columnas))
+
+
+def intervalos_porcentajes(df, var_fila, var_columna, n_remuestras=N_REMUESTRAS,
+                           nivel=NIVEL_CONFIANZA, semilla=SEMILLA, n_procesos=1):
+    """
+    Intervalos percentil de la tabla `pd.crosstab(..., normalize='index') * 100`.
+    Las filas con menos de `N_MINIMO_BOOTSTRAP` encuestados o con alguna
+    proporción observada de 0% o 100% usan el intervalo de Wilson.
+
+    Args:
+        df: DataFrame de la encuesta.
+        var_fila: Variable de las filas de la tabla.
+        var_columna: Variable de las columnas (p. ej. 'abandono_considerado').
+        n_remuestras: Número de remuestras bootstrap.
+        nivel: Nivel de confianza del intervalo.
+        semilla: Semilla principal (resultados reproducibles).
+        n_procesos: Procesos para repartir los bloques de remuestras.
+
+    Returns:
+        tuple: (inferior, superior), DataFrames con las mismas filas y
+        columnas que la tabla de porcentajes. `inferior.attrs['filas_wilson']`
+        es la tupla de filas con intervalo de Wilson.
+    """
+    codigos, n_categorias = codificar_columnas(df, [var_fila, var_columna])
+    filas, columnas = codigos[var_fila], codigos[var_columna]
+    k_filas, k_columnas = n_categorias[var_fila], n_categorias[var_columna]
+    validos = (filas >= 0) & (columnas >= 0)
+    celdas = filas[validos] * k_columnas + columnas[validos]
+
+    tamanos = [TAMANO_BLOQUE] * (n_remuestras // TAMANO_BLOQUE)
+    if n_remuestras % TAMANO_BLOQUE:
+        tamanos.append(n_remuestras % TAMANO_BLOQUE)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    argumentos = [(celdas, k_filas, k_columnas, b, s) for b, s in zip(tamanos, semillas)]
+
+    if n_procesos > 1 and len(argumentos) > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            bloques = list(pool.map(_porcentajes_bloque, *zip(*argumentos)))
+    else:
+        bloques = [_porcentajes_bloque(*a) for a in argumentos]
+    porcentajes = np.concatenate(bloques)
+
+    alfa = (1 - nivel) / 2
+    inferior, superior = np.nanpercentile(porcentajes, [100 * alfa, 100 * (1 - alfa)], axis=0)
+
+    # Mismas etiquetas que pd.crosstab: solo categorías observadas
+    observadas = np.bincount(celdas, minlength=k_filas * k_columnas).reshape(k_filas, k_columnas)
+    con_filas, con_columnas = observadas.sum(axis=1) > 0, observadas.sum(axis=0) > 0
+
+    # Filas donde el percentil degenera: n chico o proporción observada de 0 / 100%
+    n_fila = observadas.sum(axis=1)
+    extremas = ((observadas == 0) | (observadas == n_fila[:, None]))[:, con_columnas].any(axis=1)
+    wilson = con_filas & ((n_fila < N_MINIMO_BOOTSTRAP) | extremas)
+    if wilson.any():
+        inferior_w, superior_w = intervalos_wilson(observadas[wilson], n_fila[wilson][:, None], nivel)
+        inferior[wilson], superior[wilson] = inferior_w, superior_w
+
+    indice = pd.Index(_etiquetas(df[var_fila])[con_filas], name=var_fila)
+    columnas_tabla = pd.Index(_etiquetas(df[var_columna])[con_columnas], name=var_columna)
+    inferior, superior = (
+        pd.DataFrame(valores[np.ix_(con_filas, con_columnas)], index=indice, columns=columnas_tabla)
+        for valores in (inferior, superior)
+    )
+    inferior.attrs['filas_wilson'] = tuple(str(f) for f in indice[wilson[con_filas]])
+    return inferior, superior
+
+
+def filas_wilson(inferior):
+    """Filas cuyo intervalo es de Wilson (ver `intervalos_porcentajes`)."""
+    return list(inferior.attrs.get('filas_wilson', ()))
+
+
+def _etiquetas(serie):
+    """Etiquetas en el mismo orden que los códigos de `codificar_columnas`."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return np.asarray(serie.cat.categories, dtype=object)
+    return np.asarray(pd.factorize(serie, sort=True)[1], dtype=object)
+
+
+def intervalos_a_dict(inferior, superior, decimales=1):
+    """Formato de `DataFrame.to_dict()` con [inferior, superior] por celda."""
+    return {
+        str(col): {str(fila): [round(float(inferior.loc[fila, col]), decimales),
+                               round(float(superior.loc[fila, col]), decimales)]
+                   for fila in inferior.index}
+        for col in inferior.columns
+    }
@@ -0,0 +1,87 @@
+"""
+Codificación multi-hot de preguntas de opción múltiple (p. ej. `desafios_no_academicos`).
+
+Forms guarda las opciones elegidas en una sola celda separadas por ", ".
+Algunas opciones llevan comas dentro de paréntesis ("Dificultades económicas
+(para transporte, materiales, etc.)"), así que solo se separa en las comas
+fuera de paréntesis.
+
+Cada respuesta distinta se separa una sola vez; el resultado es un
+vocabulario (opciones en orden de primera aparición) y una matriz dispersa
+booleana CSR de encuestados × opciones. Conteos, banderas derivadas y pruebas
+por opción se calculan sobre la matriz, sin volver a recorrer los textos.
+
+Uso:
+    from multiseleccion import codificar_multiseleccion, conteos_opciones
+    matriz, vocabulario = codificar_multiseleccion(df['desafios_no_academicos'])
+    conteos = conteos_opciones(matriz, vocabulario)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Coma (y espacios) que no está dentro de paréntesis
+SEPARADOR_OPCIONES = re.compile(r',\s*(?![^()]*\))')
+
+
+def separar_opciones(texto):
+    """Opciones de una respuesta, sin espacios sobrantes ni vacías."""
+    return [opcion.strip() for opcion in SEPARADOR_OPCIONES.split(texto) if opcion.strip()]
+
+
+def codificar_multiseleccion(serie):
+    """
+    Vocabulario y matriz multi-hot de una columna de opción múltiple.
+
+    Returns:
+        tuple: (matriz CSR booleana de forma (len(serie), len(vocabulario)),
+        vocabulario como lista de opciones). Las respuestas vacías quedan
+        como filas sin opciones.
+    """
+    codigos, respuestas = pd.factorize(serie)
+    vocabulario, posiciones = [], {}
+    opciones_por_respuesta = []
+    for respuesta in respuestas:
+        columnas = []
+        for opcion in separar_opciones(str(respuesta)):
+            if opcion not in posiciones:
+                posiciones[opcion] = len(vocabulario)
+                vocabulario.append(opcion)
+            if posiciones[opcion] not in columnas:
+                columnas.append(posiciones[opcion])
+        opciones_por_respuesta.append(np.array(columnas, dtype=np.int32))
+
+    # Las filas con la misma respuesta comparten su lista de columnas
+    vacia = np.empty(0, dtype=np.int32)
+    filas = [opciones_por_respuesta[c] if c >= 0 else vacia for c in codigos]
+    largos = np.fromiter((len(f) for f in filas), dtype=np.int64, count=len(filas))
+    indptr = np.concatenate([[0], np.cumsum(largos)])
+    indices = np.concatenate(filas) if len(filas) else vacia
+    matriz = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=bool), indices, indptr),
+        shape=(len(filas), len(vocabulario)),
+    )
+    return matriz, vocabulario
+
+
+def conteos_opciones(matriz, vocabulario):
+    """Veces que se eligió cada opción, de mayor a menor (empates en orden de aparición)."""
+    conteos = pd.Series(np.asarray(matriz.sum(axis=0)).ravel(), index=vocabulario, name='count')
+    return conteos.sort_values(ascending=False, kind='stable')
+
+
+def columnas_que_coinciden(vocabulario, patron, case=False):
+    """Índices de las opciones cuyo texto coincide con la expresión regular `patron`."""
+    regex = re.compile(patron, 0 if case else re.IGNORECASE)
+    return [i for i, opcion in enumerate(vocabulario) if regex.search(opcion)]
+
+
+def bandera(matriz, vocabulario, patron, case=False):
+    """True para los encuestados que eligieron alguna opción que coincide con `patron`."""
+    columnas = columnas_que_coinciden(vocabulario, patron, case=case)
+    if not columnas:
+        return np.zeros(matriz.shape[0], dtype=bool)
+    return matriz[:, columnas].getnnz(axis=1) > 0
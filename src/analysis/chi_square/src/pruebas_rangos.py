@@ -0,0 +1,188 @@
+"""
+Pruebas no paramétricas por grupos (Kruskal-Wallis / Mann-Whitney) con una sola ordenación.
+
+En lugar de filtrar el DataFrame una vez por grupo y llamar a `kruskal` o
+`mannwhitneyu` por hipótesis, la variable de respuesta se factoriza ordenada
+una sola vez (niveles 0..L-1). Para cada columna de grupos basta un
+`np.bincount` sobre los códigos de categoría para obtener la tabla de
+conteos grupos × niveles; de ella salen los rangos medios de cada nivel
+(empates incluidos), las sumas de rangos por grupo y el estadístico.
+Probar `frecuencia_abandono` contra todos los factores de la encuesta
+cuesta una ordenación más un conteo por factor.
+
+Con 2 grupos se usa Mann-Whitney U y con más, Kruskal-Wallis H, igual que
+`get_kruskal_pvalue` en 06_resumen_final.py.
+
+Uso:
+    from pruebas_rangos import pruebas_por_grupos
+    pruebas = pruebas_por_grupos(df, 'frecuencia_abandono', ['beca_actual', 'rendimiento_ordinal'])
+
+    python pruebas_rangos.py   # frecuencia_abandono contra todos los factores
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, norm, mannwhitneyu
+
+from asociaciones import codificar_columna, ajustar_benjamini_hochberg, COLUMNAS_ASOCIACION
+from dataset_encuesta import cargar_datos
+
+# --- Configuración de Rutas ---
+if os.path.basename(os.getcwd()) == 'src':
+    PROCESSED_DATA_PATH = os.path.join("..", "data", "processed", "datos_limpios.csv")
+    RESULTS_PATH = os.path.join("..", "results")
+else:
+    PROCESSED_DATA_PATH = os.path.join("data", "processed", "datos_limpios.csv")
+    RESULTS_PATH = os.path.join("results")
+
+ALPHA = 0.05
+# Tamaño del grupo menor hasta el que `mannwhitneyu` usa la distribución exacta (sin empates)
+MAX_EXACTO_MANNWHITNEY = 8
+
+
+# --- Estadísticos desde Conteos ---
+
+def rangos_desde_conteos(conteos):
+    """
+    Sumas de rangos por grupo de una tabla grupos × niveles (niveles en orden).
+
+    Returns:
+        tuple: (suma de rangos por grupo, tamaño por grupo, totales por nivel)
+    """
+    conteos = np.asarray(conteos, dtype=np.float64)
+    por_nivel = conteos.sum(axis=0)
+    rango_medio = np.cumsum(por_nivel) - por_nivel + (por_nivel + 1) / 2
+    return conteos @ rango_medio, conteos.sum(axis=1), por_nivel
+
+
+def kruskal_desde_conteos(conteos):
+    """Kruskal-Wallis (H con corrección por empates, p-valor) desde conteos grupos × niveles."""
+    suma_rangos, tamanos, por_nivel = rangos_desde_conteos(conteos)
+    con_datos = tamanos > 0
+    suma_rangos, tamanos = suma_rangos[con_datos], tamanos[con_datos]
+    n = tamanos.sum()
+    if len(tamanos) < 2 or n < 2:
+        return float('nan'), float('nan')
+    h = 12 / (n * (n + 1)) * np.sum(suma_rangos ** 2 / tamanos) - 3 * (n + 1)
+    empates = 1 - np.sum(por_nivel ** 3 - por_nivel) / (n ** 3 - n)
+    if empates <= 0:
+        return float('nan'), float('nan')
+    h /= empates
+    return float(h), float(chi2.sf(h, len(tamanos) - 1))
+
+
+def mannwhitney_desde_conteos(conteos):
+    """
+    Mann-Whitney U bilateral para 2 grupos, como `mannwhitneyu` por defecto:
+    aproximación normal con corrección por continuidad y empates; sin
+    empates y con el grupo menor de hasta 8 observaciones, distribución exacta.
+    """
+    conteos = np.asarray(conteos)
+    suma_rangos, tamanos, por_nivel = rangos_desde_conteos(conteos)
+    con_datos = tamanos > 0
+    if con_datos.sum() != 2:
+        return float('nan'), float('nan')
+    (r1, _), (n1, n2) = suma_rangos[con_datos], tamanos[con_datos]
+    n = n1 + n2
+    u1 = r1 - n1 * (n1 + 1) / 2
+    if por_nivel.max() <= 1 and min(n1, n2) <= MAX_EXACTO_MANNWHITNEY:
+        # Sin empates cada nivel es una observación: se reconstruyen los niveles
+        x, y = (np.repeat(np.arange(conteos.shape[1]), fila) for fila in conteos[con_datos])
+        return float(u1), float(mannwhitneyu(x, y, method='exact').pvalue)
+    u = max(u1, n1 * n2 - u1)
+    media = n1 * n2 / 2
+    desviacion = np.sqrt(n1 * n2 / 12 * ((n + 1) - np.sum(por_nivel ** 3 - por_nivel) / (n * (n - 1))))
+    if desviacion == 0:
+        return float(u1), float('nan')
+    z = (u - media - 0.5) / desviacion
+    return float(u1), float(min(1.0, 2 * norm.sf(z)))
+
+
+# --- Motor por Grupos ---
+
+def conteos_por_grupo(codigos_grupo, k_grupos, niveles, k_niveles):
+    """Tabla grupos × niveles con un solo bincount (omite filas con faltantes)."""
+    validos = (codigos_grupo >= 0) & (niveles >= 0)
+    celdas = codigos_grupo[validos] * k_niveles + niveles[validos]
+    return np.bincount(celdas, minlength=k_grupos * k_niveles).reshape(k_grupos, k_niveles)
+
+
+def pruebas_por_grupos(df, respuesta, columnas, alpha=ALPHA):
+    """
+    Kruskal-Wallis o Mann-Whitney de `respuesta` para cada columna de grupos.
+
+    Args:
+        df: DataFrame de la encuesta.
+        respuesta: Variable ordinal o numérica (p. ej. frecuencia_abandono).
+        columnas: Columnas de grupos (categóricas o factorizables).
+        alpha: Nivel de significancia para la columna `significance`.
+
+    Returns:
+        pd.DataFrame: una fila por columna con grupos, prueba_nombre, n,
+        n_grupos, estadistico, p_value, p_ajustado_bh, significance,
+        y grupo_etiquetas (grupos con datos, en orden de categoría), en el
+        orden de `columnas`.
+    """
+    # La única ordenación: niveles de la respuesta
+    niveles, valores = pd.factorize(df[respuesta], sort=True)
+    niveles = niveles.astype(np.int64)
+
+    filas = []
+    for col in columnas:
+        codigos, categorias = codificar_columna(df[col])
+        conteos = conteos_por_grupo(codigos, len(categorias), niveles, len(valores))
+        con_datos = conteos.sum(axis=1) > 0
+        conteos, etiquetas = conteos[con_datos], [c for c, v in zip(categorias, con_datos) if v]
+
+        if len(etiquetas) == 2:
+            prueba = 'Mann-Whitney U'
+            estadistico, p = mannwhitney_desde_conteos(conteos)
+        elif len(etiquetas) > 2:
+            prueba = 'Kruskal-Wallis H'
+            estadistico, p = kruskal_desde_conteos(conteos)
+        else:
+            prueba, estadistico, p = None, float('nan'), float('nan')
+
+        filas.append({
+            'grupos': col,
+            'prueba_nombre': prueba,
+            'n': int(conteos.sum()),
+            'n_grupos': len(etiquetas),
+            'estadistico': estadistico,
+            'p_value': p,
+            'grupo_etiquetas': [str(e) for e in etiquetas],
+        })
+
+    resultados = pd.DataFrame(filas, columns=[
+        'grupos', 'prueba_nombre', 'n', 'n_grupos', 'estadistico', 'p_value',
+        'grupo_etiquetas'])
+    resultados.insert(6, 'p_ajustado_bh', ajustar_benjamini_hochberg(resultados['p_value']))
+    resultados.insert(7, 'significance', resultados['p_value'] < alpha)
+    return resultados
+
+
+def main(df):
+    factores = [c for c in COLUMNAS_ASOCIACION if c != 'abandono_considerado']
+    resultados = pruebas_por_grupos(df, 'frecuencia_abandono', factores)
+    print("--- Frecuencia de Pensamientos de Abandono por Factor (Rangos) ---")
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.max_colwidth', 60):
+        print(resultados.round(4).to_string(index=False))
+
+    output_path = os.path.join(RESULTS_PATH, "pruebas_rangos.csv")
+    Path(RESULTS_PATH).mkdir(parents=True, exist_ok=True)
+    resultados.to_csv(output_path, index=False)
+    print(f"\nTabla de pruebas por rangos guardada en: {output_path}")
+    return resultados
+
+
+if __name__ == "__main__":
+    try:
+        df = cargar_datos(PROCESSED_DATA_PATH)
+    except Exception as e:
+        print(f"Error al cargar o procesar el archivo: {e}")
+        exit()
+    main(df)
@@ -0,0 +1,98 @@
+"""
+p-valores Monte Carlo (permutación) para tablas de contingencia r × c.
+
+Con ~100 respuestas muchas frecuencias esperadas quedan por debajo de 5 y el
+p-valor asintótico de `chi2_contingency` deja de ser confiable. Aquí la
+distribución nula se simula permutando la columna de respuestas respecto a
+la de filas: cada tabla simulada conserva exactamente los márgenes de la
+observada.
+
+- Las permutaciones se generan en lotes con `rng.permuted` sobre una matriz
+  (lote × n) y las tablas del lote se cuentan con un solo `np.bincount`.
+- El estadístico de Pearson de todo el lote se calcula con
+  `chi_cuadrado_lote` (sin corrección de Yates).
+- La simulación se detiene en cuanto el intervalo del 95% del p-valor
+  estimado es más angosto que `tolerancia`, o al llegar a `max_simulaciones`.
+
+Uso:
+    from pvalor_montecarlo import pvalor_montecarlo
+    resultado = pvalor_montecarlo(pd.crosstab(df['beca_actual'], df['abandono_considerado']))
+"""
+
+import numpy as np
+
+from asociaciones import chi_cuadrado_lote
+
+SEMILLA = 42
+TAMANO_LOTE = 2000
+MIN_SIMULACIONES = 2000
+MAX_SIMULACIONES = 100000
+TOLERANCIA = 0.01   # semiancho máximo del IC 95% del p-valor
+Z_95 = 1.959964
+
+
+def etiquetas_desde_tabla(tabla):
+    """Reconstruye las etiquetas (fila, columna) de cada observación de una tabla de conteos."""
+    tabla = np.asarray(tabla, dtype=np.int64)
+    filas, columnas = np.nonzero(tabla)
+    repeticiones = tabla[filas, columnas]
+    return np.repeat(filas, repeticiones), np.repeat(columnas, repeticiones)
+
+
+def pvalor_montecarlo(tabla, max_simulaciones=MAX_SIMULACIONES, tamano_lote=TAMANO_LOTE,
+                      tolerancia=TOLERANCIA, semilla=SEMILLA):
+    """
+    p-valor de permutación (márgenes fijos) del estadístico chi-cuadrado de Pearson.
+
+    Args:
+        tabla: Tabla de conteos (DataFrame de `pd.crosstab` o arreglo 2D).
+        max_simulaciones: Tope de tablas simuladas.
+        tamano_lote: Tablas simuladas por lote.
+        tolerancia: Semiancho del IC 95% a partir del cual se deja de simular.
+        semilla: Semilla del generador (resultados reproducibles).
+
+    Returns:
+        dict: 'p_value', 'ci95' ([inferior, superior]), 'simulations' y
+        'chi2_statistic' (Pearson sin corrección). `p_value` es NaN si la
+        tabla tiene menos de 2 filas o columnas con observaciones.
+
+    Raises:
+        ValueError: si `max_simulaciones` o `tamano_lote` es menor que 1.
+    """
+    if max_simulaciones < 1 or tamano_lote < 1:
+        raise ValueError("max_simulaciones y tamano_lote deben ser al menos 1")
+    tabla = np.asarray(tabla, dtype=np.int64)
+    tabla = tabla[tabla.sum(axis=1) > 0][:, tabla.sum(axis=0) > 0]
+    r, c = tabla.shape
+    observado = float(chi_cuadrado_lote(tabla[None], correccion_yates=False)[0][0]) if tabla.size else float('nan')
+    if r < 2 or c < 2:
+        return {'p_value': float('nan'), 'ci95': [float('nan'), float('nan')],
+                'simulations': 0, 'chi2_statistic': observado}
+
+    filas, columnas = etiquetas_desde_tabla(tabla)
+    rng = np.random.default_rng(semilla)
+    # Margen relativo para empates numéricos entre estadísticos iguales
+    umbral = observado - 1e-7 * max(1.0, abs(observado))
+    extremos, simuladas = 0, 0
+    base = filas * c
+
+    while simuladas < max_simulaciones:
+        lote = min(tamano_lote, max_simulaciones - simuladas)
+        permutadas = rng.permuted(np.broadcast_to(columnas, (lote, len(columnas))), axis=1)
+        celdas = np.arange(lote)[:, None] * (r * c) + base + permutadas
+        tablas = np.bincount(celdas.ravel(), minlength=lote * r * c).reshape(lote, r, c)
+        estadisticos = chi_cuadrado_lote(tablas, correccion_yates=False)[0]
+        extremos += int(np.count_nonzero(estadisticos >= umbral))
+        simuladas += lote
+
+        p = (extremos + 1) / (simuladas + 1)
+        semiancho = Z_95 * np.sqrt(p * (1 - p) / simuladas)
+        if simuladas >= MIN_SIMULACIONES and semiancho <= tolerancia:
+            break
+
+    return {
+        'p_value': float(p),
+        'ci95': [float(max(0.0, p - semiancho)), float(min(1.0, p + semiancho))],
+        'simulations': int(simuladas),
+        'chi2_statistic': observado,
+    }
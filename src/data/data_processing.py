@@ -55,7 +55,7 @@ def create_features(df):
     # 3. Categorías de edad (EDA mostró grupos de riesgo: adultos jóvenes más propensos)
     df['Grupo_Edad_Riesgo'] = pd.cut(df['Age at enrollment'],
                                      bins=[0, 20, 25, 50],
-                                     labels=['Joven_Adulto', 'Adulto_Joven_Riesgo', 'Adulto_Mayor']).astype(str)
+                                     labels=['Joven_Adulto', 'Adulto_Joven_Riesgo', 'Adulto_Mayor']).astype(object).fillna('nan').astype(str)
 
     # 4. Indicadores socioeconómicos combinados (EDA: deudores y becarios tienen patrones)
     df['Socioeconomico_Riesgo'] = ((df['Debtor'] == 1) & (df['Scholarship holder'] == 0)).astype(int)
@@ -0,0 +1,55 @@
+"""
+Llenado del almacén de features desde el pipeline.
+
+Calcula por lotes el vector listo para el modelo de cada estudiante del
+almacén (``SAREP_STUDENT_DB`` o los datos simulados), lo guarda con la
+huella de sus campos crudos bajo la versión actual del conjunto de features
+y elimina los vectores de versiones anteriores. Así el dashboard arranca con
+todos los vectores listos y solo recalcula los de estudiantes que cambiaron.
+
+Uso:
+    python src/models/build_feature_store.py
+"""
+
+import sys
+import os
+from pathlib import Path
+
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from app.data import get_store
+from app.feature_store import FeatureStore, feature_set_version, get_feature_db_path
+from app.student_store import row_to_student
+from app.utils import FEATURE_MAPPING_VERSION, write_feature_vectors
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+PREPROCESSOR_PATH = BASE_DIR / "models" / "preprocessor.pkl"
+FEATURES_PATH = BASE_DIR / "models" / "feature_names.pkl"
+
+
+def build_feature_store(db_path=None, preprocessor_path=PREPROCESSOR_PATH,
+                        features_path=FEATURES_PATH, batch_size=1000):
+    """
+    Escribe los vectores de toda la matrícula y poda versiones viejas.
+
+    Returns:
+        int: vectores escritos.
+    """
+    preprocessor = joblib.load(preprocessor_path)
+    feature_names = list(joblib.load(features_path))
+    version = feature_set_version(feature_names, preprocessor, FEATURE_MAPPING_VERSION)
+    store = FeatureStore(db_path or get_feature_db_path(), version=version)
+
+    students = (row_to_student(row) for row in get_store().rows())
+    written = write_feature_vectors(students, feature_names, preprocessor, store, batch_size=batch_size)
+    pruned = store.prune_versions()
+
+    print(f"✅ Almacén de features (versión {version}): {written} vectores escritos, "
+          f"{pruned} de versiones anteriores eliminados")
+    return written
+
+
+if __name__ == "__main__":
+    build_feature_store()
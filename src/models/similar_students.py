@@ -0,0 +1,115 @@
+"""
+Índice de estudiantes similares (vecinos más cercanos) sobre el histórico.
+
+Construye un BallTree sobre los vectores del histórico transformados con
+``models/preprocessor.pkl`` (en el orden de ``models/feature_names.pkl``), el
+mismo escalado que aplica el serving a los estudiantes consultados, y lo guarda con joblib para cargarlo con ``mmap_mode='r'``: los
+arrays del árbol se leen del disco bajo demanda y se comparten entre procesos.
+
+El árbol usa solo las columnas que llena el mapeo UNRC (``UNRC_FEATURES``).
+Las demás llegan al serving con el valor de relleno y, si entraran en la
+distancia, los vecinos serían los históricos más cercanos a ese relleno.
+
+Uso:
+    python src/models/similar_students.py
+"""
+
+import sys
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from src.data.data_processing import load_data, clean_data, create_features
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / "data" / "raw" / "data.csv"
+FEATURES_PATH = BASE_DIR / "models" / "feature_names.pkl"
+PREPROCESSOR_PATH = BASE_DIR / "models" / "preprocessor.pkl"
+INDEX_DIR = BASE_DIR / "models" / "similar_students"
+
+# Columnas originales que se muestran junto a cada vecino
+DISPLAY_COLUMNS = [
+    'Age at enrollment',
+    'Curricular units 1st sem (approved)',
+    'Curricular units 1st sem (enrolled)',
+    'Curricular units 2nd sem (approved)',
+    'Curricular units 2nd sem (enrolled)',
+    'Tuition fees up to date',
+    'Scholarship holder',
+]
+
+# Features que llena ``map_unrc_to_model_inputs`` (app/utils.py)
+UNRC_FEATURES = [
+    'Ratio_Aprobacion_S2',
+    'Age at enrollment',
+    'Curricular units 1st sem (approved)',
+    'Curricular units 1st sem (enrolled)',
+    'Curricular units 2nd sem (approved)',
+    'Curricular units 2nd sem (enrolled)',
+    'Tuition fees up to date',
+    'Scholarship holder',
+]
+
+
+def historical_feature_frame(df, feature_names):
+    """
+    Features crudas del histórico en el orden del modelo: las categóricas
+    (p. ej. ``Grupo_Edad_Riesgo``) como dummies, y las que falten en 0, igual
+    que ``create_students_input_df`` en el serving.
+    """
+    raw = df.drop(columns=['Target'])
+    categorical = [c for c in raw.columns if not pd.api.types.is_numeric_dtype(raw[c])]
+    raw = pd.get_dummies(raw, columns=categorical, dtype=int)
+    return raw.reindex(columns=list(feature_names), fill_value=0).fillna(0)
+
+
+def build_similar_students_index(data_path=DATA_PATH, features_path=FEATURES_PATH,
+                                 preprocessor_path=PREPROCESSOR_PATH,
+                                 output_dir=INDEX_DIR, leaf_size=40):
+    """
+    Construye y guarda el índice de vecinos.
+
+    Archivos generados en ``output_dir``:
+        - ball_tree.joblib: BallTree (arrays cargables con mmap).
+        - outcomes.joblib: Target (Dropout / Enrolled / Graduate) por fila.
+        - display.joblib: DataFrame con ``DISPLAY_COLUMNS`` por fila.
+        - meta.joblib: features del árbol (``UNRC_FEATURES``), features del
+          modelo (para ubicarlas en los vectores del serving) y tamaño.
+    """
+    df = create_features(clean_data(load_data(data_path))).reset_index(drop=True)
+    y = df['Target']
+
+    feature_names = list(joblib.load(features_path))
+    preprocessor = joblib.load(preprocessor_path)
+    # El preprocesador escala columna por columna: se transforma el vector
+    # completo y se conservan las columnas del mapeo UNRC
+    columns = [feature_names.index(f) for f in UNRC_FEATURES]
+    X = np.ascontiguousarray(
+        preprocessor.transform(historical_feature_frame(df, feature_names))[:, columns],
+        dtype=np.float64
+    )
+
+    tree = BallTree(X, leaf_size=leaf_size)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(tree, output_dir / "ball_tree.joblib")
+    joblib.dump(np.asarray(y, dtype='U8'), output_dir / "outcomes.joblib")
+    joblib.dump(df[DISPLAY_COLUMNS].reset_index(drop=True), output_dir / "display.joblib")
+    joblib.dump(
+        {'feature_names': UNRC_FEATURES, 'model_feature_names': feature_names, 'n': len(X)},
+        output_dir / "meta.joblib"
+    )
+
+    print(f"✅ Índice de similares: {len(X)} estudiantes × {X.shape[1]} features en {output_dir}")
+    return tree
+
+
+if __name__ == "__main__":
+    build_similar_students_index()
@@ -1,6 +1,23 @@
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
 import pandas as pd
-from scipy.stats import shapiro, levene, chi2_contingency, mannwhitneyu, kruskal
+from scipy.stats import (shapiro, levene, chi2_contingency, mannwhitneyu, kruskal,
+                         ttest_ind, f_oneway)
+
+# Nombre de la prueba recomendada -> función de scipy que la calcula
+PRUEBAS = {
+    'T-test': ttest_ind,
+    'Mann-Whitney U': mannwhitneyu,
+    'ANOVA': f_oneway,
+    'Kruskal-Wallis': kruskal,
+}
+
+# Pares desde los que `choose_statistical_tests` usa un pool por defecto:
+# con menos, arrancar los procesos cuesta más que evaluar los pares
+MIN_PARES_POOL = 200
 
 def get_variable_type(series):
     """Determina si una variable es categórica o numérica."""
@@ -10,6 +27,42 @@ def get_variable_type(series):
         # Trata variables con pocos valores únicos como categóricas/ordinales
         return 'categorica_ordinal'
 
+def verificar_supuestos(grupos_data, alpha=0.05):
+    """
+    Supuestos de T-test/ANOVA para una variable numérica dividida en grupos.
+
+    Shapiro-Wilk en cada grupo con más de 2 datos y Levene entre ellos.
+
+    Returns:
+        tuple: (is_normal, homogeneidad, levene_p); levene_p es -1 si hay
+        menos de 2 grupos con datos suficientes.
+    """
+    is_normal = True
+    variances_data = []
+    for group_data in grupos_data:
+        if len(group_data) > 2:
+            _, p_shapiro = shapiro(group_data)
+            if p_shapiro < alpha:
+                is_normal = False
+            variances_data.append(group_data)
+
+    levene_p = -1
+    homogeneidad = False
+    if len(variances_data) > 1:
+        _, levene_p = levene(*variances_data)
+        if levene_p > alpha:
+            homogeneidad = True
+    return is_normal, homogeneidad, float(levene_p)
+
+
+def recomendar_prueba(n_grupos, is_normal, homogeneidad):
+    """Nombre de la prueba (clave de `PRUEBAS`) para comparar una variable numérica entre grupos."""
+    if n_grupos == 2:
+        return 'T-test' if is_normal and homogeneidad else 'Mann-Whitney U'
+    if n_grupos > 2:
+        return 'ANOVA' if is_normal and homogeneidad else 'Kruskal-Wallis'
+    return None
+
 def choose_statistical_test(df, var1_name, var2_name, force_type={}):
     """
     Analiza dos variables de un DataFrame y recomienda el test estadístico más apropiado.
@@ -63,55 +116,125 @@ def choose_statistical_test(df, var1_name, var2_name, force_type={}):
 
     groups = df[cat_var_name].dropna().unique()
     
-    is_normal = True
-    variances_data = []
-    
     print("\n1. Verificando supuestos para T-test/ANOVA:")
     
-    for group in groups:
-        group_data = df[df[cat_var_name] == group][num_var_name].dropna()
-        if len(group_data) > 2:
-            _, p_shapiro = shapiro(group_data)
-            if p_shapiro < 0.05:
-                is_normal = False
-            variances_data.append(group_data)
+    grupos_data = [df[df[cat_var_name] == group][num_var_name].dropna() for group in groups]
+    is_normal, homogeneidad, levene_p = verificar_supuestos(grupos_data)
 
     if is_normal:
         print("  - Supuesto de Normalidad (Test de Shapiro-Wilk): Cumplido. Los datos parecen normales en cada grupo.")
     else:
         print("  - Supuesto de Normalidad (Test de Shapiro-Wilk): No Cumplido. Al menos un grupo no sigue una distribución normal.")
 
-    levene_p = -1
-    homogeneidad = False
-    if len(variances_data) > 1:
-        _, levene_p = levene(*variances_data)
-        if levene_p > 0.05:
-            homogeneidad = True
-
     if homogeneidad:
         print("  - Supuesto de Homogeneidad de Varianzas (Test de Levene): Cumplido. Las varianzas son homogéneas.")
     else:
         print("  - Supuesto de Homogeneidad de Varianzas (Test de Levene): No Cumplido. Las varianzas no son homogéneas.")
 
     print("\n--- Recomendación Final ---")
-    if len(groups) == 2:
-        if is_normal and homogeneidad:
-            print("=> Usar T-test para muestras independientes.")
-            print("   Razón: Estás comparando las medias de una variable numérica que cumple los supuestos de normalidad y homogeneidad de varianzas entre dos grupos.")
-        else:
-            print("=> Usar Test U de Mann-Whitney (alternativa no paramétrica al T-test).")
-            print("   Razón: La variable numérica no cumple el supuesto de normalidad y/o homogeneidad de varianzas.")
-    elif len(groups) > 2:
-        if is_normal and homogeneidad:
-            print("=> Usar ANOVA de una vía.")
-            print("   Razón: Estás comparando las medias de una variable numérica que cumple los supuestos entre más de dos grupos.")
-        else:
-            print("=> Usar Test de Kruskal-Wallis (alternativa no paramétrica a ANOVA).")
-            print("   Razón: La variable numérica no cumple el supuesto de normalidad y/o homogeneidad de varianzas.")
+    prueba = recomendar_prueba(len(groups), is_normal, homogeneidad)
+    if prueba == 'T-test':
+        print("=> Usar T-test para muestras independientes.")
+        print("   Razón: Estás comparando las medias de una variable numérica que cumple los supuestos de normalidad y homogeneidad de varianzas entre dos grupos.")
+    elif prueba == 'Mann-Whitney U':
+        print("=> Usar Test U de Mann-Whitney (alternativa no paramétrica al T-test).")
+        print("   Razón: La variable numérica no cumple el supuesto de normalidad y/o homogeneidad de varianzas.")
+    elif prueba == 'ANOVA':
+        print("=> Usar ANOVA de una vía.")
+        print("   Razón: Estás comparando las medias de una variable numérica que cumple los supuestos entre más de dos grupos.")
+    elif prueba == 'Kruskal-Wallis':
+        print("=> Usar Test de Kruskal-Wallis (alternativa no paramétrica a ANOVA).")
+        print("   Razón: La variable numérica no cumple el supuesto de normalidad y/o homogeneidad de varianzas.")
     else:
         print("Se necesita al menos dos grupos para comparar.")
 
 
+# --- Modo por Lotes ---
+
+def _evaluar_par(tarea):
+    """Evalúa un par de columnas ya clasificadas (se ejecuta en los procesos del pool)."""
+    var1_name, var2_name, type1, type2, datos, alpha = tarea
+    fila = {
+        'variable_1': var1_name, 'variable_2': var2_name, 'tipo_1': type1, 'tipo_2': type2,
+        'prueba': None, 'estadistico': float('nan'), 'p_valor': float('nan'),
+        'significativo': False, 'n': 0, 'n_grupos': 0,
+        'normalidad': None, 'homogeneidad': None, 'levene_p': float('nan'), 'nota': '',
+    }
+
+    # --- Caso 1: Ambas variables son categóricas/ordinales ---
+    if type1 == 'categorica_ordinal' and type2 == 'categorica_ordinal':
+        contingency_table = pd.crosstab(datos[var1_name], datos[var2_name])
+        fila['prueba'] = 'Chi-cuadrado'
+        fila['n'] = int(contingency_table.to_numpy().sum())
+        try:
+            chi2, p, _, _ = chi2_contingency(contingency_table)
+            fila.update(estadistico=float(chi2), p_valor=float(p))
+        except ValueError:
+            fila['nota'] = 'No se pudo calcular el Chi-cuadrado (datos insuficientes)'
+
+    # --- Caso 2: Una variable es categórica y la otra es numérica ---
+    elif {type1, type2} == {'categorica_ordinal', 'numerica'}:
+        cat_var_name, num_var_name = (var1_name, var2_name) if type1 == 'categorica_ordinal' else (var2_name, var1_name)
+        validos = datos.dropna()
+        grupos_data = [g.to_numpy() for _, g in validos.groupby(cat_var_name, sort=False, observed=True)[num_var_name]]
+        is_normal, homogeneidad, levene_p = verificar_supuestos(grupos_data, alpha)
+        prueba = recomendar_prueba(len(grupos_data), is_normal, homogeneidad)
+        fila.update(prueba=prueba, n=len(validos), n_grupos=len(grupos_data),
+                    normalidad=is_normal, homogeneidad=homogeneidad, levene_p=levene_p)
+        if prueba is None:
+            fila['nota'] = 'Se necesita al menos dos grupos para comparar'
+        else:
+            resultado = PRUEBAS[prueba](*grupos_data)
+            fila.update(estadistico=float(resultado[0]), p_valor=float(resultado[1]))
+    else:
+        fila['nota'] = 'Combinación de tipos de variable no soportada'
+
+    fila['significativo'] = bool(fila['p_valor'] < alpha)
+    return fila
+
+
+def choose_statistical_tests(df, columnas=None, force_type=None, alpha=0.05, n_procesos=None):
+    """
+    Recomienda y ejecuta el test estadístico para todos los pares de columnas.
+
+    Versión por lotes de `choose_statistical_test`: cada columna se clasifica
+    una sola vez, los supuestos (Shapiro-Wilk por grupo y Levene) se verifican
+    una vez por par categórica/numérica, y con muchos pares estos se evalúan en
+    un pool de procesos. No imprime nada.
+
+    Args:
+        df (pd.DataFrame): El DataFrame que contiene los datos.
+        columnas (list): Columnas a combinar (por defecto, todas).
+        force_type (dict): Tipos forzados, como en `choose_statistical_test`.
+        alpha (float): Nivel de significancia para los supuestos y el resultado.
+        n_procesos (int): Procesos del pool. Por defecto es secuencial salvo
+            desde `MIN_PARES_POOL` pares, donde usa uno por CPU; 1 = secuencial.
+
+    Returns:
+        pd.DataFrame: Una fila por par con variable_1, variable_2, tipo_1, tipo_2,
+        prueba, estadistico, p_valor, significativo, n, n_grupos, normalidad,
+        homogeneidad, levene_p y nota, ordenado por p_valor. n_grupos y los
+        supuestos solo se llenan en pares categórica/numérica.
+    """
+    force_type = force_type or {}
+    columnas = list(columnas if columnas is not None else df.columns)
+    tipos = {col: force_type.get(col, get_variable_type(df[col].dropna())) for col in columnas}
+    tareas = [(a, b, tipos[a], tipos[b], df[[a, b]], alpha) for a, b in combinations(columnas, 2)]
+
+    if n_procesos is None:
+        n_procesos = (os.cpu_count() or 1) if len(tareas) >= MIN_PARES_POOL else 1
+    n_procesos = min(n_procesos, len(tareas))
+    if n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            filas = list(pool.map(_evaluar_par, tareas, chunksize=max(1, len(tareas) // (4 * n_procesos))))
+    else:
+        filas = [_evaluar_par(tarea) for tarea in tareas]
+
+    resultados = pd.DataFrame(filas, columns=[
+        'variable_1', 'variable_2', 'tipo_1', 'tipo_2', 'prueba', 'estadistico', 'p_valor',
+        'significativo', 'n', 'n_grupos', 'normalidad', 'homogeneidad', 'levene_p', 'nota'])
+    return resultados.sort_values('p_valor', na_position='last').reset_index(drop=True)
+
 if __name__ == '__main__':
     try:
         df = pd.read_csv('analisis_chi_cuadrado/data/processed/datos_limpios.csv')
@@ -133,3 +256,11 @@ if __name__ == '__main__':
     print("--- Ejemplo 3: Categórica (>2 grupos) vs Numérica/Ordinal ---")
     print("Forzando a 'frecuencia_abandono' a ser tratada como numérica para el análisis.")
     choose_statistical_test(df, 'rendimiento_semestre_pasado', 'frecuencia_abandono', force_type={'frecuencia_abandono': 'numerica'})
+
+    print("\n" + "="*60 + "\n")
+
+    print("--- Ejemplo 4: Todos los pares de columnas en una sola llamada ---")
+    columnas = ['abandono_considerado', 'beca_actual', 'rendimiento_semestre_pasado',
+                'expectativas_carrera', 'licenciatura', 'frecuencia_abandono']
+    resultados = choose_statistical_tests(df, columnas, force_type={'frecuencia_abandono': 'numerica'})
+    print(resultados[['variable_1', 'variable_2', 'prueba', 'estadistico', 'p_valor', 'significativo']].round(4).to_string(index=False))
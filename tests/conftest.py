@@ -0,0 +1,12 @@
+# Rutas de importación para las pruebas:
+# - raíz del repositorio: ``app.*`` y ``src.*``
+# - src/analysis/chi_square/src: los módulos del análisis se importan por nombre
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CHI_SQUARE_SRC = os.path.join(ROOT, 'src', 'analysis', 'chi_square', 'src')
+
+for path in (ROOT, CHI_SQUARE_SRC):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agregados_incrementales import AgregadosEncuesta, _fin_cabecera
+
+RAW = next((Path(__file__).resolve().parents[1] / "src" / "analysis" / "chi_square" / "data" / "raw").glob("*.csv"))
+
+
+def _registros():
+    """Cabecera y registros del CSV real (sin salto de línea final, como Forms)."""
+    datos = RAW.read_bytes().rstrip(b"\n")
+    fin = _fin_cabecera(datos)
+    return datos[:fin], datos[fin:].split(b"\n")
+
+
+def _escribir(path, cabecera, registros, final=b""):
+    path.write_bytes(cabecera + b"\n".join(registros) + final)
+    # mtime distinto en cada escritura aunque el sistema de archivos sea grueso
+    os.utime(path, ns=(path.stat().st_mtime_ns, path.stat().st_mtime_ns + len(registros) + len(final)))
+
+
+@pytest.fixture
+def encuesta(tmp_path):
+    cabecera, registros = _registros()
+    if any(r.count(b'"') % 2 for r in registros):
+        pytest.skip("el CSV de ejemplo tiene registros multilínea")
+    return tmp_path / "respuestas.csv", tmp_path / "agregados.json", cabecera, registros
+
+
+def test_ultimo_registro_sin_salto_espera_a_que_el_archivo_no_cambie(encuesta):
+    raw, store, cabecera, registros = encuesta
+    _escribir(raw, cabecera, registros[:10])
+    agregados = AgregadosEncuesta(raw, store)
+    primera = agregados.actualizar()
+    assert agregados.actualizar() == 1      # archivo sin cambios: el último registro ya está completo
+    assert primera + 1 == agregados.n_respuestas
+    completos = agregados.n_respuestas
+
+    # Un registro a medio escribir no se cuenta mientras el archivo cambia
+    _escribir(raw, cabecera, registros[:10] + [registros[10][:15]])
+    assert agregados.actualizar() == 0
+    _escribir(raw, cabecera, registros[:11])
+    agregados.actualizar()
+    agregados.actualizar()
+    esperado = AgregadosEncuesta(raw, store.with_name("desde_cero.json"))
+    esperado.actualizar()
+    esperado.actualizar()
+    assert agregados.n_respuestas == esperado.n_respuestas >= completos
+    assert agregados.tablas == esperado.tablas
+
+
+def test_estado_guardado_continua_y_detecta_reescritura(encuesta):
+    raw, store, cabecera, registros = encuesta
+    _escribir(raw, cabecera, registros[:20], final=b"\n")
+    primero = AgregadosEncuesta(raw, store)
+    primero.actualizar()
+
+    _escribir(raw, cabecera, registros[:30], final=b"\n")
+    continuado = AgregadosEncuesta(raw, store)
+    continuado.actualizar()
+    completo = AgregadosEncuesta(raw, store.with_name("completo.json"))
+    completo.actualizar()
+    assert continuado.tablas == completo.tablas
+
+    # Cambian los últimos registros ya contados: se reconstruye desde cero
+    _escribir(raw, cabecera, registros[:15] + registros[40:55], final=b"\n")
+    reescrito = AgregadosEncuesta(raw, store)
+    reescrito.actualizar()
+    desde_cero = AgregadosEncuesta(raw, store.with_name("reescrito.json"))
+    desde_cero.actualizar()
+    assert reescrito.tablas == desde_cero.tablas
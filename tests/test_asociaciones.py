@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency, false_discovery_control
+
+from asociaciones import ajustar_benjamini_hochberg, matriz_asociaciones
+
+
+@pytest.fixture
+def encuesta():
+    rng = np.random.default_rng(1)
+    n = 300
+    df = pd.DataFrame({
+        'beca': rng.choice(['si', 'no'], n),
+        'trabaja': rng.choice(['si', 'no'], n, p=[0.3, 0.7]),
+        'licenciatura': rng.choice(['A', 'B', 'C', 'D'], n),
+        'rendimiento': pd.Categorical(rng.choice(['bajo', 'medio', 'alto'], n),
+                                      categories=['bajo', 'medio', 'alto', 'sin datos']),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'licenciatura'] = None
+    return df
+
+
+def test_paridad_con_chi2_contingency(encuesta):
+    resultados = matriz_asociaciones(encuesta, list(encuesta.columns))
+    assert len(resultados) == 6
+    for fila in resultados.itertuples():
+        tabla = pd.crosstab(encuesta[fila.variable_1], encuesta[fila.variable_2])
+        chi2, p, gl, _ = chi2_contingency(tabla)
+        assert fila.chi2 == pytest.approx(chi2)
+        assert fila.p_valor == pytest.approx(p)
+        assert fila.grados_libertad == gl
+        assert fila.n == tabla.to_numpy().sum()
+
+
+def test_sin_correccion_de_yates(encuesta):
+    resultados = matriz_asociaciones(encuesta, ['beca', 'trabaja'], correccion_yates=False)
+    chi2, p, _, _ = chi2_contingency(pd.crosstab(encuesta['beca'], encuesta['trabaja']), correction=False)
+    assert resultados.loc[0, 'chi2'] == pytest.approx(chi2)
+    assert resultados.loc[0, 'p_valor'] == pytest.approx(p)
+
+
+def test_benjamini_hochberg_como_scipy():
+    p = np.random.default_rng(2).uniform(size=25)
+    np.testing.assert_allclose(ajustar_benjamini_hochberg(p), false_discovery_control(p))
+    con_nan = np.append(p, np.nan)
+    assert np.isnan(ajustar_benjamini_hochberg(con_nan)[-1])
@@ -0,0 +1,24 @@
+import threading
+
+from app import avatars
+
+
+def test_escrituras_concurrentes_se_cuentan_todas(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatars, 'AVATAR_CACHE_DIR', tmp_path)
+    monkeypatch.setattr(avatars, '_writes', 0)
+    prunes = []
+    monkeypatch.setattr(avatars, '_prune_disk_cache', lambda: prunes.append(1))
+
+    def write(start):
+        for i in range(start, start + 50):
+            avatars.get_avatar_svg(f"seed-{i}")
+
+    threads = [threading.Thread(target=write, args=(t * 50,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert avatars._writes == 400
+    assert len(prunes) == 400 // avatars.PRUNE_EVERY
+    assert len(list(tmp_path.glob("*.svg"))) == 400
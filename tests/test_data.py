@@ -0,0 +1,43 @@
+import random
+import threading
+
+from app import data
+
+
+def test_lectores_ven_prioridad_y_tabla_alineadas(monkeypatch):
+    monkeypatch.delenv("SAREP_STUDENT_DB", raising=False)
+    ids = [s['id'] for s in data.get_student_list()]
+    stop = threading.Event()
+    errors = []
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            data.update_student_risk(rng.choice(ids), round(rng.random(), 3))
+
+    def reader():
+        try:
+            for _ in range(300):
+                risks = [s['risk_score'] for s in data.get_student_cursor().fetch(0, len(ids))]
+                assert len(risks) == len(ids)
+                assert risks == sorted(risks, reverse=True)
+        except AssertionError as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(2)]
+    for thread in writers:
+        thread.start()
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    assert not errors
+
+    table = data.get_student_table()
+    expected = sorted(ids, key=lambda i: (-table.get(i).risk_score, i))
+    assert data.get_priority_index().ids() == expected
+    assert [s['id'] for s in data.get_store().query()] == expected
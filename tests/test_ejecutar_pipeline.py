@@ -0,0 +1,22 @@
+import matplotlib
+import matplotlib.pyplot as plt
+
+import ejecutar_pipeline
+
+
+def test_cada_etapa_parte_de_matplotlib_limpio(monkeypatch):
+    plt.style.use('ggplot')
+    plt.figure()
+    vistos = {}
+
+    class Etapa:
+        @staticmethod
+        def main(df):
+            vistos['figuras'] = plt.get_fignums()
+            vistos['fondo'] = matplotlib.rcParams['axes.facecolor']
+
+    monkeypatch.setattr(ejecutar_pipeline.importlib, 'import_module', lambda nombre: Etapa)
+    nombre, _, error, _ = ejecutar_pipeline.ejecutar_etapa('etapa')
+    assert error is None
+    assert vistos == {'figuras': [], 'fondo': matplotlib.rcParamsDefault['axes.facecolor']}
+    assert matplotlib.get_backend().lower() == 'agg'
@@ -0,0 +1,40 @@
+import sqlite3
+
+import numpy as np
+
+from app.feature_store import FeatureStore, source_hash
+
+
+def test_vector_viejo_no_se_sirve():
+    store = FeatureStore(version="v1")
+    old, new = source_hash({'age': 20}), source_hash({'age': 21})
+    store.upsert_many([1, 2], np.eye(2), source_hashes={1: old, 2: old})
+
+    found = store.get_many([1, 2], source_hashes={1: old, 2: new})
+    assert list(found) == [1]
+    assert store.get(2, source_hash=new) is None
+    assert store.get(2) is not None   # sin huella: lectura por clave como antes
+
+    store.upsert_many([2], np.ones((1, 2)), source_hashes={2: new})
+    np.testing.assert_array_equal(store.get(2, source_hash=new), [1, 1])
+
+
+def test_huella_independiente_del_orden():
+    assert source_hash({'a': 1, 'b': None}) == source_hash({'b': None, 'a': 1})
+    assert source_hash({'a': 1}) != source_hash({'a': 2})
+
+
+def test_migra_almacen_sin_huella(tmp_path):
+    db = tmp_path / "features.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE features (student_id INTEGER NOT NULL, version TEXT NOT NULL, "
+        "vector BLOB NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (student_id, version)) WITHOUT ROWID"
+    )
+    conn.execute("INSERT INTO features VALUES (1, 'v1', ?, 0)", (np.zeros(2, np.float32).tobytes(),))
+    conn.commit()
+    conn.close()
+
+    store = FeatureStore(db, version="v1")
+    assert store.get_many([1], source_hashes={1: source_hash({})}) == {}
+    assert store.count() == 1
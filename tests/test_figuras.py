@@ -0,0 +1,24 @@
+import pytest
+import yaml
+
+from figuras import PARAMETROS_POR_DEFECTO, buscar_params, cargar_parametros_visualizacion
+
+
+def test_lee_dpi_y_tema_de_params(tmp_path):
+    params = tmp_path / 'params.yaml'
+    params.write_text("visualize:\n  dpi: 300\nanalyze:\n  visualization_theme: ggplot\n", encoding='utf-8')
+    parametros = cargar_parametros_visualizacion(params)
+    assert parametros['dpi'] == 300
+    assert parametros['theme'] == 'ggplot'
+    assert parametros['fig_size'] == PARAMETROS_POR_DEFECTO['fig_size']
+
+
+def test_params_ilegible_no_cae_a_los_valores_por_defecto(tmp_path):
+    params = tmp_path / 'params.yaml'
+    params.write_text("visualize: [dpi: 300\n", encoding='utf-8')
+    with pytest.raises(yaml.YAMLError):
+        cargar_parametros_visualizacion(params)
+
+
+def test_params_del_repositorio():
+    assert cargar_parametros_visualizacion(buscar_params())['dpi'] == 300
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.inference import InferenceExecutor, InferenceOverloaded
+from app.rescoring import EventLog, IncrementalScorer
+from app.telemetry import TELEMETRY
+from app.utils import predict_from_vectors
+
+CLASS_NAMES = ['Dropout', 'Enrolled', 'Graduate']
+
+
+class BlockingModel:
+    """Modelo que no responde hasta que se libera ``release``."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, X):
+        self.release.wait(5)
+        return np.tile([0.7, 0.2, 0.1], (len(X), 1))
+
+
+@pytest.fixture
+def saturated():
+    model = BlockingModel()
+    executor = InferenceExecutor(model, max_workers=1, max_queue=1, queue_timeout=0.05)
+    in_flight = executor.submit(np.zeros((1, 3)))
+    yield executor
+    model.release.set()
+    in_flight.result(timeout=5)
+
+
+def test_cola_llena_rechaza(saturated):
+    with pytest.raises(InferenceOverloaded):
+        saturated.predict_proba(np.zeros((1, 3)))
+
+
+def test_prediccion_rechazada_se_marca_como_saturada(saturated):
+    result = predict_from_vectors(np.zeros((1, 3)), None, CLASS_NAMES, executor=saturated)
+    assert result['success'] is False
+    assert result['overloaded'] is True
+    assert 'probabilities' not in result
+
+
+def test_prediccion_exitosa():
+    model = BlockingModel()
+    model.release.set()
+    executor = InferenceExecutor(model, max_workers=1, max_queue=1)
+    result = predict_from_vectors(np.zeros((1, 3)), None, CLASS_NAMES, executor=executor)
+    assert result['success'] and result['class'] == 'Dropout'
+    assert result['probabilities']['Dropout'] == pytest.approx(0.7)
+
+
+def test_rescoring_saturado_reencola(tmp_path, saturated):
+    risks = {}
+    scorer = IncrementalScorer(
+        EventLog(tmp_path / "events.jsonl"),
+        lambda ids: [{'id': i} for i in ids],
+        lambda sid, changes: None,
+        lambda rows: saturated.predict_proba(np.zeros((len(rows), 3)))[0][:, 0],
+        risks.__setitem__,
+    )
+    scorer.mark_dirty([1, 2, 3])
+    before = TELEMETRY.counters().get('rescoring.overloaded', 0)
+    stop = threading.Timer(0.3, scorer.stop)
+    stop.start()
+    scorer._loop(0.01)
+    stop.join()
+    assert TELEMETRY.counters().get('rescoring.overloaded', 0) > before
+    assert scorer.pending == 3 and risks == {}
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import binomtest
+
+from intervalos_bootstrap import filas_wilson, intervalos_porcentajes, intervalos_wilson
+
+
+@pytest.mark.parametrize("exitos,n", [(0, 5), (5, 5), (3, 10), (40, 100)])
+def test_wilson_coincide_con_scipy(exitos, n):
+    esperado = binomtest(exitos, n).proportion_ci(confidence_level=0.95, method='wilson')
+    inferior, superior = intervalos_wilson(exitos, n)
+    assert inferior == pytest.approx(esperado.low * 100)
+    assert superior == pytest.approx(esperado.high * 100)
+
+
+def test_filas_degeneradas_usan_wilson():
+    df = pd.DataFrame({
+        'grupo': ['A'] * 60 + ['B'] * 4,
+        'abandono': ['Sí', 'No'] * 30 + ['Sí'] * 4,
+    })
+    inferior, superior = intervalos_porcentajes(df, 'grupo', 'abandono', n_remuestras=500)
+    assert filas_wilson(inferior) == ['B']
+    # B: 4 de 4 -> el percentil daría [100, 100]
+    assert inferior.loc['B', 'Sí'] < 100 and superior.loc['B', 'Sí'] == pytest.approx(100)
+    np.testing.assert_allclose(
+        [inferior.loc['B', 'Sí'], superior.loc['B', 'Sí']], intervalos_wilson(4, 4)
+    )
+    assert inferior.loc['A', 'Sí'] < 50 < superior.loc['A', 'Sí']
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency
+
+from asociaciones import asociaciones_opciones
+from multiseleccion import bandera, codificar_multiseleccion, conteos_opciones, separar_opciones
+
+ECONOMICA = "Dificultades económicas (para transporte, materiales, etc.)"
+
+
+def test_separa_solo_comas_fuera_de_parentesis():
+    assert separar_opciones(f"Trabajo, {ECONOMICA}, ,Salud") == ["Trabajo", ECONOMICA, "Salud"]
+
+
+def test_matriz_y_conteos():
+    serie = pd.Series([f"Trabajo, {ECONOMICA}", None, "Salud, Trabajo, Trabajo", f"Trabajo, {ECONOMICA}"])
+    matriz, vocabulario = codificar_multiseleccion(serie)
+    assert vocabulario == ["Trabajo", ECONOMICA, "Salud"]
+    np.testing.assert_array_equal(
+        matriz.toarray(), [[1, 1, 0], [0, 0, 0], [1, 0, 1], [1, 1, 0]])
+    assert conteos_opciones(matriz, vocabulario).to_dict() == {"Trabajo": 3, ECONOMICA: 2, "Salud": 1}
+    np.testing.assert_array_equal(bandera(matriz, vocabulario, "econ"), [True, False, False, True])
+
+
+def test_asociaciones_opciones_como_chi2_contingency():
+    rng = np.random.default_rng(4)
+    n = 250
+    opciones = np.array(["Trabajo", ECONOMICA, "Salud", "Familia"])
+    elegidas = rng.random((n, len(opciones))) < [0.5, 0.4, 0.2, 0.3]
+    serie = pd.Series([", ".join(opciones[fila]) for fila in elegidas])
+    abandono = pd.Series(rng.choice(['Sí', 'No', 'Tal vez'], n))
+    abandono[rng.choice(n, 10, replace=False)] = None
+
+    matriz, vocabulario = codificar_multiseleccion(serie)
+    resultados = asociaciones_opciones(matriz, vocabulario, abandono).set_index('opcion')
+    for j, opcion in enumerate(vocabulario):
+        eligio = pd.Series(matriz[:, j].toarray().ravel())
+        chi2, p, gl, _ = chi2_contingency(pd.crosstab(eligio, abandono))
+        assert resultados.loc[opcion, 'chi2'] == pytest.approx(chi2)
+        assert resultados.loc[opcion, 'p_valor'] == pytest.approx(p)
+        assert resultados.loc[opcion, 'grados_libertad'] == gl
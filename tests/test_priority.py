@@ -0,0 +1,33 @@
+import random
+
+from app.priority import RiskPriorityIndex
+from app.search_index import risk_tier
+
+
+def _esperado(students, program=None):
+    rows = [s for s in students.values() if program is None or s['program'] == program]
+    return [s['id'] for s in sorted(rows, key=lambda s: (-s['risk_score'], s['id']))]
+
+
+def test_orden_y_conteos_tras_actualizaciones():
+    rng = random.Random(0)
+    students = {
+        i: {'id': i, 'risk_score': round(rng.random(), 3), 'program': rng.choice('AB'), 'tutor': rng.choice('XY')}
+        for i in range(200)
+    }
+    index = RiskPriorityIndex.build(students.values())
+    for _ in range(500):
+        sid = rng.randrange(200)
+        students[sid]['risk_score'] = round(rng.random(), 3)
+        index.update_risk(sid, students[sid]['risk_score'])
+
+    assert index.ids() == _esperado(students)
+    assert index.ids(program='A', offset=5, limit=10) == _esperado(students, 'A')[5:15]
+    assert index.top_k(3, program='B') == _esperado(students, 'B')[:3]
+    expected_tiers = {'danger': 0, 'warning': 0, 'success': 0}
+    for s in students.values():
+        expected_tiers[risk_tier(s['risk_score'])] += 1
+    assert index.tier_counts() == expected_tiers
+    both = [sid for sid in _esperado(students, 'A') if students[sid]['tutor'] == 'X']
+    assert index.ids(program='A', tutor='X') == both
+    assert index.count(program='C') == 0 and index.ids(program='C') == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import kruskal, mannwhitneyu
+
+from pruebas_rangos import pruebas_por_grupos
+
+
+@pytest.fixture
+def encuesta():
+    rng = np.random.default_rng(3)
+    n = 200
+    df = pd.DataFrame({
+        'frecuencia': rng.integers(1, 6, n),
+        'beca': rng.choice(['si', 'no'], n),
+        'licenciatura': rng.choice(['A', 'B', 'C', 'D'], n),
+    })
+    df.loc[rng.choice(n, 15, replace=False), 'licenciatura'] = None
+    return df
+
+
+def _grupos(df, respuesta, col):
+    validos = df[[respuesta, col]].dropna()
+    return [g.to_numpy() for _, g in validos.groupby(col, sort=True)[respuesta]]
+
+
+def test_kruskal_con_empates_como_scipy(encuesta):
+    fila = pruebas_por_grupos(encuesta, 'frecuencia', ['licenciatura']).iloc[0]
+    h, p = kruskal(*_grupos(encuesta, 'frecuencia', 'licenciatura'))
+    assert fila['prueba_nombre'] == 'Kruskal-Wallis H'
+    assert fila['n'] == encuesta['licenciatura'].notna().sum()
+    assert fila['estadistico'] == pytest.approx(h)
+    assert fila['p_value'] == pytest.approx(p)
+
+
+def test_mannwhitney_con_empates_como_scipy(encuesta):
+    fila = pruebas_por_grupos(encuesta, 'frecuencia', ['beca']).iloc[0]
+    x, y = _grupos(encuesta, 'frecuencia', 'beca')
+    resultado = mannwhitneyu(x, y)
+    assert fila['prueba_nombre'] == 'Mann-Whitney U'
+    assert fila['estadistico'] == pytest.approx(resultado.statistic)
+    assert fila['p_value'] == pytest.approx(resultado.pvalue)
+
+
+def test_mannwhitney_exacto_en_muestras_pequenas():
+    df = pd.DataFrame({'valor': [3.1, 0.4, 2.2, 5.0, 1.7, 4.4, 0.9],
+                       'grupo': ['a', 'b', 'a', 'a', 'b', 'a', 'b']})
+    fila = pruebas_por_grupos(df, 'valor', ['grupo']).iloc[0]
+    x, y = _grupos(df, 'valor', 'grupo')
+    resultado = mannwhitneyu(x, y)
+    assert fila['estadistico'] == pytest.approx(resultado.statistic)
+    assert fila['p_value'] == pytest.approx(resultado.pvalue)
+
+
+def test_mannwhitney_exacto_con_grupos_desiguales():
+    rng = np.random.default_rng(5)
+    valores = rng.permutation(30).astype(float)
+    df = pd.DataFrame({'valor': valores, 'grupo': ['a'] * 4 + ['b'] * 26})
+    fila = pruebas_por_grupos(df, 'valor', ['grupo']).iloc[0]
+    x, y = _grupos(df, 'valor', 'grupo')
+    resultado = mannwhitneyu(x, y)
+    assert fila['estadistico'] == pytest.approx(resultado.statistic)
+    assert fila['p_value'] == pytest.approx(resultado.pvalue)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from scipy.stats import chi2_contingency
+
+from pvalor_montecarlo import pvalor_montecarlo
+
+TABLA = np.array([[12, 5, 3], [7, 14, 9]])
+
+
+@pytest.mark.parametrize('argumentos', [{'max_simulaciones': 0}, {'tamano_lote': 0}])
+def test_sin_simulaciones_es_un_error(argumentos):
+    with pytest.raises(ValueError):
+        pvalor_montecarlo(TABLA, **argumentos)
+
+
+def test_una_simulacion_da_un_resultado_definido():
+    resultado = pvalor_montecarlo(TABLA, max_simulaciones=1)
+    assert resultado['simulations'] == 1
+    assert 0 < resultado['p_value'] <= 1
+
+
+def test_cerca_del_asintotico_con_muestras_grandes():
+    chi2, p, _, _ = chi2_contingency(TABLA * 10, correction=False)
+    resultado = pvalor_montecarlo(TABLA * 10)
+    assert resultado['chi2_statistic'] == pytest.approx(chi2)
+    assert resultado['ci95'][0] - 0.01 <= p <= resultado['ci95'][1] + 0.01
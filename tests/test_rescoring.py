@@ -0,0 +1,150 @@
+import json
+
+import pytest
+
+from app.data import _simulated_students
+from app.rescoring import EventLog, IncrementalScorer
+from app.student_store import StudentStore
+
+
+class FakeStudents:
+    """Registros en memoria con la validación de ``update_student_fields``."""
+
+    def __init__(self, ids):
+        self.rows = {
+            sid: {'id': sid, 'academic_data': {'s1_aprobadas': 4, 's1_inscritas': 6,
+                                               's2_aprobadas': 2, 's2_inscritas': 6, 'age': 20}}
+            for sid in ids
+        }
+        self.risk = {}
+        self.fail_apply = None
+
+    def get(self, ids):
+        return [self.rows[i] for i in ids if i in self.rows]
+
+    def apply(self, sid, changes, offset=None):
+        if self.fail_apply is not None:
+            raise self.fail_apply
+        for name, value in changes.items():
+            if name != 'momentum' and value is not None and not isinstance(value, int):
+                raise ValueError(name)
+        self.rows[sid]['academic_data'].update(changes)
+
+    def scored(self, sid, risk):
+        self.risk[sid] = risk
+
+
+def _scorer(tmp_path, students, score=None, batch_size=256):
+    return IncrementalScorer(
+        EventLog(tmp_path / "events.jsonl"), students.get, students.apply,
+        score or (lambda rows: [0.5] * len(rows)), students.scored, batch_size=batch_size,
+    )
+
+
+def _write(path, *lines):
+    with open(path, "a", encoding="utf-8") as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+
+
+def test_eventos_invalidos_no_pierden_el_resto_del_lote(tmp_path):
+    students = FakeStudents([1, 2, 3])
+    scorer = _scorer(tmp_path, students)
+    _write(tmp_path / "events.jsonl",
+           {'student_id': 1, 'changes': {'age': None}},
+           {'student_id': 2, 'changes': {'s2_aprobadas': None}},    # momentum imposible
+           "{no es json",
+           {'student_id': '3', 'changes': {'age': 21}},
+           {'student_id': 3, 'changes': {'age': 'veinte'}},
+           {'student_id': 3, 'changes': {'s2_aprobadas': 5}})
+    assert scorer.consume() == 6
+    assert scorer.offset == (tmp_path / "events.jsonl").stat().st_size
+    assert scorer.pending == 2
+    assert students.rows[3]['academic_data']['momentum'] == round(5 / 6 - 4 / 6, 2)
+    assert scorer.flush() == 2
+    assert students.risk == {1: 0.5, 3: 0.5}
+
+
+def test_offset_no_avanza_si_falla_la_aplicacion(tmp_path):
+    students = FakeStudents([1, 2])
+    scorer = _scorer(tmp_path, students)
+    _write(tmp_path / "events.jsonl",
+           {'student_id': 1, 'changes': {'age': 30}},
+           {'student_id': 2, 'changes': {'age': 31}})
+    students.fail_apply = RuntimeError("almacén bloqueado")
+    with pytest.raises(RuntimeError):
+        scorer.consume()
+    assert scorer.offset == 0 and scorer.pending == 0
+
+    students.fail_apply = None
+    assert scorer.consume() == 2
+    assert scorer.pending == 2
+
+
+def test_flush_reencola_si_falla_el_score(tmp_path):
+    students = FakeStudents(range(5))
+    calls = []
+
+    def score(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("modelo no disponible")
+        return [0.9] * len(rows)
+
+    scorer = _scorer(tmp_path, students, score=score, batch_size=2)
+    scorer.mark_dirty(range(5))
+    with pytest.raises(RuntimeError):
+        scorer.flush()
+    assert scorer.pending == 5
+    assert scorer.flush() == 5
+    assert scorer.pending == 0 and len(students.risk) == 5
+
+
+def test_read_from_omite_linea_incompleta(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write(path, {'student_id': 1, 'changes': {}})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"student_id": 2')
+    events, offset = EventLog(path).read_from(0)
+    assert [e['student_id'] for e in events] == [1]
+    assert offset == len(json.dumps({'student_id': 1, 'changes': {}})) + 1
+
+
+def _store_scorer(log, store):
+    key = log.offset_key
+    return IncrementalScorer(
+        log, store.get_many,
+        lambda sid, changes, offset: store.update_fields(sid, changes, meta={key: offset}),
+        lambda rows: [0.5] * len(rows), store.update_risk,
+        load_offset=lambda: store.get_meta(key, 0),
+        save_offset=lambda offset: store.set_meta(key, offset),
+    )
+
+
+def test_scorer_nuevo_retoma_el_offset_guardado(tmp_path):
+    db_path, log = tmp_path / "students.db", EventLog(tmp_path / "events.jsonl")
+    store = StudentStore(db_path)
+    store.upsert_many(_simulated_students())
+    sid = store.rows()[0][0]
+    _write(log.path, {'student_id': sid, 'changes': {'age': 40}}, "{no es json")
+
+    assert _store_scorer(log, store).consume() == 2
+
+    reabierto = StudentStore(db_path)
+    scorer = _store_scorer(log, reabierto)
+    assert scorer.offset == log.size()
+    assert scorer.consume() == 0 and scorer.pending == 0
+
+    _write(log.path, {'student_id': sid, 'changes': {'age': 41}})
+    assert scorer.consume() == 1 and scorer.pending == 1
+    assert reabierto.get(sid)['academic_data']['age'] == 41
+
+
+def test_offset_guardado_mayor_que_el_log_reinicia(tmp_path):
+    students = FakeStudents([1])
+    _write(tmp_path / "events.jsonl", {'student_id': 1, 'changes': {'age': 30}})
+    scorer = IncrementalScorer(
+        EventLog(tmp_path / "events.jsonl"), students.get, students.apply,
+        lambda rows: [0.5] * len(rows), students.scored, load_offset=lambda: "999999",
+    )
+    assert scorer.offset == 0 and scorer.consume() == 1
@@ -0,0 +1,53 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import create_students_input_df
+from src.models.similar_students import FEATURES_PATH, PREPROCESSOR_PATH, historical_feature_frame
+
+
+def test_historico_en_el_espacio_del_serving():
+    feature_names = list(joblib.load(FEATURES_PATH))
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    df = pd.DataFrame({
+        'Age at enrollment': [19, 45],
+        'Curricular units 2nd sem (approved)': [5, 1],
+        'Grupo_Edad_Riesgo': ['Joven_Adulto', 'Adulto_Mayor'],
+        'Target': ['Graduate', 'Dropout'],
+    })
+    frame = historical_feature_frame(df, feature_names)
+    assert list(frame.columns) == feature_names
+    assert frame['Grupo_Edad_Riesgo_Adulto_Mayor'].tolist() == [0, 1]
+
+    serving = create_students_input_df(
+        df.drop(columns=['Target', 'Grupo_Edad_Riesgo'])
+          .assign(Grupo_Edad_Riesgo_Adulto_Mayor=[0, 1]).to_dict('records'),
+        feature_names,
+    )
+    np.testing.assert_allclose(preprocessor.transform(frame), preprocessor.transform(serving))
+
+
+def test_consulta_con_las_features_mapeadas_devuelve_al_estudiante(tmp_path):
+    from app.similar_students import SimilarStudentsIndex
+    from app.utils import map_unrc_to_model_inputs
+    from src.data.data_processing import load_data, clean_data, create_features
+    from src.models.similar_students import DATA_PATH, UNRC_FEATURES, build_similar_students_index
+
+    assert set(map_unrc_to_model_inputs({})) == set(UNRC_FEATURES)
+
+    build_similar_students_index(output_dir=tmp_path)
+    index = SimilarStudentsIndex.load(tmp_path)
+    feature_names = list(joblib.load(FEATURES_PATH))
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+
+    df = create_features(clean_data(load_data(DATA_PATH))).reset_index(drop=True)
+    stored = historical_feature_frame(df, feature_names)
+    # Un estudiante cuyas features mapeadas no se repiten en el histórico
+    pos = int(np.flatnonzero(~stored[UNRC_FEATURES].duplicated(keep=False))[0])
+    # Consulta del serving: solo las features del mapeo, el resto con relleno
+    query = create_students_input_df([stored.loc[pos, UNRC_FEATURES].to_dict()], feature_names)
+    distances, indices = index.query(preprocessor.transform(query), k=5)
+    assert indices[0, 0] == pos
+    assert distances[0, 0] == pytest.approx(0, abs=1e-9)
+    assert distances[0, 1] > 0
@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from app.search_index import StudentSearchIndex
+from app.student_records import StudentTable
+from app.student_store import COLUMN_NAMES
+
+
+def _row(**values):
+    base = {'id': 1, 'name': 'Sofia Garcés', 'email': 'sofia@u.edu', 'risk_score': 0.5}
+    base.update(values)
+    return tuple(base.get(name) for name in COLUMN_NAMES)
+
+
+def test_nulos_numericos_se_conservan():
+    table = StudentTable([_row(id=1, age=None, s1_aprobadas=None, momentum=None),
+                          _row(id=2, age=21, s1_aprobadas=4, momentum=0.25)])
+    first = table.get(1).to_dict()
+    assert first['academic_data']['age'] is None
+    assert first['academic_data']['s1_aprobadas'] is None
+    assert first['academic_data']['momentum'] is None
+    second = table.get(2).to_dict()['academic_data']
+    assert (second['age'], second['s1_aprobadas'], second['momentum']) == (21, 4, 0.25)
+
+
+def test_update_fields_valida_antes_de_escribir():
+    table = StudentTable([_row(id=1, age=20, s2_aprobadas=3)])
+    table.update_fields(1, {'age': None, 's2_aprobadas': 5.0})
+    assert table.get(1).age is None
+    assert table.get(1).s2_aprobadas == 5
+
+    for changes in ({'age': 'veinte'}, {'age': 2.5}, {'age': 10 ** 6},
+                    {'risk_score': None}, {'id': 3}, {'columna': 1},
+                    {'s2_aprobadas': 4, 'age': '??'}):
+        with pytest.raises(ValueError):
+            table.update_fields(1, changes)
+    # Un lote inválido no deja cambios a medias
+    assert table.get(1).s2_aprobadas == 5
+    assert not math.isnan(table.get(1).risk_score)
+
+
+def test_indice_de_busqueda_lee_de_la_tabla():
+    table = StudentTable([_row(id=1, name='Sofia Garcés', risk_score=0.2, program='A'),
+                          _row(id=2, name='Sofia Ruiz', email='sr@u.edu', risk_score=0.9, program='B')])
+    index = StudentSearchIndex.build(table)
+    assert index.search('sofia') == [2, 1]
+
+    table.update_risk(1, 0.95)
+    index.update_risk(1, 0.95)
+    assert index.search('sofia') == [1, 2]
+    assert index.search(risk_tier='danger') == [1, 2]
+
+    with index.reindexing(2):
+        table.update_fields(2, {'name': 'Ana Ruiz', 'program': 'A'})
+    assert index.search('sofia') == [1]
+    assert index.search('ana', program='A') == [2]
+    assert index.search(program='B') == []
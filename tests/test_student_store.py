@@ -0,0 +1,36 @@
+import sqlite3
+
+from app.avatars import avatar_seed
+from app.student_store import StudentStore
+
+
+def test_migra_columna_avatar(tmp_path):
+    db = tmp_path / "students.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE students (id INTEGER PRIMARY KEY, name TEXT NOT NULL, email TEXT, "
+        "avatar TEXT, program TEXT, tutor TEXT, risk_score REAL NOT NULL, age INTEGER, "
+        "s1_aprobadas INTEGER, s1_inscritas INTEGER, s2_aprobadas INTEGER, s2_inscritas INTEGER, "
+        "momentum REAL, satisfaccion TEXT, modalidad TEXT, desafio TEXT, risk_diagnosis TEXT, "
+        "risk_description TEXT, intervention TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO students (id, name, avatar, risk_score) VALUES (?, ?, ?, ?)",
+        [(1, "Sofia", "https://api.dicebear.com/7.x/avataaars/svg?seed=Sofia", 0.8),
+         (2, "Andres", "https://example.com/avatar.png", 0.2),
+         (3, "Lucia", None, 0.5)],
+    )
+    conn.commit()
+    conn.close()
+
+    store = StudentStore(db)
+    seeds = {s['id']: s['avatar_seed'] for s in store.get_many([1, 2, 3])}
+    assert seeds == {1: "Sofia", 2: None, 3: None}
+    # Reabrir un archivo ya migrado no hace nada
+    assert StudentStore(db).get(1)['avatar_seed'] == "Sofia"
+
+
+def test_avatar_sin_semilla_usa_el_id():
+    assert avatar_seed({'id': 7, 'avatar_seed': None}) == "id-7"
+    assert avatar_seed({'id': 8, 'avatar_seed': None}) != avatar_seed({'id': 7, 'avatar_seed': None})
+    assert avatar_seed({'id': 7, 'avatar_seed': "Sofia"}) == "Sofia"
@@ -0,0 +1,63 @@
+import threading
+
+from app.telemetry import LatencyHistogram, Telemetry
+
+
+def _record_in_thread(hist, elapsed_ns, n):
+    thread = threading.Thread(target=lambda: [hist.record(elapsed_ns) for _ in range(n)])
+    thread.start()
+    thread.join()
+
+
+def test_shards_de_hilos_terminados_se_fusionan_en_la_base():
+    hist = LatencyHistogram()
+    for _ in range(50):
+        _record_in_thread(hist, 20_000, 3)
+
+    counts, total_ns = hist.counts()
+    assert sum(counts) == 150
+    assert total_ns == 150 * 20_000
+    # Solo quedan shards de hilos vivos (ninguno de los 50 terminados)
+    assert len(hist._shards) <= 1
+
+
+def test_reset_limpia_base_y_shards_vivos():
+    hist = LatencyHistogram()
+    _record_in_thread(hist, 20_000, 5)
+    hist.record(20_000)
+    hist.reset()
+    assert hist.counts() == ([0] * (len(hist.bounds_ns) + 1), 0)
+
+
+def test_increment_concurrente_no_pierde_conteos():
+    telemetry = Telemetry()
+    threads = [
+        threading.Thread(target=lambda: [telemetry.increment('eventos') for _ in range(1000)])
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert telemetry.counters()['eventos'] == 8000
+
+
+def test_reruns_por_sesion_acotados_lru():
+    telemetry = Telemetry(max_sessions=3)
+    for key in ('a', 'b', 'c', 'a', 'd'):
+        telemetry.record_rerun(key)
+    sessions = telemetry.session_frame()['reruns'].to_dict()
+    assert sessions == {'c': 1, 'a': 2, 'd': 1}
+    telemetry.reset()
+    assert telemetry.session_frame().empty
+
+
+def test_helpers_compartidos_no_alimentan_las_etapas_del_serving():
+    from app.telemetry import TELEMETRY
+    from app.utils import create_students_input_df, map_unrc_to_model_inputs
+
+    before = {stage: sum(TELEMETRY.histogram(stage).counts()[0]) for stage in ('mapping', 'frame')}
+    rows = [map_unrc_to_model_inputs({'age': 20 + i}) for i in range(20)]
+    create_students_input_df(rows, ['Age at enrollment'])
+    after = {stage: sum(TELEMETRY.histogram(stage).counts()[0]) for stage in ('mapping', 'frame')}
+    assert after == before
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency, kruskal
+
+from src.utils import test_selector
+from src.utils.test_selector import choose_statistical_tests
+
+
+@pytest.fixture
+def encuesta():
+    rng = np.random.default_rng(0)
+    n = 120
+    return pd.DataFrame({
+        'beca': rng.choice(['si', 'no'], n),
+        'rendimiento': rng.choice(['bajo', 'medio', 'alto'], n),
+        'frecuencia': rng.integers(0, 5, n).astype(float),
+    })
+
+
+def test_pocos_pares_no_abre_pool(encuesta, monkeypatch):
+    def sin_pool(*args, **kwargs):
+        raise AssertionError("no debería crear un pool con pocos pares")
+
+    monkeypatch.setattr(test_selector, 'ProcessPoolExecutor', sin_pool)
+    resultados = choose_statistical_tests(encuesta, force_type={'frecuencia': 'numerica'})
+    assert len(resultados) == 3
+
+
+def test_force_type_por_defecto_no_se_comparte(encuesta):
+    antes = choose_statistical_tests(encuesta)
+    choose_statistical_tests(encuesta, force_type={'frecuencia': 'numerica'})
+    despues = choose_statistical_tests(encuesta)
+    pd.testing.assert_frame_equal(antes, despues)
+
+
+def test_paridad_con_scipy(encuesta):
+    resultados = choose_statistical_tests(
+        encuesta, force_type={'frecuencia': 'numerica'}).set_index(['variable_1', 'variable_2'])
+
+    chi2, p, _, _ = chi2_contingency(pd.crosstab(encuesta['beca'], encuesta['rendimiento']))
+    fila = resultados.loc[('beca', 'rendimiento')]
+    assert fila['prueba'] == 'Chi-cuadrado'
+    assert fila['estadistico'] == pytest.approx(chi2)
+    assert fila['p_valor'] == pytest.approx(p)
+
+    fila = resultados.loc[('rendimiento', 'frecuencia')]
+    assert fila['prueba'] == 'Kruskal-Wallis'   # niveles discretos: no normal
+    grupos = [g.to_numpy() for _, g in encuesta.groupby('rendimiento', sort=False)['frecuencia']]
+    h, p = kruskal(*grupos)
+    assert fila['estadistico'] == pytest.approx(h)
+    assert fila['p_valor'] == pytest.approx(p)